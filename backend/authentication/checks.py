@@ -0,0 +1,25 @@
+from django.contrib.auth.hashers import get_hasher
+from django.core.checks import Error, register
+
+from .hashers import obtener_politica
+
+
+@register()
+def verificar_politica_hashing(app_configs, **kwargs):
+    """El algoritmo preferido debe poder usarse en este host"""
+    algoritmo = obtener_politica()['ALGORITHM']
+    try:
+        hasher = get_hasher('default')
+        if hasher.algorithm != algoritmo:
+            raise ValueError(
+                f'PASSWORD_HASHERS empieza con {hasher.algorithm} y la política pide {algoritmo}'
+            )
+        if hasher.library:
+            hasher._load_library()
+    except ValueError as error:
+        return [Error(
+            f'Política de hashing inválida: {error}',
+            hint='Revise PASSWORD_HASHING en settings.py o instale la librería del algoritmo',
+            id='authentication.E001',
+        )]
+    return []
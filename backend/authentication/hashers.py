@@ -0,0 +1,86 @@
+# Hashers con costo configurable desde settings.PASSWORD_HASHING
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# Valores usados cuando PASSWORD_HASHING no define un parámetro
+POLITICA_POR_DEFECTO = {
+    'ALGORITHM': 'pbkdf2_sha256',
+    'PBKDF2_ITERATIONS': PBKDF2PasswordHasher.iterations,
+    'SCRYPT_WORK_FACTOR': ScryptPasswordHasher.work_factor,
+    'SCRYPT_BLOCK_SIZE': ScryptPasswordHasher.block_size,
+    'SCRYPT_PARALLELISM': ScryptPasswordHasher.parallelism,
+    'ARGON2_TIME_COST': Argon2PasswordHasher.time_cost,
+    'ARGON2_MEMORY_COST': Argon2PasswordHasher.memory_cost,
+    'ARGON2_PARALLELISM': Argon2PasswordHasher.parallelism,
+}
+
+
+def obtener_politica():
+    """Política vigente: valores por defecto combinados con settings.PASSWORD_HASHING"""
+    return {**POLITICA_POR_DEFECTO, **getattr(settings, 'PASSWORD_HASHING', {})}
+
+
+# Los costos se leen en cada uso: al cambiar la política, must_update() detecta
+# los hashes con otro costo y check_password() los regenera en el siguiente login.
+
+class PoliticaPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return obtener_politica()['PBKDF2_ITERATIONS']
+
+
+class PoliticaScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return obtener_politica()['SCRYPT_WORK_FACTOR']
+
+    @property
+    def block_size(self):
+        return obtener_politica()['SCRYPT_BLOCK_SIZE']
+
+    @property
+    def parallelism(self):
+        return obtener_politica()['SCRYPT_PARALLELISM']
+
+
+class PoliticaArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return obtener_politica()['ARGON2_TIME_COST']
+
+    @property
+    def memory_cost(self):
+        return obtener_politica()['ARGON2_MEMORY_COST']
+
+    @property
+    def parallelism(self):
+        return obtener_politica()['ARGON2_PARALLELISM']
+
+
+HASHERS_POLITICA = {
+    'pbkdf2_sha256': 'authentication.hashers.PoliticaPBKDF2PasswordHasher',
+    'scrypt': 'authentication.hashers.PoliticaScryptPasswordHasher',
+    'argon2': 'authentication.hashers.PoliticaArgon2PasswordHasher',
+}
+
+# Hashers heredados: solo verifican hashes existentes, que se migran al iniciar sesión
+HASHERS_HEREDADOS = [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+
+def construir_password_hashers(algoritmo):
+    """Lista para PASSWORD_HASHERS con el algoritmo preferido en primer lugar"""
+    if algoritmo not in HASHERS_POLITICA:
+        raise ValueError(
+            f'Algoritmo de hashing no soportado: {algoritmo}. '
+            f'Opciones: {", ".join(HASHERS_POLITICA)}'
+        )
+    preferido = HASHERS_POLITICA[algoritmo]
+    otros = [ruta for nombre, ruta in HASHERS_POLITICA.items() if nombre != algoritmo]
+    return [preferido, *otros, *HASHERS_HEREDADOS]
@@ -0,0 +1,112 @@
+# Resolución de usuarios JWT con caché en memoria del proceso
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CacheUsuarios:
+    """Caché en memoria con expiración corta y tamaño acotado, segura entre hilos"""
+
+    def __init__(self, ttl, max_entradas):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas = {}
+        self._lock = threading.Lock()
+        # Estadísticas expuestas en /api/metrics/
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            expira, usuario = entrada
+            if expira < time.monotonic():
+                del self._entradas[clave]
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+            return usuario
+
+    def guardar(self, clave, usuario):
+        with self._lock:
+            if len(self._entradas) >= self.max_entradas:
+                # Descartar la entrada más antigua (orden de inserción)
+                self._entradas.pop(next(iter(self._entradas)))
+            self._entradas[clave] = (time.monotonic() + self.ttl, usuario)
+
+    def invalidar(self, clave):
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+_configuracion = getattr(settings, 'JWT_USER_CACHE', {})
+cache_usuarios = CacheUsuarios(
+    ttl=_configuracion.get('TTL', 60),
+    max_entradas=_configuracion.get('MAX_ENTRIES', 1024),
+)
+
+
+def invalidar_usuario(user_id):
+    """Forzar la relectura del usuario en la próxima petición de este proceso"""
+    cache_usuarios.invalidar(str(user_id))
+
+
+class TokenRefrescoUsuario(RefreshToken):
+    """Refresh token con versión de token; el access token hereda el claim"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['token_version'] = user.token_version
+        return token
+
+
+class SerializadorRefrescoToken(TokenRefreshSerializer):
+    """No emite nuevos tokens a partir de un refresh token revocado"""
+    token_class = TokenRefrescoUsuario
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        version = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).values_list('token_version', flat=True).first()
+        if version is not None and version != refresh.get('token_version', 0):
+            raise AuthenticationFailed('Token revocado', code='token_revoked')
+        return super().validate(attrs)
+
+
+class JWTAutenticacionCacheada(JWTAuthentication):
+    """JWTAuthentication que evita el SELECT del usuario en cada petición"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken('El token no identifica a un usuario') from e
+
+        clave = str(user_id)
+        user = cache_usuarios.obtener(clave)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_usuarios.guardar(clave, user)
+        elif api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('Usuario inactivo', code='user_inactive')
+
+        if validated_token.get('token_version', 0) != user.token_version:
+            raise AuthenticationFailed('Token revocado', code='token_revoked')
+
+        return user
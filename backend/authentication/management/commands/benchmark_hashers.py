@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+from authentication.hashers import obtener_politica
+
+
+class Command(BaseCommand):
+    help = 'Mide el costo de hash y verificación de cada hasher configurado en este host'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Repeticiones por hasher'
+        )
+        parser.add_argument(
+            '--target-ms',
+            type=float,
+            default=None,
+            help='Latencia objetivo por login para sugerir PBKDF2_ITERATIONS'
+        )
+
+    def handle(self, *args, **options):
+        repeticiones = options['iterations']
+        politica = obtener_politica()
+        self.stdout.write(f"Algoritmo preferido: {politica['ALGORITHM']}")
+
+        for indice, hasher in enumerate(get_hashers()):
+            try:
+                if hasher.library:
+                    hasher._load_library()
+            except ValueError:
+                libreria = hasher.library[0] if isinstance(hasher.library, tuple) else hasher.library
+                self.stdout.write(f'- {hasher.algorithm}: no disponible (falta {libreria})')
+                continue
+
+            encoded = hasher.encode('benchmark-password', hasher.salt())
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                hasher.verify('benchmark-password', encoded)
+            ms = (time.perf_counter() - inicio) / repeticiones * 1000
+
+            marca = ' (preferido)' if indice == 0 else ''
+            parametros = ', '.join(
+                f'{clave}={valor}' for clave, valor in hasher.safe_summary(encoded).items()
+                if clave not in ('algorithm', 'salt', 'hash')
+            )
+            self.stdout.write(
+                f'- {hasher.algorithm}{marca}: {ms:.1f} ms/verificación, '
+                f'{1000 / ms:.1f} logins/s por worker ({parametros})'
+            )
+
+            if indice == 0 and options['target_ms'] and hasher.algorithm == 'pbkdf2_sha256':
+                sugeridas = int(hasher.iterations * options['target_ms'] / ms)
+                self.stdout.write(
+                    f'  PBKDF2_ITERATIONS sugerido para {options["target_ms"]:.0f} ms: {sugeridas}'
+                )
@@ -0,0 +1,68 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory
+
+from authentication.models import CustomUser
+from authentication.views import LoginView
+
+
+class Command(BaseCommand):
+    help = 'Mide logins por segundo y consultas por login de LoginView'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Cantidad de logins por escenario'
+        )
+
+    def handle(self, *args, **options):
+        iteraciones = options['iterations']
+        username = f'bench_{uuid.uuid4().hex[:12]}'
+        password = uuid.uuid4().hex
+        usuario = CustomUser.objects.create_user(username=username, password=password)
+
+        # Sin límite de intentos: se mide el costo del login, no el del limitador
+        sin_limite = override_settings(LOGIN_RATE_LIMIT={
+            'IP': (iteraciones * 2, 60), 'USERNAME': (iteraciones * 2, 60),
+        })
+        try:
+            sin_limite.enable()
+            self.stdout.write(f'Escenarios de login ({iteraciones} iteraciones cada uno):')
+            self.medir('exitoso', username, password, iteraciones)
+            self.medir('fallido', username, 'incorrecta', iteraciones, reiniciar=usuario)
+        finally:
+            sin_limite.disable()
+            usuario.delete()
+
+    def medir(self, nombre, username, password, iteraciones, reiniciar=None):
+        vista = LoginView.as_view()
+        fabrica = APIRequestFactory()
+        consultas = 0
+        duracion = 0.0
+
+        for _ in range(iteraciones):
+            if reiniciar is not None:
+                # Mantener el usuario por debajo del límite para medir solo el camino 401
+                CustomUser.objects.filter(pk=reiniciar.pk).update(
+                    failed_login_attempts=0, is_locked=False, locked_until=None
+                )
+            peticion = fabrica.post(
+                '/api/auth/login/', {'username': username, 'password': password}, format='json'
+            )
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                vista(peticion)
+                duracion += time.perf_counter() - inicio
+            consultas += len(capturadas)
+
+        self.stdout.write(
+            f'- {nombre}: {iteraciones / duracion:.1f} logins/s, '
+            f'{duracion / iteraciones * 1000:.1f} ms/login, '
+            f'{consultas / iteraciones:.1f} consultas/login'
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from authentication.jwt_auth import invalidar_usuario
+from authentication.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'Revoca los JWT emitidos a los usuarios indicados (p. ej. tras un cambio de contraseña)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='+', help='Usuarios cuyos tokens se revocan')
+
+    def handle(self, *args, **options):
+        encontrados = dict(
+            CustomUser.objects.filter(username__in=options['usernames']).values_list('username', 'pk')
+        )
+        faltantes = set(options['usernames']) - set(encontrados)
+        if faltantes:
+            raise CommandError(f'No existen los usuarios: {", ".join(sorted(faltantes))}')
+
+        # Los access y refresh tokens con la versión anterior dejan de aceptarse
+        CustomUser.objects.filter(pk__in=encontrados.values()).update(token_version=F('token_version') + 1)
+        for user_id in encontrados.values():
+            invalidar_usuario(user_id)
+        self.stdout.write(self.style.SUCCESS(f'Se revocaron los tokens de {len(encontrados)} usuarios'))
@@ -5,6 +5,9 @@ class CustomUser(AbstractUser):
     failed_login_attempts = models.IntegerField(default=0)
     is_locked = models.BooleanField(default=False)
     locked_until = models.DateTimeField(null=True, blank=True)
+
+    # Versión embebida en los JWT; al incrementarla (revoke_tokens) se revocan los tokens emitidos
+    token_version = models.IntegerField(default=0)
     
     ROLE_CHOICES = [
         ('admin', 'Administrador'),
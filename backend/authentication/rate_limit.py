@@ -0,0 +1,102 @@
+# Limitador de intentos de login con ventana deslizante
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+CONFIGURACION_POR_DEFECTO = {
+    'BACKEND': 'authentication.rate_limit.LimitadorMemoria',
+    'OPTIONS': {},
+    'IP': (30, 60),        # intentos por ventana (segundos) desde una IP
+    'USERNAME': (10, 60),  # intentos por ventana (segundos) contra un usuario
+}
+
+
+class LimitadorMemoria:
+    """Registro exacto de marcas de tiempo por clave, local al proceso"""
+
+    def __init__(self, max_claves=10000):
+        self.max_claves = max_claves
+        self._marcas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, clave, limite, ventana):
+        """Registrar un intento; devuelve los segundos de espera o 0 si se permite"""
+        ahora = time.monotonic()
+        with self._lock:
+            marcas = self._marcas.get(clave)
+            if marcas is None:
+                if len(self._marcas) >= self.max_claves:
+                    self._purgar(ahora, ventana)
+                marcas = self._marcas[clave] = deque()
+            while marcas and marcas[0] <= ahora - ventana:
+                marcas.popleft()
+            if len(marcas) >= limite:
+                return marcas[0] + ventana - ahora
+            marcas.append(ahora)
+            return 0
+
+    def _purgar(self, ahora, ventana):
+        """Eliminar claves sin intentos recientes; si no alcanza, la más antigua"""
+        vencidas = [c for c, m in self._marcas.items() if not m or m[-1] <= ahora - ventana]
+        for clave in vencidas:
+            del self._marcas[clave]
+        if len(self._marcas) >= self.max_claves:
+            self._marcas.pop(next(iter(self._marcas)))
+
+
+class LimitadorCache:
+    """Contador de ventana deslizante sobre un cache de Django compartido (Redis, Memcached)"""
+
+    def __init__(self, cache='default', prefijo='login_rl'):
+        self.cache = caches[cache]
+        self.prefijo = prefijo
+
+    def registrar(self, clave, limite, ventana):
+        ahora = time.time()
+        periodo = int(ahora // ventana)
+        transcurrido = (ahora % ventana) / ventana
+        clave_actual = f'{self.prefijo}:{clave}:{periodo}'
+        clave_anterior = f'{self.prefijo}:{clave}:{periodo - 1}'
+
+        valores = self.cache.get_many([clave_actual, clave_anterior])
+        # Estimación: el periodo anterior pesa según lo que aún cubre la ventana
+        estimado = valores.get(clave_anterior, 0) * (1 - transcurrido) + valores.get(clave_actual, 0)
+        if estimado >= limite:
+            return ventana * (1 - transcurrido)
+
+        if not self.cache.add(clave_actual, 1, timeout=ventana * 2):
+            try:
+                self.cache.incr(clave_actual)
+            except ValueError:
+                self.cache.set(clave_actual, 1, timeout=ventana * 2)
+        return 0
+
+
+def obtener_configuracion():
+    return {**CONFIGURACION_POR_DEFECTO, **getattr(settings, 'LOGIN_RATE_LIMIT', {})}
+
+
+@lru_cache(maxsize=None)
+def obtener_limitador(backend, opciones):
+    return import_string(backend)(**dict(opciones))
+
+
+def verificar_intento_login(ip, username):
+    """Registrar el intento por IP y por usuario; devuelve segundos de espera o 0"""
+    configuracion = obtener_configuracion()
+    limitador = obtener_limitador(
+        configuracion['BACKEND'], tuple(sorted(configuracion['OPTIONS'].items()))
+    )
+
+    limite, ventana = configuracion['IP']
+    espera = limitador.registrar(f'ip:{ip}', limite, ventana)
+    if espera:
+        return espera
+
+    limite, ventana = configuracion['USERNAME']
+    return limitador.registrar(f'usuario:{username.strip().lower()}', limite, ventana)
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from .jwt_auth import invalidar_usuario
+from .models import CustomUser
+
+# Enviada por LoginView con resultado=exitoso, credenciales_invalidas, bloqueado,
+# bloqueo_nuevo, usuario_inexistente, limitado o incompleto
+intento_login = Signal()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidar_cache_usuario(sender, instance, **kwargs):
+    """Cualquier cambio del usuario descarta su copia en caché"""
+    invalidar_usuario(instance.pk)
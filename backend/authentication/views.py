@@ -2,81 +2,129 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
+from rest_framework.throttling import BaseThrottle
+from django.db.models import Case, F, Q, Value, When
 from django.utils import timezone
 from datetime import timedelta
+from math import ceil
+from .jwt_auth import TokenRefrescoUsuario, invalidar_usuario
 from .models import CustomUser
+from .rate_limit import verificar_intento_login
 from .serializers import UserSerializer
+from .signals import intento_login
+
+# Política de bloqueo por intentos fallidos
+MAX_INTENTOS_FALLIDOS = 3
+DURACION_BLOQUEO = timedelta(minutes=15)
+
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
+        resultado, response = self.autenticar(request)
+        intento_login.send(sender=self.__class__, resultado=resultado)
+        return response
+
+    def autenticar(self, request):
+        """Devuelve (resultado, response); el resultado alimenta las métricas de login"""
         username = request.data.get('username')
         password = request.data.get('password')
 
         if not username or not password:
-            return Response(
+            return 'incompleto', Response(
                 {'error': 'Usuario y contraseña son requeridos'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            user = CustomUser.objects.get(username=username)
-            
-            # Verificar bloqueo
-            if user.is_locked:
-                if user.locked_until and timezone.now() > user.locked_until:
-                    user.is_locked = False
-                    user.failed_login_attempts = 0
-                    user.locked_until = None
-                    user.save()
-                else:
-                    return Response(
-                        {'error': 'Usuario bloqueado. Intente más tarde.'},
-                        status=status.HTTP_423_LOCKED
-                    )
-
-            # Autenticar
-            authenticated_user = authenticate(username=username, password=password)
-            
-            if authenticated_user:
-                user.failed_login_attempts = 0
-                user.save()
-                
-                refresh = RefreshToken.for_user(authenticated_user)
-                return Response({
-                    'message': 'Login exitoso',
-                    'user': UserSerializer(authenticated_user).data,
-                    'access': str(refresh.access_token),
-                    'refresh': str(refresh),
-                })
-            else:
-                user.failed_login_attempts += 1
-                
-                if user.failed_login_attempts >= 3:
-                    user.is_locked = True
-                    user.locked_until = timezone.now() + timedelta(minutes=15)
-                    user.save()
-                    return Response(
-                        {'error': 'Usuario bloqueado por múltiples intentos fallidos'},
-                        status=status.HTTP_423_LOCKED
-                    )
-                else:
-                    user.save()
-                    remaining = 3 - user.failed_login_attempts
-                    return Response(
-                        {'error': f'Credenciales inválidas. {remaining} intentos restantes'},
-                        status=status.HTTP_401_UNAUTHORIZED
-                    )
-
-        except CustomUser.DoesNotExist:
-            return Response(
+        # Un JSON con números u objetos no es una credencial (y rompería el limitador)
+        if not isinstance(username, str) or not isinstance(password, str):
+            return 'incompleto', Response(
+                {'error': 'Usuario y contraseña deben ser texto'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Limitar intentos por IP y por usuario antes de tocar la BD
+        espera = verificar_intento_login(BaseThrottle().get_ident(request), username)
+        if espera:
+            segundos = ceil(espera)
+            return 'limitado', Response(
+                {'error': f'Demasiados intentos. Intente nuevamente en {segundos} segundos.'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(segundos)}
+            )
+
+        # Única lectura del usuario durante todo el login
+        user = CustomUser.objects.filter(username=username).first()
+        if user is None:
+            return 'usuario_inexistente', Response(
                 {'error': 'Usuario no encontrado'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        usuarios = CustomUser.objects.filter(pk=user.pk)
+        ahora = timezone.now()
+
+        # Verificar bloqueo
+        if user.is_locked:
+            if user.locked_until and ahora > user.locked_until:
+                # Desbloqueo condicional: solo si sigue vencido en la BD
+                usuarios.filter(is_locked=True, locked_until__lt=ahora).update(
+                    is_locked=False, failed_login_attempts=0, locked_until=None
+                )
+                invalidar_usuario(user.pk)
+                user.is_locked = False
+                user.failed_login_attempts = 0
+                user.locked_until = None
+            else:
+                return 'bloqueado', Response(
+                    {'error': 'Usuario bloqueado. Intente más tarde.'},
+                    status=status.HTTP_423_LOCKED
+                )
+
+        # Autenticar sobre la instancia ya cargada (authenticate() volvería a consultarla)
+        if user.is_active and user.check_password(password):
+            if user.failed_login_attempts:
+                usuarios.update(failed_login_attempts=0)
+                user.failed_login_attempts = 0
+                invalidar_usuario(user.pk)
+
+            refresh = TokenRefrescoUsuario.for_user(user)
+            return 'exitoso', Response({
+                'message': 'Login exitoso',
+                'user': UserSerializer(user).data,
+                'access': str(refresh.access_token),
+                'refresh': str(refresh),
+            })
+
+        # Incremento atómico; el bloqueo se decide en la BD con el valor previo,
+        # así los intentos concurrentes no pierden actualizaciones.
+        # El bloqueo solo impide nuevos logins: no revoca los JWT ya emitidos,
+        # o cualquiera podría cerrar la sesión de otro con contraseñas erróneas.
+        alcanza_limite = Q(failed_login_attempts__gte=MAX_INTENTOS_FALLIDOS - 1)
+        usuarios.update(
+            failed_login_attempts=F('failed_login_attempts') + 1,
+            is_locked=Case(When(alcanza_limite, then=Value(True)), default=F('is_locked')),
+            locked_until=Case(
+                When(alcanza_limite, then=Value(ahora + DURACION_BLOQUEO)),
+                default=F('locked_until')
+            ),
+        )
+        invalidar_usuario(user.pk)
+        intentos = user.failed_login_attempts + 1
+
+        if intentos >= MAX_INTENTOS_FALLIDOS:
+            return 'bloqueo_nuevo', Response(
+                {'error': 'Usuario bloqueado por múltiples intentos fallidos'},
+                status=status.HTTP_423_LOCKED
+            )
+
+        remaining = MAX_INTENTOS_FALLIDOS - intentos
+        return 'credenciales_invalidas', Response(
+            {'error': f'Credenciales inválidas. {remaining} intentos restantes'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
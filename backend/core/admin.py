@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Owner, Pet, Service, Appointment
+from .models import Owner, Pet, Service, Appointment, AppointmentArchive
 
 @admin.register(Owner)
 class OwnerAdmin(admin.ModelAdmin):
@@ -32,4 +32,11 @@ class AppointmentAdmin(admin.ModelAdmin):
     list_display = ['appointment_date', 'pet', 'service', 'status']
     list_filter = ['status', 'service__service_type']
     search_fields = ['pet__name', 'pet__owner__full_name', 'service__name']
-    date_hierarchy = 'appointment_date'
\ No newline at end of file
+    date_hierarchy = 'appointment_date'
+
+@admin.register(AppointmentArchive)
+class AppointmentArchiveAdmin(admin.ModelAdmin):
+    list_display = ['appointment_date', 'pet', 'service', 'status', 'archived_at']
+    list_filter = ['status', 'service__service_type']
+    search_fields = ['pet__name', 'pet__owner__full_name', 'service__name']
+    date_hierarchy = 'appointment_date'
@@ -0,0 +1,373 @@
+# Motor de reportes en memoria: acumulados diarios de citas, cacheados por día
+import math
+import time
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .archive import consultas_citas
+
+MOTORES = ('auto', 'sql', 'memory')
+
+CONFIGURACION_POR_DEFECTO = {
+    'ENGINE': 'auto',     # auto: memoria para rangos de al menos MIN_DAYS días
+    'MIN_DAYS': 90,
+    'MAX_DAYS': 1830,     # días por consulta: un acumulado (una clave de caché) por día
+    'CACHE': 'default',
+    'TTL': 86400,         # segundos, con un caché compartido entre procesos
+    'LOCAL_TTL': 300,     # segundos, con un caché local de cada proceso (LocMemCache)
+    'CHUNK_SIZE': 5000,   # filas por lectura del cursor al construir los acumulados
+    # Duración sugerida por servicio: percentil de la duración real, redondeado hacia arriba
+    'SUGGESTION_PERCENTILE': 80,
+    'SUGGESTION_MIN_SAMPLES': 20,
+    'SUGGESTION_ROUND_MINUTES': 5,
+}
+
+CLAVE_VERSION = 'analitica:version'
+
+# Columnas proyectadas por cita; el día local se calcula en la base
+COLUMNAS = (
+    'status', 'service_id', 'assigned_professional_id', 'price_charged',
+    'actual_start_time', 'actual_end_time',
+)
+
+
+def obtener_configuracion():
+    return {**CONFIGURACION_POR_DEFECTO, **getattr(settings, 'REPORT_ANALYTICS', {})}
+
+
+def obtener_cache():
+    return caches[obtener_configuracion()['CACHE']]
+
+
+def cache_compartida():
+    """Si todos los procesos ven la misma caché (y por tanto las mismas invalidaciones)"""
+    return not isinstance(obtener_cache(), (LocMemCache, DummyCache))
+
+
+def duracion_cache(configuracion):
+    """Con una caché por proceso, las invalidaciones de otros workers no llegan: TTL corto"""
+    return configuracion['TTL'] if cache_compartida() else min(configuracion['TTL'], configuracion['LOCAL_TTL'])
+
+
+def obtener_version():
+    """Prefijo de las claves vigentes; invalidar_todo() lo reemplaza"""
+    cache = obtener_cache()
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        nueva = format(time.time_ns(), 'x')
+        cache.add(CLAVE_VERSION, nueva, timeout=None)
+        version = cache.get(CLAVE_VERSION) or nueva
+    return version
+
+
+def clave_dia(version, dia):
+    return f'analitica:{version}:dia:{dia.isoformat()}'
+
+
+def invalidar_dias(*dias):
+    """Descartar los acumulados de los días indicados (fechas locales)"""
+    version = obtener_version()
+    obtener_cache().delete_many([clave_dia(version, dia) for dia in set(dias) if dia])
+
+
+def invalidar_todo():
+    """Descartar todos los acumulados (cambios masivos que no pasan por save())"""
+    obtener_cache().delete(CLAVE_VERSION)
+
+
+def invalidar_cita(cita):
+    """Al confirmar la transacción, descartar el día actual y el anterior de una cita"""
+    dias = [timezone.localdate(cita.appointment_date)] if cita.appointment_date else []
+    original = getattr(cita, '_appointment_date_original', None)
+    if original:
+        dias.append(timezone.localdate(original))
+    if dias:
+        transaction.on_commit(lambda: invalidar_dias(*dias))
+
+
+def validar_rango(inicio, fin):
+    """ValueError si el rango de fechas no es válido o supera MAX_DAYS días"""
+    if fin < inicio:
+        raise ValueError('end_date debe ser posterior a start_date')
+    max_dias = obtener_configuracion()['MAX_DAYS']
+    if (fin - inicio).days + 1 > max_dias:
+        raise ValueError(f'El rango no puede superar {max_dias} días')
+
+
+def elegir_motor(motor, inicio, fin):
+    """'sql' o 'memory' según el parámetro de la petición (o ENGINE) y el rango pedido.
+
+    El motor en memoria necesita un rango cerrado de hasta MAX_DAYS días
+    (un acumulado por día); sin fechas se usa SQL y un rango mayor es un
+    error con engine=memory. auto solo lo elige con una caché compartida:
+    con una caché por proceso, un worker no ve las invalidaciones de otro.
+    """
+    configuracion = obtener_configuracion()
+    motor = motor or configuracion['ENGINE']
+    if motor not in MOTORES:
+        raise ValueError(f'engine debe ser uno de {list(MOTORES)}')
+    if inicio is None or fin is None or fin < inicio:
+        return 'sql'
+    dias = (fin - inicio).days + 1
+    if motor == 'auto':
+        en_rango = configuracion['MIN_DAYS'] <= dias <= configuracion['MAX_DAYS']
+        return 'memory' if en_rango and cache_compartida() else 'sql'
+    if motor == 'memory':
+        validar_rango(inicio, fin)
+    return motor
+
+
+def particion_vacia():
+    """Acumulado de un día.
+
+    conteos: (estado, servicio, profesional) -> [citas, suma de price_charged o None]
+    duraciones: (servicio, profesional) -> minutos reales (actual_end_time - actual_start_time)
+    """
+    return {'conteos': {}, 'duraciones': {}}
+
+
+def construir_particiones(desde, hasta):
+    """Acumulados de cada día entre dos fechas locales (inclusive), una lectura en streaming por tabla"""
+    inicio = timezone.make_aware(datetime.combine(desde, datetime.min.time()))
+    fin = timezone.make_aware(datetime.combine(hasta + timedelta(days=1), datetime.min.time()))
+    particiones = defaultdict(particion_vacia)
+    for consulta in consultas_citas(inicio):
+        filas = consulta.filter(appointment_date__gte=inicio, appointment_date__lt=fin).order_by().annotate(
+            dia=TruncDate('appointment_date')
+        ).values_list('dia', *COLUMNAS).iterator(chunk_size=obtener_configuracion()['CHUNK_SIZE'])
+        for dia, estado, servicio, profesional, precio, comienzo, termino in filas:
+            particion = particiones[dia]
+            acumulado = particion['conteos'].setdefault((estado, servicio, profesional or 0), [0, None])
+            acumulado[0] += 1
+            if precio is not None:
+                acumulado[1] = (acumulado[1] or 0) + precio
+            if comienzo and termino and termino >= comienzo:
+                particion['duraciones'].setdefault((servicio, profesional or 0), array('d')).append(
+                    (termino - comienzo).total_seconds() / 60
+                )
+    return particiones
+
+
+def obtener_particiones(inicio, fin):
+    """[(día, acumulado)] del rango; solo se consultan los días que no están en caché"""
+    configuracion = obtener_configuracion()
+    cache = obtener_cache()
+    version = obtener_version()
+    dias = [inicio + timedelta(days=n) for n in range((fin - inicio).days + 1)]
+    claves = {clave_dia(version, dia): dia for dia in dias}
+
+    particiones = {claves[clave]: particion for clave, particion in cache.get_many(claves).items()}
+    faltantes = [dia for dia in dias if dia not in particiones]
+    if faltantes:
+        construidas = construir_particiones(faltantes[0], faltantes[-1])
+        nuevas = {dia: construidas.get(dia) or particion_vacia() for dia in faltantes}
+        cache.set_many(
+            {clave_dia(version, dia): particion for dia, particion in nuevas.items()},
+            timeout=duracion_cache(configuracion)
+        )
+        particiones.update(nuevas)
+    return [(dia, particiones[dia]) for dia in dias]
+
+
+def percentil(ordenados, p):
+    """Percentil p (0-100) con interpolación lineal sobre valores ya ordenados"""
+    if not ordenados:
+        return None
+    posicion = (len(ordenados) - 1) * p / 100
+    bajo = math.floor(posicion)
+    alto = min(bajo + 1, len(ordenados) - 1)
+    return ordenados[bajo] + (ordenados[alto] - ordenados[bajo]) * (posicion - bajo)
+
+
+def resumen_duraciones(valores):
+    """Cantidad, promedio y percentiles 50/90 de una serie de minutos"""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return {'count': 0, 'mean_minutes': None, 'p50_minutes': None, 'p90_minutes': None}
+    return {
+        'count': len(ordenados),
+        'mean_minutes': round(math.fsum(ordenados) / len(ordenados), 1),
+        'p50_minutes': round(percentil(ordenados, 50), 1),
+        'p90_minutes': round(percentil(ordenados, 90), 1),
+    }
+
+
+def combinar_conteos(particiones):
+    """Conteos e ingresos del rango sumados por (estado, servicio, profesional)"""
+    combinados = {}
+    for _, particion in particiones:
+        for clave, (cantidad, ingreso) in particion['conteos'].items():
+            acumulado = combinados.setdefault(clave, [0, None])
+            acumulado[0] += cantidad
+            if ingreso is not None:
+                acumulado[1] = (acumulado[1] or 0) + ingreso
+    return combinados
+
+
+def combinar_duraciones(particiones):
+    """Minutos reales del rango por (servicio, profesional)"""
+    combinadas = defaultdict(lambda: array('d'))
+    for _, particion in particiones:
+        for clave, valores in particion['duraciones'].items():
+            combinadas[clave].extend(valores)
+    return combinadas
+
+
+def resumen_citas(inicio, fin, servicios):
+    """Datos de appointments_summary a partir de los acumulados diarios.
+
+    `servicios` es {id: (nombre, tipo)}; la tendencia de 30 días cuenta solo
+    citas dentro del rango, igual que el reporte SQL.
+    """
+    particiones = obtener_particiones(inicio, fin)
+    conteos = combinar_conteos(particiones)
+
+    por_estado = defaultdict(int)
+    por_servicio = {}
+    for (estado, servicio, _), (cantidad, ingreso) in conteos.items():
+        por_estado[estado] += cantidad
+        nombre, tipo = servicios.get(servicio, (None, None))
+        fila = por_servicio.setdefault((nombre, tipo), {
+            'service__name': nombre, 'service__service_type': tipo, 'count': 0, 'total_revenue': None,
+        })
+        fila['count'] += cantidad
+        # Los ingresos excluyen citas canceladas, igual que services_report
+        if ingreso is not None and estado != 'cancelada':
+            fila['total_revenue'] = (fila['total_revenue'] or 0) + ingreso
+
+    hoy = timezone.localdate()
+    dias = [hoy - timedelta(days=i) for i in range(29, -1, -1)]
+    desde, hasta = max(dias[0], inicio), min(hoy, fin)
+    por_dia = {
+        dia: sum(cantidad for cantidad, _ in particion['conteos'].values())
+        for dia, particion in (obtener_particiones(desde, hasta) if desde <= hasta else [])
+    }
+
+    duraciones = combinar_duraciones(particiones)
+    return {
+        'by_status': sorted(
+            ({'status': estado, 'count': cantidad} for estado, cantidad in por_estado.items()),
+            key=lambda fila: fila['status']
+        ),
+        'by_service': sorted(por_servicio.values(), key=lambda fila: -fila['count']),
+        'last_30_days': [
+            {'date': dia.strftime('%Y-%m-%d'), 'count': por_dia.get(dia, 0)} for dia in dias
+        ],
+        'actual_duration': resumen_duraciones(
+            valor for valores in duraciones.values() for valor in valores
+        ),
+    }
+
+
+def filas_por_servicio(inicio, fin):
+    """Filas por servicio con la forma de la agregación SQL de estadisticas_servicios.
+
+    primera/ultima son el inicio del primer y del último día con citas (hora
+    local): solo se usan para contar meses calendario.
+    """
+    filas = {}
+    for dia, particion in obtener_particiones(inicio, fin):
+        for (estado, servicio, _), (cantidad, ingreso) in particion['conteos'].items():
+            fila = filas.get(servicio)
+            if fila is None:
+                fila = filas[servicio] = {
+                    'service_id': servicio, 'appointments_count': 0, 'cancelled_count': 0,
+                    'total_revenue': None, 'primera': dia, 'ultima': dia,
+                }
+            fila['appointments_count'] += cantidad
+            if estado == 'cancelada':
+                fila['cancelled_count'] += cantidad
+            elif ingreso is not None:
+                fila['total_revenue'] = (fila['total_revenue'] or 0) + ingreso
+            fila['ultima'] = dia
+
+    for fila in filas.values():
+        for extremo in ('primera', 'ultima'):
+            fila[extremo] = timezone.make_aware(datetime.combine(fila[extremo], datetime.min.time()))
+    return filas
+
+
+def duracion_sugerida(ordenados, configuracion):
+    """Percentil configurado de la duración real, redondeado hacia arriba; None con pocas muestras"""
+    if len(ordenados) < configuracion['SUGGESTION_MIN_SAMPLES']:
+        return None
+    redondeo = configuracion['SUGGESTION_ROUND_MINUTES']
+    return max(math.ceil(percentil(ordenados, configuracion['SUGGESTION_PERCENTILE']) / redondeo) * redondeo, redondeo)
+
+
+def resumen_excesos(excesos):
+    """Promedio y percentiles 50/90 del exceso (real - agendado, en minutos) y proporción de citas excedidas"""
+    ordenados = sorted(excesos)
+    if not ordenados:
+        return {
+            'mean_overrun_minutes': None, 'p50_overrun_minutes': None,
+            'p90_overrun_minutes': None, 'overrun_rate': None,
+        }
+    return {
+        'mean_overrun_minutes': round(math.fsum(ordenados) / len(ordenados), 1),
+        'p50_overrun_minutes': round(percentil(ordenados, 50), 1),
+        'p90_overrun_minutes': round(percentil(ordenados, 90), 1),
+        'overrun_rate': round(sum(1 for exceso in ordenados if exceso > 0) / len(ordenados), 4),
+    }
+
+
+def duraciones_reales(inicio, fin, servicios, profesionales):
+    """Duración real frente a Service.duration_minutes por servicio y por profesional.
+
+    `servicios` es {id: (nombre, tipo, minutos agendados)} y `profesionales`
+    {id: nombre}. El exceso de cada cita se mide contra la duración vigente
+    de su servicio; la duración sugerida sale del percentil configurado.
+    """
+    configuracion = obtener_configuracion()
+    por_servicio = defaultdict(lambda: array('d'))
+    excesos_servicio = defaultdict(lambda: array('d'))
+    excesos_profesional = defaultdict(lambda: array('d'))
+    for (servicio, profesional), valores in combinar_duraciones(obtener_particiones(inicio, fin)).items():
+        if servicio not in servicios:
+            continue
+        agendado = servicios[servicio][2]
+        excesos = array('d', (valor - agendado for valor in valores))
+        por_servicio[servicio].extend(valores)
+        excesos_servicio[servicio].extend(excesos)
+        if profesional:
+            excesos_profesional[profesional].extend(excesos)
+
+    filas_servicios = []
+    for servicio, valores in por_servicio.items():
+        nombre, tipo, agendado = servicios[servicio]
+        ordenados = sorted(valores)
+        filas_servicios.append({
+            'id': servicio,
+            'name': nombre,
+            'service_type': tipo,
+            'scheduled_minutes': agendado,
+            **resumen_duraciones(ordenados),
+            **resumen_excesos(excesos_servicio[servicio]),
+            'suggested_minutes': duracion_sugerida(ordenados, configuracion),
+        })
+
+    filas_profesionales = [
+        {
+            'id': profesional,
+            'name': profesionales.get(profesional),
+            'count': len(excesos),
+            **resumen_excesos(excesos),
+        }
+        for profesional, excesos in excesos_profesional.items()
+    ]
+
+    return {
+        'start': inicio,
+        'end': fin,
+        'services': sorted(filas_servicios, key=lambda fila: -fila['count']),
+        'professionals': sorted(filas_profesionales, key=lambda fila: -fila['count']),
+    }
@@ -0,0 +1,92 @@
+# Lecturas que combinan citas vigentes (core_appointment) y archivadas
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Appointment, AppointmentArchive
+
+CONFIGURACION_POR_DEFECTO = {
+    'HORIZON_DAYS': 730,   # antigüedad a partir de la cual una cita puede archivarse
+    'BATCH_SIZE': 1000,    # citas movidas por transacción
+}
+
+# El tablero (hoy, mes en curso) y las tendencias de 30 días nunca leen el archivo
+HORIZONTE_MINIMO = 90
+
+
+def obtener_configuracion():
+    return {**CONFIGURACION_POR_DEFECTO, **getattr(settings, 'APPOINTMENT_ARCHIVE', {})}
+
+
+def limite_archivo(ahora=None):
+    """Fecha antes de la cual puede haber citas archivadas.
+
+    archive_appointments solo mueve citas anteriores a ahora - HORIZON_DAYS,
+    así que un rango que empieza después de este límite se resuelve solo con
+    la tabla vigente.
+    """
+    return (ahora or timezone.now()) - timedelta(days=obtener_configuracion()['HORIZON_DAYS'])
+
+
+def requiere_archivo(desde):
+    """Si un rango que empieza en `desde` (None = sin límite) puede incluir citas archivadas"""
+    return desde is None or desde < limite_archivo()
+
+
+def consultas_citas(desde=None):
+    """Querysets base a consultar para un rango: vigentes y, si hace falta, archivadas"""
+    consultas = [Appointment.objects.all()]
+    if requiere_archivo(desde):
+        consultas.append(AppointmentArchive.objects.all())
+    return consultas
+
+
+def sumar_agrupados(grupos, claves, campos):
+    """Combinar filas agrupadas por `claves` de varias fuentes sumando `campos` (conteos y sumas)"""
+    combinadas = {}
+    for filas in grupos:
+        for fila in filas:
+            clave = tuple(fila[nombre] for nombre in claves)
+            existente = combinadas.get(clave)
+            if existente is None:
+                combinadas[clave] = dict(fila)
+                continue
+            for campo in campos:
+                if fila[campo] is not None:
+                    existente[campo] = (existente[campo] or 0) + fila[campo]
+    return list(combinadas.values())
+
+
+def combinar_agrupados(consultas, claves, **agregados):
+    """values(*claves).annotate(**agregados) sobre cada queryset, con los resultados sumados"""
+    return sumar_agrupados(
+        [consulta.order_by().values(*claves).annotate(**agregados) for consulta in consultas],
+        claves, agregados,
+    )
+
+
+def conteo_por_fila(consulta, campo):
+    """Subconsulta con la cantidad de filas de `consulta` cuyo `campo` apunta a la fila externa.
+
+    Permite sumar citas vigentes y archivadas sin multiplicar filas con dos
+    joins ni agrupar la consulta externa.
+    """
+    return Coalesce(
+        Subquery(
+            consulta.filter(**{campo: OuterRef('pk')}).order_by()
+            .values(campo).annotate(total=Count('pk')).values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def total_citas(campo):
+    """Citas vigentes más archivadas por fila externa (campo 'pet' o 'pet__owner')"""
+    return (
+        conteo_por_fila(Appointment.objects.all(), campo)
+        + conteo_por_fila(AppointmentArchive.objects.all(), campo)
+    )
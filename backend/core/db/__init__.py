@@ -0,0 +1 @@
+# Conexiones a base de datos: pool y backends que lo usan
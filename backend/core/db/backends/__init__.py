@@ -0,0 +1 @@
+# Backends de Django con pool de conexiones (core/db/pool.py)
@@ -0,0 +1,8 @@
+# ENGINE 'core.db.backends.mssql_pool': backend mssql con pool de conexiones por proceso
+from mssql.base import DatabaseWrapper as DatabaseWrapperMssql
+
+from ...pool import MixinPool
+
+
+class DatabaseWrapper(MixinPool, DatabaseWrapperMssql):
+    pass
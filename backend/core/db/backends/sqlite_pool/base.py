@@ -0,0 +1,8 @@
+# ENGINE 'core.db.backends.sqlite_pool': SQLite con el mismo pool, para probarlo sin SQL Server
+from django.db.backends.sqlite3.base import DatabaseWrapper as DatabaseWrapperSqlite
+
+from ...pool import MixinPool
+
+
+class DatabaseWrapper(MixinPool, DatabaseWrapperSqlite):
+    pass
@@ -0,0 +1,183 @@
+# Pool de conexiones por proceso para backends sin pool propio (mssql)
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+CONFIGURACION_POR_DEFECTO = {
+    'MAX_SIZE': 10,    # conexiones abiertas como máximo por proceso
+    'TIMEOUT': 30,     # segundos esperando una conexión libre antes de fallar
+    'MAX_IDLE': 300,   # segundos que una conexión libre puede quedar sin uso
+}
+
+# Pools del proceso por alias de base de datos
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+class PoolConexiones:
+    """Conexiones DB-API libres reutilizadas entre peticiones e hilos.
+
+    obtener() entrega una conexión libre (verificada con SELECT 1 si se pide)
+    o abre una nueva mientras haya menos de MAX_SIZE; si no, espera hasta
+    TIMEOUT segundos. devolver() la deja libre tras un rollback; las que
+    fallan o superan MAX_IDLE sin uso se cierran.
+    """
+
+    def __init__(self, max_size, timeout, max_idle):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._libres = deque()
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+        self.estadisticas = {'created': 0, 'reused': 0, 'discarded': 0, 'timeout': 0}
+
+    def obtener(self, crear, verificar=False):
+        limite = time.monotonic() + self.timeout
+        while True:
+            conexion = self._reservar(limite)
+            if conexion is None:
+                break
+            if not verificar or self._usable(conexion):
+                self._contar('reused')
+                return conexion
+            self.descartar(conexion)
+
+        try:
+            conexion = crear()
+        except BaseException:
+            self._liberar_cupo()
+            raise
+        self._contar('created')
+        return conexion
+
+    def _reservar(self, limite):
+        """Una conexión libre, o None tras reservar cupo para abrir otra"""
+        with self._condicion:
+            while True:
+                ahora = time.monotonic()
+                while self._libres:
+                    conexion, devuelta = self._libres.pop()
+                    if ahora - devuelta <= self.max_idle:
+                        return conexion
+                    self._abiertas -= 1
+                    self.estadisticas['discarded'] += 1
+                    self._cerrar(conexion)
+                if self._abiertas < self.max_size:
+                    self._abiertas += 1
+                    return None
+                restante = limite - ahora
+                if restante <= 0 or not self._condicion.wait(restante):
+                    self.estadisticas['timeout'] += 1
+                    raise OperationalError(
+                        f'No hay conexiones libres en el pool ({self.max_size}) tras {self.timeout} s'
+                    )
+
+    def devolver(self, conexion):
+        try:
+            # Nada de una petición queda abierto para la siguiente
+            conexion.rollback()
+        except Exception:
+            self.descartar(conexion)
+            return
+        with self._condicion:
+            self._libres.append((conexion, time.monotonic()))
+            self._condicion.notify()
+
+    def descartar(self, conexion):
+        self._cerrar(conexion)
+        self._liberar_cupo('discarded')
+
+    def cerrar_libres(self):
+        with self._condicion:
+            libres, self._libres = list(self._libres), deque()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+        for conexion, _ in libres:
+            self._cerrar(conexion)
+
+    def _liberar_cupo(self, evento=None):
+        with self._condicion:
+            if evento:
+                self.estadisticas[evento] += 1
+            self._abiertas -= 1
+            self._condicion.notify()
+
+    def _contar(self, evento):
+        with self._condicion:
+            self.estadisticas[evento] += 1
+
+    def resumen(self):
+        """Copia de las estadísticas, leída bajo el mismo lock que las actualiza"""
+        with self._condicion:
+            return dict(self.estadisticas)
+
+    @staticmethod
+    def _usable(conexion):
+        try:
+            cursor = conexion.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _cerrar(conexion):
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+
+def obtener_pool(alias, configuracion):
+    """Pool del proceso para un alias (se crea con la configuración POOL de DATABASES)"""
+    with _lock_pools:
+        pool = _pools.get(alias)
+        if pool is None:
+            configuracion = {**CONFIGURACION_POR_DEFECTO, **(configuracion or {})}
+            pool = _pools[alias] = PoolConexiones(
+                configuracion['MAX_SIZE'], configuracion['TIMEOUT'], configuracion['MAX_IDLE']
+            )
+        return pool
+
+
+def estadisticas_pools():
+    """{(alias, evento): total} de los pools del proceso"""
+    with _lock_pools:
+        pools = list(_pools.items())
+    return {
+        (alias, evento): total
+        for alias, pool in pools for evento, total in pool.resumen().items()
+    }
+
+
+class MixinPool:
+    """Para un DatabaseWrapper: tomar la conexión del pool y devolverla al cerrar.
+
+    Con CONN_MAX_AGE = 0 Django cierra la conexión al terminar cada petición,
+    lo que aquí la devuelve al pool en lugar de cortarla. Una conexión con
+    errores, o cerrada dentro de una transacción, se descarta.
+    """
+
+    @property
+    def pool(self):
+        return obtener_pool(self.alias, self.settings_dict.get('POOL'))
+
+    def get_new_connection(self, conn_params):
+        return self.pool.obtener(
+            lambda: super(MixinPool, self).get_new_connection(conn_params),
+            verificar=self.settings_dict['CONN_HEALTH_CHECKS'],
+        )
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.errors_occurred or self.in_atomic_block:
+            self.pool.descartar(self.connection)
+        else:
+            self.pool.devolver(self.connection)
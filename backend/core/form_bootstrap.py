@@ -0,0 +1,82 @@
+# Datos de arranque del formulario de citas, cacheados por versión
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .models import Pet, Service, Professional
+
+CLAVE_VERSION = 'form_bootstrap:version'
+
+
+def obtener_configuracion():
+    return {'CACHE': 'default', 'TTL': 300, 'LOCAL_TTL': 5, **getattr(settings, 'FORM_BOOTSTRAP_CACHE', {})}
+
+
+def obtener_cache():
+    return caches[obtener_configuracion()['CACHE']]
+
+
+def duracion_cache():
+    """Con una caché por proceso, invalidar() no llega a los otros workers: TTL de unos segundos"""
+    configuracion = obtener_configuracion()
+    if isinstance(obtener_cache(), (LocMemCache, DummyCache)):
+        return min(configuracion['TTL'], configuracion['LOCAL_TTL'])
+    return configuracion['TTL']
+
+
+def obtener_version():
+    """Versión vigente de los datos; se crea una nueva tras cada invalidación o al vencer el TTL"""
+    cache = obtener_cache()
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        # add() evita que dos peticiones simultáneas generen versiones distintas
+        nueva = format(time.time_ns(), 'x')
+        cache.add(CLAVE_VERSION, nueva, timeout=duracion_cache())
+        version = cache.get(CLAVE_VERSION) or nueva
+    return version
+
+
+def invalidar():
+    """Descartar la versión vigente; la siguiente petición reconstruye los datos"""
+    obtener_cache().delete(CLAVE_VERSION)
+
+
+def construir_datos():
+    """Proyecciones compactas de mascotas, servicios y profesionales activos (tres consultas)"""
+    mascotas = Pet.objects.filter(is_active=True).order_by('name').values_list(
+        'id', 'name', 'owner__short_name'
+    )
+    servicios = Service.objects.filter(is_active=True).order_by('service_type', 'name').values_list(
+        'id', 'name', 'duration_minutes', 'requires_medication'
+    )
+    profesionales = Professional.objects.filter(is_active=True).order_by('full_name').values_list(
+        'id', 'full_name', 'specialty'
+    )
+    return {
+        'pets': [
+            {'id': id_, 'label': f'{nombre} - {nombre_corto}'}
+            for id_, nombre, nombre_corto in mascotas
+        ],
+        'services': [
+            {'id': id_, 'label': nombre, 'duration_minutes': duracion, 'requires_medication': medicado}
+            for id_, nombre, duracion, medicado in servicios
+        ],
+        'professionals': [
+            {'id': id_, 'label': f'{nombre} - {especialidad}'}
+            for id_, nombre, especialidad in profesionales
+        ],
+    }
+
+
+def obtener_datos(version):
+    """Datos de la versión indicada, desde la caché o construidos y guardados"""
+    cache = obtener_cache()
+    clave = f'form_bootstrap:datos:{version}'
+    datos = cache.get(clave)
+    if datos is None:
+        datos = construir_datos()
+        cache.set(clave, datos, timeout=duracion_cache())
+    return datos
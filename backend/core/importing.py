@@ -0,0 +1,270 @@
+# Importación masiva de dueños y mascotas desde CSV, por bloques
+import codecs
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from rest_framework import serializers
+
+from . import form_bootstrap
+from .models import Owner, Pet
+from .models.owner import obtener_nombre_corto
+from .serializers import MixinValidacion, SerializadorMascota
+
+# Una fila por mascota con los datos de su dueño; sin pet_name la fila solo registra al dueño
+COLUMNAS_PROPIETARIO = (
+    'identification_number', 'identification_type', 'full_name', 'address', 'phone', 'email',
+)
+COLUMNAS_MASCOTA = (
+    'pet_name', 'breed', 'birth_date', 'gender', 'color', 'weight',
+    'allergies', 'medical_conditions', 'additional_notes',
+)
+COLUMNAS_REQUERIDAS = ('identification_number', 'full_name', 'address', 'phone')
+
+MAX_ERRORES_REPORTADOS = 1000
+CODIFICACION = 'utf-8-sig'
+
+
+def verificar_codificacion(archivo, tamano_lectura=1 << 20):
+    """Decodificar el archivo binario completo antes de importar y volver al inicio.
+
+    Cada bloque se confirma en su propia transacción: un byte inválido al
+    final del archivo no debe aparecer con los bloques anteriores ya guardados.
+    """
+    decodificador = codecs.getincrementaldecoder(CODIFICACION)()
+    linea = 1
+    archivo.seek(0)
+    for bloque in iter(lambda: archivo.read(tamano_lectura), b''):
+        try:
+            decodificador.decode(bloque)
+        except UnicodeDecodeError as error:
+            linea += bloque.count(b'\n', 0, error.start)
+            raise ValidationError(f'El archivo debe estar en UTF-8 (byte inválido en la línea {linea})')
+        linea += bloque.count(b'\n')
+    try:
+        decodificador.decode(b'', final=True)
+    except UnicodeDecodeError:
+        raise ValidationError('El archivo debe estar en UTF-8 (termina con un carácter incompleto)')
+    archivo.seek(0)
+
+
+def mensajes(error):
+    """Errores de Django o DRF como {campo: [mensajes]}"""
+    if isinstance(error, ValidationError):
+        return error.message_dict if hasattr(error, 'error_dict') else {'non_field_errors': error.messages}
+    detalle = error.detail
+    return detalle if isinstance(detalle, dict) else {'non_field_errors': list(detalle)}
+
+
+class ResultadoImportacion:
+    def __init__(self):
+        self.filas = 0
+        self.propietarios_creados = 0
+        self.propietarios_existentes = 0
+        self.mascotas_creadas = 0
+        self.mascotas_existentes = 0
+        self.errores = []
+        self.total_errores = 0
+
+    def agregar_error(self, fila, errores):
+        self.total_errores += 1
+        if len(self.errores) < MAX_ERRORES_REPORTADOS:
+            self.errores.append({'row': fila, 'errors': errores})
+
+    def resumen(self):
+        return {
+            'rows': self.filas,
+            'owners_created': self.propietarios_creados,
+            'owners_existing': self.propietarios_existentes,
+            'pets_created': self.mascotas_creadas,
+            'pets_existing': self.mascotas_existentes,
+            'error_count': self.total_errores,
+            'errors': self.errores,
+        }
+
+
+class ImportadorPropietariosMascotas(MixinValidacion):
+    """Valida e inserta dueños y mascotas desde un CSV, un bloque de filas por transacción.
+
+    Cada fila pasa por los validadores de los modelos (clean_fields/clean) y
+    por las mismas reglas que los serializers; los dueños se buscan con un
+    solo IN por bloque y se insertan con bulk_create, sin save() por fila.
+    Las mascotas que el dueño ya tiene (mismo nombre) no se duplican.
+    """
+
+    def __init__(self, tamano_bloque=1000, dry_run=False):
+        self.tamano_bloque = tamano_bloque
+        self.dry_run = dry_run
+        self.resultado = ResultadoImportacion()
+        self.reglas_mascota = SerializadorMascota()
+        # Dueños ya resueltos en bloques anteriores, por número de identificación
+        self.propietarios = {}
+        # (identificación del dueño, nombre) de mascotas ya registradas, para reimportar sin duplicar
+        self.mascotas = set()
+
+    def importar(self, archivo):
+        """Procesar un archivo de texto CSV (se lee en streaming)"""
+        lector = csv.DictReader(archivo)
+        try:
+            columnas = lector.fieldnames or []
+        except csv.Error as error:
+            raise ValidationError(f'Encabezado CSV mal formado: {error}')
+        faltantes = [columna for columna in COLUMNAS_REQUERIDAS if columna not in columnas]
+        if faltantes:
+            raise ValidationError(f'Faltan columnas requeridas: {", ".join(faltantes)}')
+
+        # La fila 1 es el encabezado
+        bloque = []
+        error_csv = None
+        try:
+            for numero_fila in enumerate(lector, start=2):
+                bloque.append(numero_fila)
+                if len(bloque) == self.tamano_bloque:
+                    self.procesar_bloque(bloque)
+                    bloque = []
+        except csv.Error as error:
+            error_csv = error
+        if bloque:
+            self.procesar_bloque(bloque)
+        if error_csv:
+            # Las filas anteriores ya se importaron: se informa la fila ilegible y se detiene
+            self.resultado.agregar_error(
+                self.resultado.filas + 2, {'non_field_errors': [f'CSV mal formado: {error_csv}']}
+            )
+
+        if not self.dry_run and (self.resultado.propietarios_creados or self.resultado.mascotas_creadas):
+            # bulk_create no emite post_save: invalidar los datos del formulario de citas
+            form_bootstrap.invalidar()
+        return self.resultado
+
+    def procesar_bloque(self, bloque):
+        validas = []
+        for numero, fila in bloque:
+            self.resultado.filas += 1
+            try:
+                validas.append((numero, *self.validar_fila(fila)))
+            except (ValidationError, serializers.ValidationError) as error:
+                self.resultado.agregar_error(numero, mensajes(error))
+
+        # Un solo IN por bloque para los dueños no vistos en bloques anteriores
+        nuevos = {propietario.identification_number for _, propietario, _ in validas} - self.propietarios.keys()
+        if nuevos:
+            existentes = list(Owner.objects.filter(identification_number__in=nuevos).only(
+                'id', 'identification_number', 'is_active'
+            ))
+            for propietario in existentes:
+                self.propietarios[propietario.identification_number] = propietario
+                self.resultado.propietarios_existentes += 1
+            if existentes:
+                identificaciones = {propietario.pk: propietario.identification_number for propietario in existentes}
+                self.mascotas.update(
+                    (identificaciones[propietario_id], nombre)
+                    for propietario_id, nombre in Pet.objects.filter(owner__in=existentes).values_list('owner_id', 'name')
+                )
+
+        por_crear = {}
+        mascotas = []
+        for numero, propietario, mascota in validas:
+            identificacion = propietario.identification_number
+            propietario = self.propietarios.get(identificacion) or por_crear.setdefault(identificacion, propietario)
+            if mascota is None:
+                continue
+            if propietario.pk and not propietario.is_active:
+                self.resultado.agregar_error(numero, {'owner': ['El dueño seleccionado no está activo']})
+                continue
+            clave = (identificacion, mascota.name)
+            if clave in self.mascotas:
+                self.resultado.mascotas_existentes += 1
+                continue
+            self.mascotas.add(clave)
+            mascotas.append((propietario, mascota))
+
+        if self.dry_run:
+            self.propietarios.update(por_crear)
+            self.resultado.propietarios_creados += len(por_crear)
+            self.resultado.mascotas_creadas += len(mascotas)
+            return
+
+        with transaction.atomic():
+            creados = Owner.objects.bulk_create(por_crear.values())
+            if any(propietario.pk is None for propietario in creados):
+                # Backends que no devuelven ids en bulk_create
+                ids = dict(Owner.objects.filter(identification_number__in=por_crear).values_list(
+                    'identification_number', 'id'
+                ))
+                for propietario in creados:
+                    propietario.pk = ids[propietario.identification_number]
+            for propietario, mascota in mascotas:
+                mascota.owner_id = propietario.pk
+            Pet.objects.bulk_create([mascota for _, mascota in mascotas])
+
+        self.propietarios.update(por_crear)
+        self.resultado.propietarios_creados += len(por_crear)
+        self.resultado.mascotas_creadas += len(mascotas)
+
+    def validar_fila(self, fila):
+        """(Owner, Pet o None) sin guardar; ValidationError con los errores por campo"""
+        valores = {columna: (fila.get(columna) or '').strip() for columna in COLUMNAS_PROPIETARIO + COLUMNAS_MASCOTA}
+        errores = {}
+
+        propietario = Owner(
+            identification_number=valores['identification_number'].upper(),
+            identification_type=valores['identification_type'] or 'cedula',
+            full_name=valores['full_name'],
+            address=valores['address'],
+            phone=valores['phone'],
+            email=valores['email'] or None,
+        )
+        propietario.short_name = obtener_nombre_corto(propietario.full_name)
+        self.recolectar(errores, propietario.clean_fields, exclude=['short_name'])
+        for campo, regla in (
+            ('identification_number', self.validar_numero_identificacion),
+            ('phone', self.validar_telefono),
+        ):
+            if campo not in errores:
+                self.recolectar(errores, regla, getattr(propietario, campo), campo=campo)
+
+        mascota = None
+        if valores['pet_name']:
+            mascota = Pet(
+                name=valores['pet_name'],
+                breed=valores['breed'],
+                gender=valores['gender'].upper(),
+                color=valores['color'],
+                allergies=valores['allergies'],
+                medical_conditions=valores['medical_conditions'],
+                additional_notes=valores['additional_notes'],
+            )
+            try:
+                mascota.birth_date = datetime.strptime(valores['birth_date'], '%Y-%m-%d').date()
+            except ValueError:
+                errores['birth_date'] = ['Formato de fecha inválido. Use YYYY-MM-DD']
+            try:
+                mascota.weight = Decimal(valores['weight'].replace(',', '.'))
+            except InvalidOperation:
+                errores['weight'] = ['Peso inválido']
+            self.recolectar(errores, mascota.clean_fields, exclude=['owner', *errores])
+            self.recolectar(errores, mascota.clean)
+            for campo, regla in (
+                ('birth_date', self.reglas_mascota.validate_birth_date),
+                ('weight', self.reglas_mascota.validate_weight),
+            ):
+                if campo not in errores:
+                    self.recolectar(errores, regla, getattr(mascota, campo), campo=campo)
+
+        if errores:
+            raise ValidationError(errores)
+        return propietario, mascota
+
+    @staticmethod
+    def recolectar(errores, validador, *args, campo=None, **kwargs):
+        try:
+            validador(*args, **kwargs)
+        except (ValidationError, serializers.ValidationError) as error:
+            detalle = mensajes(error)
+            if campo:
+                detalle = {campo: [mensaje for lista in detalle.values() for mensaje in lista]}
+            for nombre, lista in detalle.items():
+                errores.setdefault(nombre, []).extend(str(mensaje) for mensaje in lista)
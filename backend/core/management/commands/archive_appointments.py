@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.archive import obtener_configuracion, HORIZONTE_MINIMO
+from core.models import Appointment, AppointmentArchive
+
+
+class Command(BaseCommand):
+    help = 'Mueve las citas más antiguas que el horizonte configurado a core_appointment_archive'
+
+    def add_arguments(self, parser):
+        configuracion = obtener_configuracion()
+        parser.add_argument(
+            '--days', type=int, default=configuracion['HORIZON_DAYS'],
+            help='Archivar citas con más de N días (no menor que APPOINTMENT_ARCHIVE["HORIZON_DAYS"])'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=configuracion['BATCH_SIZE'],
+            help='Citas movidas por transacción'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar las citas a archivar')
+
+    def handle(self, *args, **options):
+        horizonte = obtener_configuracion()['HORIZON_DAYS']
+        # Las lecturas deciden si consultar el archivo según HORIZON_DAYS: con un
+        # horizonte menor quedarían citas archivadas que nadie vería
+        if options['days'] < max(horizonte, HORIZONTE_MINIMO):
+            raise CommandError(
+                f'--days debe ser al menos {max(horizonte, HORIZONTE_MINIMO)} '
+                '(ajuste APPOINTMENT_ARCHIVE["HORIZON_DAYS"] para archivar citas más recientes)'
+            )
+
+        corte = timezone.now() - timedelta(days=options['days'])
+        antiguas = Appointment.objects.filter(appointment_date__lt=corte)
+        if options['dry_run']:
+            self.stdout.write(f'{antiguas.count()} citas anteriores a {corte:%Y-%m-%d} se archivarían')
+            return
+
+        total = 0
+        while True:
+            ids = list(antiguas.order_by('pk').values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += self.archivar_lote(ids)
+            self.stdout.write(f'  {total} citas archivadas...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Se archivaron {total} citas anteriores a {corte:%Y-%m-%d}'
+        ))
+
+    @transaction.atomic
+    def archivar_lote(self, ids):
+        """Copiar y borrar un lote en la misma transacción (la fila de lectura se borra en cascada)"""
+        filas = Appointment.objects.filter(pk__in=ids).values(*AppointmentArchive.CAMPOS_COPIADOS)
+        AppointmentArchive.objects.bulk_create(
+            [AppointmentArchive(**fila) for fila in filas]
+        )
+        Appointment.objects.filter(pk__in=ids).delete()
+        return len(ids)
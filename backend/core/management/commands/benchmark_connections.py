@@ -0,0 +1,102 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db.pool import MixinPool, obtener_pool
+
+
+class Command(BaseCommand):
+    help = 'Mide el costo de abrir conexiones: sin persistencia, persistentes (CONN_MAX_AGE) y con pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Alias de DATABASES a medir')
+        parser.add_argument('--iterations', type=int, default=200, help='Peticiones simuladas por modo')
+        parser.add_argument('--threads', type=int, default=1, help='Hilos concurrentes (cada uno con su conexión)')
+        parser.add_argument('--pool-size', type=int, default=None, help='MAX_SIZE del pool (por defecto, POOL de DATABASES)')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if alias not in connections.settings:
+            raise CommandError(f'No existe la base de datos {alias!r}')
+        if options['iterations'] < 1 or options['threads'] < 1:
+            raise CommandError('--iterations y --threads deben ser al menos 1')
+
+        clase = type(connections[alias])
+        # Con un ENGINE que ya usa el pool, medir también el backend sin él
+        base = clase.__bases__[-1] if issubclass(clase, MixinPool) else clase
+        configuracion = connections.settings[alias]
+        if configuracion['NAME'] == ':memory:' or 'mode=memory' in str(configuracion['NAME']):
+            raise CommandError('Una base en memoria no abre conexiones reales: use una base en archivo')
+
+        pool = {**configuracion.get('POOL', {})}
+        if options['pool_size']:
+            pool['MAX_SIZE'] = options['pool_size']
+        clase_pool = type('DatabaseWrapperPool', (MixinPool, base), {})
+
+        self.stdout.write(
+            f'Backend {base.__module__}, {options["iterations"]} peticiones, {options["threads"]} hilos'
+        )
+        alias_pool = f'{alias}-benchmark'
+        modos = [
+            ('sin persistencia', lambda: base({**configuracion, 'CONN_MAX_AGE': 0}, alias), False),
+            ('persistente', lambda: base(
+                {**configuracion, 'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True}, alias
+            ), True),
+            ('pool', lambda: clase_pool({**configuracion, 'CONN_MAX_AGE': 0, 'POOL': pool}, alias_pool), False),
+        ]
+        for nombre, crear, persistente in modos:
+            total, muestras, abiertas = self.medir(crear, persistente, options['iterations'], options['threads'])
+            if nombre == 'pool':
+                # Cada petición usa un wrapper nuevo: las conexiones reales las abre el pool
+                pool_benchmark = obtener_pool(alias_pool, pool)
+                abiertas = pool_benchmark.resumen()['created']
+                pool_benchmark.cerrar_libres()
+            self.stdout.write(
+                f'- {nombre}: {total:.1f} ms en total, {statistics.mean(muestras):.2f} ms por petición '
+                f'(p95 {percentil_95(muestras):.2f} ms), {abiertas} conexiones abiertas'
+            )
+
+    def medir(self, crear, persistente, iteraciones, hilos):
+        """Cada petición: conectar si hace falta, SELECT 1 y el cierre de fin de petición de Django"""
+        muestras = []
+        abiertas = []
+        lock = threading.Lock()
+        por_hilo = [iteraciones // hilos + (1 if indice < iteraciones % hilos else 0) for indice in range(hilos)]
+
+        def trabajar(cantidad):
+            propias = []
+            nuevas = 0
+            wrapper = crear() if persistente else None
+            for _ in range(cantidad):
+                conexion = wrapper or crear()
+                inicio = time.perf_counter()
+                nuevas += conexion.connection is None
+                with conexion.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                if persistente:
+                    conexion.close_if_unusable_or_obsolete()
+                else:
+                    conexion.close()
+                propias.append((time.perf_counter() - inicio) * 1000)
+            if wrapper is not None:
+                wrapper.close()
+            with lock:
+                muestras.extend(propias)
+                abiertas.append(nuevas)
+
+        trabajadores = [threading.Thread(target=trabajar, args=(cantidad,)) for cantidad in por_hilo if cantidad]
+        inicio = time.perf_counter()
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+        return (time.perf_counter() - inicio) * 1000, muestras, sum(abiertas)
+
+
+def percentil_95(muestras):
+    ordenadas = sorted(muestras)
+    return ordenadas[min(int(len(ordenadas) * 0.95), len(ordenadas) - 1)]
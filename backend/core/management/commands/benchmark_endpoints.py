@@ -0,0 +1,255 @@
+import json
+import statistics
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from authentication.models import CustomUser
+from core.models import Owner, Pet, Service, Appointment, Professional
+
+PRESUPUESTOS_POR_DEFECTO = Path(__file__).resolve().parents[2] / 'benchmark_budgets.json'
+
+# (nombre, ruta) de cada acción de lectura; los marcadores se completan con datos sembrados
+ENDPOINTS = [
+    ('owners-list', '/api/owners/'),
+    ('owners-retrieve', '/api/owners/{owner}/'),
+    ('owners-pets', '/api/owners/{owner}/pets/'),
+    ('owners-search_by_identification', '/api/owners/search_by_identification/?identification={identificacion}'),
+    ('pets-list', '/api/pets/'),
+    ('pets-retrieve', '/api/pets/{pet}/'),
+    ('pets-by_owner_name', '/api/pets/by_owner_name/?owner_name={nombre_dueno}'),
+    ('pets-by_breed', '/api/pets/by_breed/?breed=Mestizo'),
+    ('pets-medical_history', '/api/pets/{pet}/medical_history/'),
+    ('services-list', '/api/services/'),
+    ('services-retrieve', '/api/services/{service}/'),
+    ('services-by_type', '/api/services/by_type/?type=baño_normal'),
+    ('professionals-list', '/api/professionals/'),
+    ('professionals-retrieve', '/api/professionals/{professional}/'),
+    ('appointments-list', '/api/appointments/'),
+    ('appointments-retrieve', '/api/appointments/{appointment}/'),
+    ('appointments-by_date', '/api/appointments/by_date/?date={fecha}'),
+    ('appointments-by_pet', '/api/appointments/by_pet/?pet_id={pet}'),
+    ('appointments-calendar_week', '/api/appointments/calendar_week/?date={fecha}'),
+    ('appointments-calendar_range', '/api/appointments/calendar_range/?start={fecha}&end={fin_mes}'),
+    ('appointments-suggest_slots', '/api/appointments/suggest_slots/?service={service}&start={fecha}&count=10'),
+    ('appointments-form_bootstrap', '/api/appointments/form_bootstrap/'),
+    ('reports-appointments_summary', '/api/reports/appointments_summary/'),
+    ('reports-services_report', '/api/reports/services_report/'),
+    ('reports-appointments_summary-memory',
+     '/api/reports/appointments_summary/?start_date={hace_un_anio}&end_date={fecha}&engine=memory'),
+    ('reports-services_report-memory',
+     '/api/reports/services_report/?start_date={hace_un_anio}&end_date={fecha}&engine=memory'),
+    ('reports-clients_report', '/api/reports/clients_report/'),
+    ('reports-durations', '/api/reports/durations/'),
+    ('reports-occupancy', '/api/reports/occupancy/?start={fecha}&end={fin_mes}'),
+    ('reports-dashboard_metrics', '/api/reports/dashboard_metrics/'),
+    ('reports-export_appointments', '/api/reports/export_appointments/'),
+]
+
+# Métricas comparables contra presupuesto
+METRICAS = ('queries', 'db_ms', 'serialization_ms', 'total_ms', 'bytes')
+
+
+class Medidor:
+    """Cuenta consultas y tiempo de base de datos, y el tiempo de serialización sin consultas"""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.tiempo_serializacion = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo_db += time.perf_counter() - inicio
+            self.consultas += 1
+
+    def cronometrar(self, funcion):
+        """Envolver una función para sumar su duración, descontando las consultas que dispare"""
+        medidor = self
+
+        def envoltura(*args, **kwargs):
+            profundidad = getattr(medidor.local, 'profundidad', 0)
+            if profundidad:
+                return funcion(*args, **kwargs)
+            medidor.local.profundidad = 1
+            inicio, db_inicial = time.perf_counter(), medidor.tiempo_db
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                medidor.local.profundidad = 0
+                transcurrido = time.perf_counter() - inicio
+                medidor.tiempo_serializacion += transcurrido - (medidor.tiempo_db - db_inicial)
+
+        return envoltura
+
+
+class Command(BaseCommand):
+    help = 'Mide consultas, tiempo de DB, serialización y bytes por acción de la API y valida presupuestos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owners', type=int, default=200, help='Propietarios a sembrar (0 para usar los datos actuales)')
+        parser.add_argument('--years', type=float, default=1, help='Años de historial de citas a sembrar')
+        parser.add_argument('--per-day', type=float, default=15, help='Citas promedio por día laborable')
+        parser.add_argument('--repeat', type=int, default=5, help='Mediciones por endpoint (se reporta la mediana)')
+        parser.add_argument(
+            '--budgets', default=str(PRESUPUESTOS_POR_DEFECTO), help='Archivo JSON de presupuestos'
+        )
+        parser.add_argument('--no-budgets', action='store_true', help='Solo medir, sin validar presupuestos')
+        parser.add_argument('--output', help='Archivo donde guardar la línea base en JSON')
+        parser.add_argument('--only', nargs='*', default=[], help='Medir solo estos endpoints')
+
+    def handle(self, *args, **options):
+        endpoints = [e for e in ENDPOINTS if not options['only'] or e[0] in options['only']]
+        if not endpoints:
+            raise CommandError(f'Ningún endpoint coincide con {options["only"]}')
+
+        # Las secciones de reportes se ejecutan en el hilo actual: los hilos del
+        # pool no verían los datos sembrados en la transacción ni se contarían sus consultas
+        ajustes = override_settings(
+            REPORT_EXECUTOR={'MAX_WORKERS': 1},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        )
+        with ajustes, transaction.atomic():
+            if options['owners']:
+                self.sembrar(options)
+            cliente = APIClient()
+            cliente.force_authenticate(
+                CustomUser.objects.create_user(username=f'bench_endpoints_{time.time_ns()}')
+            )
+            valores = self.valores_ruta()
+            resultados = {
+                nombre: self.medir(cliente, ruta.format(**valores), options['repeat'])
+                for nombre, ruta in endpoints
+            }
+            # Los datos sintéticos nunca quedan en la base
+            transaction.set_rollback(True)
+
+        self.imprimir(resultados)
+        if options['output']:
+            Path(options['output']).write_text(
+                json.dumps({'endpoints': resultados}, indent=2), encoding='utf-8'
+            )
+            self.stdout.write(f'Línea base guardada en {options["output"]}')
+
+        if not options['no_budgets']:
+            self.validar(resultados, options['budgets'])
+
+    def sembrar(self, options):
+        salida = StringIO()
+        if not Service.objects.filter(is_active=True).exists():
+            call_command('cleanup_services', stdout=salida)
+        call_command(
+            'seed_benchmark', owners=options['owners'], years=options['years'],
+            per_day=options['per_day'], future_days=14, stdout=salida
+        )
+        self.stdout.write(
+            f'Datos sembrados: {Owner.objects.count()} propietarios, {Pet.objects.count()} mascotas, '
+            f'{Appointment.objects.count()} citas'
+        )
+
+    def valores_ruta(self):
+        propietario = Owner.objects.order_by('pk').first()
+        if propietario is None or not Appointment.objects.exists():
+            raise CommandError('No hay datos para medir: use --owners para sembrar')
+        return {
+            'owner': propietario.pk,
+            'identificacion': propietario.identification_number,
+            'nombre_dueno': propietario.full_name.split()[0],
+            'pet': Pet.objects.order_by('pk').values_list('pk', flat=True).first(),
+            'service': Service.objects.order_by('pk').values_list('pk', flat=True).first(),
+            'professional': Professional.objects.order_by('pk').values_list('pk', flat=True).first() or 0,
+            'appointment': Appointment.objects.order_by('pk').values_list('pk', flat=True).first(),
+            'fecha': timezone.localdate().isoformat(),
+            'fin_mes': (timezone.localdate() + timedelta(days=30)).isoformat(),
+            'hace_un_anio': (timezone.localdate() - timedelta(days=365)).isoformat(),
+        }
+
+    def medir(self, cliente, ruta, repeticiones):
+        medidor = Medidor()
+        muestras = []
+        parches = [
+            (serializers.BaseSerializer, 'data'),
+            (JSONRenderer, 'render'),
+        ]
+        originales = [(clase, nombre, clase.__dict__[nombre]) for clase, nombre in parches]
+        try:
+            serializers.BaseSerializer.data = property(medidor.cronometrar(originales[0][2].fget))
+            JSONRenderer.render = medidor.cronometrar(originales[1][2])
+            with connection.execute_wrapper(medidor):
+                # La primera petición calienta cachés de proceso y no se cuenta
+                for indice in range(repeticiones + 1):
+                    medidor.reiniciar()
+                    inicio = time.perf_counter()
+                    respuesta = cliente.get(ruta, HTTP_ACCEPT='application/json')
+                    total = time.perf_counter() - inicio
+                    if respuesta.status_code != 200:
+                        raise CommandError(f'{ruta} respondió {respuesta.status_code}')
+                    if indice:
+                        muestras.append({
+                            'queries': medidor.consultas,
+                            'db_ms': medidor.tiempo_db * 1000,
+                            'serialization_ms': medidor.tiempo_serializacion * 1000,
+                            'total_ms': total * 1000,
+                            'bytes': len(respuesta.content),
+                        })
+        finally:
+            for clase, nombre, original in originales:
+                setattr(clase, nombre, original)
+
+        return {
+            'path': ruta,
+            # Las consultas deben ser estables: se toma el peor caso
+            'queries': max(m['queries'] for m in muestras),
+            **{
+                metrica: round(statistics.median(m[metrica] for m in muestras), 2)
+                for metrica in ('db_ms', 'serialization_ms', 'total_ms')
+            },
+            'bytes': muestras[-1]['bytes'],
+        }
+
+    def imprimir(self, resultados):
+        self.stdout.write(
+            f'{"endpoint":<36}{"queries":>8}{"db_ms":>9}{"ser_ms":>9}{"total_ms":>10}{"bytes":>10}'
+        )
+        for nombre, datos in resultados.items():
+            self.stdout.write(
+                f'{nombre:<36}{datos["queries"]:>8}{datos["db_ms"]:>9.1f}'
+                f'{datos["serialization_ms"]:>9.1f}{datos["total_ms"]:>10.1f}{datos["bytes"]:>10}'
+            )
+
+    def validar(self, resultados, ruta_presupuestos):
+        try:
+            presupuestos = json.loads(Path(ruta_presupuestos).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            raise CommandError(f'No existe el archivo de presupuestos {ruta_presupuestos}')
+
+        por_defecto = presupuestos.get('default', {})
+        excedidos = []
+        for nombre, datos in resultados.items():
+            limites = {**por_defecto, **presupuestos.get('endpoints', {}).get(nombre, {})}
+            for metrica in METRICAS:
+                if metrica in limites and datos[metrica] > limites[metrica]:
+                    excedidos.append(f'{nombre}: {metrica}={datos[metrica]} > {limites[metrica]}')
+
+        if excedidos:
+            raise CommandError('Presupuestos excedidos:\n  ' + '\n  '.join(excedidos))
+        self.stdout.write(self.style.SUCCESS(f'{len(resultados)} endpoints dentro del presupuesto'))
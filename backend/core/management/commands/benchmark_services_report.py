@@ -0,0 +1,114 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Owner, Pet, Service, Appointment
+from core.serializers import ServiceSerializer, ServiceStatsSerializer
+from core.views.reports import estadisticas_servicios
+
+
+class Command(BaseCommand):
+    help = 'Compara el services_report anterior con la agregación agrupada actual'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Citas sintéticas a generar para la medición (se revierten al terminar)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tamaño de lote para bulk_create'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.sembrar(options['seed'], options['batch_size'])
+            total = Appointment.objects.count()
+            self.stdout.write(f'Citas en la base: {total}')
+
+            self.medir('anterior', self.reporte_anterior)
+            self.medir('agrupado', self.reporte_agrupado)
+
+            # Los datos sintéticos nunca quedan en la base
+            transaction.set_rollback(True)
+
+    def medir(self, nombre, funcion):
+        # El registro de consultas es acotado: vaciarlo tras la siembra masiva
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            funcion()
+            duracion = (time.perf_counter() - inicio) * 1000
+        self.stdout.write(f'- {nombre}: {duracion:.1f} ms, {len(consultas)} consultas')
+
+    def reporte_anterior(self):
+        services_stats = Service.objects.annotate(
+            appointments_count=Count('appointment'),
+            total_revenue=Sum('appointment__service__price'),
+            avg_appointments_per_month=Avg('appointment__id')
+        ).order_by('-appointments_count')
+        by_type = Service.objects.values('service_type').annotate(
+            count=Count('appointment'),
+            revenue=Sum('appointment__service__price')
+        ).order_by('-count')
+        return (
+            ServiceSerializer(services_stats, many=True).data,
+            list(by_type),
+            Service.objects.filter(is_active=True).count(),
+        )
+
+    def reporte_agrupado(self):
+        servicios, by_type = estadisticas_servicios(Appointment.objects.all())
+        return ServiceStatsSerializer(servicios, many=True).data, by_type
+
+    def sembrar(self, cantidad, tamano_lote):
+        self.stdout.write(f'Generando {cantidad} citas sintéticas...')
+        aleatorio = random.Random(42)
+        sufijo = timezone.now().strftime('%H%M%S')
+
+        propietario = Owner.objects.create(
+            full_name='Benchmark Servicios', identification_number=f'BENCH-{sufijo}',
+            address='-', phone='0000000'
+        )
+        mascotas = Pet.objects.bulk_create([
+            Pet(name=f'Bench {i}', breed='Mestizo', birth_date=timezone.localdate() - timedelta(days=400),
+                gender='M', color='-', weight=10, owner=propietario)
+            for i in range(200)
+        ])
+        servicios = list(Service.objects.all()) or Service.objects.bulk_create([
+            Service(name=nombre, service_type=tipo, price=precio)
+            for nombre, tipo, precio in [
+                ('Baño Normal', 'baño_normal', 15), ('Baño Medicado', 'baño_medicado', 25),
+                ('Peluquería Canina', 'peluqueria', 30), ('Desparasitación', 'desparasitacion', 20),
+                ('Atención Canina General', 'atencion_general', 35),
+            ]
+        ])
+        estados = ['pendiente', 'confirmada', 'realizada', 'realizada', 'realizada', 'cancelada']
+        inicio = timezone.now() - timedelta(days=3 * 365)
+
+        lote = []
+        for i in range(cantidad):
+            servicio = aleatorio.choice(servicios)
+            lote.append(Appointment(
+                pet=aleatorio.choice(mascotas),
+                service=servicio,
+                price_charged=servicio.price,
+                appointment_date=inicio + timedelta(minutes=aleatorio.randrange(3 * 365 * 24 * 60)),
+                status=aleatorio.choice(estados),
+            ))
+            if len(lote) >= tamano_lote:
+                Appointment.objects.bulk_create(lote)
+                lote = []
+        if lote:
+            Appointment.objects.bulk_create(lote)
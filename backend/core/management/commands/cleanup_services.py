@@ -1,98 +1,206 @@
-from django.core.management.base import BaseCommand
-from core.models import Service
+import json
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q
+
+from core import analytics, form_bootstrap
+from core.models import Service, Appointment, AppointmentArchive, AppointmentView
+
+CATALOGO_POR_DEFECTO = Path(__file__).resolve().parents[2] / 'fixtures' / 'service_catalog.json'
+
+# Campos que el catálogo define para cada servicio (además del nombre)
+CAMPOS_CATALOGO = (
+    'service_type', 'description', 'price', 'duration_minutes',
+    'requires_medication', 'default_instructions', 'is_active',
+)
 
 
 class Command(BaseCommand):
-    help = 'Limpia y corrige los servicios duplicados o incorrectos'
+    help = 'Sincroniza los servicios con el catálogo declarativo (core/fixtures/service_catalog.json)'
 
-    def handle(self, *args, **options):
-        self.stdout.write('Iniciando limpieza de servicios...')
-        
-        # Eliminar servicios duplicados o incorrectos
-        services_to_delete = Service.objects.filter(
-            name__icontains='baño desparasitado'
+    def add_arguments(self, parser):
+        parser.add_argument('--catalog', default=str(CATALOGO_POR_DEFECTO), help='Archivo JSON del catálogo')
+        parser.add_argument('--dry-run', action='store_true', help='Mostrar los cambios sin aplicarlos')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000, help='Citas reasignadas por sentencia UPDATE'
         )
-        
-        if services_to_delete.exists():
-            count = services_to_delete.count()
-            self.stdout.write(f'Eliminando {count} servicios duplicados...')
-            services_to_delete.delete()
-            self.stdout.write(self.style.SUCCESS(f'Se eliminaron {count} servicios duplicados'))
-        else:
-            self.stdout.write('No se encontraron servicios duplicados')
-        
-        # Verificar que existan los servicios correctos según los requisitos
-        required_services = [
-            {
-                'name': 'Baño Normal',
-                'service_type': 'baño_normal',
-                'description': 'Servicio de baño regular para mascotas',
-                'price': '15.00',
-                'duration_minutes': 45,
-                'requires_medication': False,
-                'default_instructions': 'Baño con champú regular, secado y cepillado'
-            },
-            {
-                'name': 'Baño Medicado',
-                'service_type': 'baño_medicado',
-                'description': 'Baño con medicamentos específicos para problemas de piel',
-                'price': '25.00',
-                'duration_minutes': 60,
-                'requires_medication': True,
-                'default_instructions': 'Baño con champú medicado según prescripción veterinaria'
-            },
-            {
-                'name': 'Peluquería Canina',
-                'service_type': 'peluqueria',
-                'description': 'Servicio completo de peluquería y estética canina',
-                'price': '30.00',
-                'duration_minutes': 90,
-                'requires_medication': False,
-                'default_instructions': 'Corte de pelo, baño, secado y cepillado profesional'
-            },
-            {
-                'name': 'Desparasitación',
-                'service_type': 'desparasitacion',
-                'description': 'Aplicación de medicamentos antiparasitarios',
-                'price': '20.00',
-                'duration_minutes': 30,
-                'requires_medication': True,
-                'default_instructions': 'Aplicación de antiparasitario según peso y edad de la mascota'
-            },
-            {
-                'name': 'Atención Canina General',
-                'service_type': 'atencion_general',
-                'description': 'Consulta veterinaria general y revisión de salud',
-                'price': '35.00',
-                'duration_minutes': 45,
-                'requires_medication': False,
-                'default_instructions': 'Revisión general de salud, vacunación si es necesaria'
+
+    def handle(self, *args, **options):
+        catalogo = self.leer_catalogo(options['catalog'])
+        plan = self.calcular_diferencias(catalogo)
+        self.mostrar_plan(plan)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Modo dry-run: no se aplicaron cambios'))
+            return
+
+        with transaction.atomic():
+            self.aplicar(plan, options['batch_size'])
+            # bulk_create/bulk_update no emiten post_save: invalidar a mano
+            transaction.on_commit(form_bootstrap.invalidar)
+            if plan['obsoletos']:
+                # Los acumulados de reportes guardan el servicio de cada cita
+                transaction.on_commit(analytics.invalidar_todo)
+
+        self.stdout.write(self.style.SUCCESS('Catálogo de servicios sincronizado'))
+        self.mostrar_resumen()
+
+    def leer_catalogo(self, ruta):
+        try:
+            datos = json.loads(Path(ruta).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            raise CommandError(f'No existe el catálogo {ruta}')
+        except json.JSONDecodeError as error:
+            raise CommandError(f'Catálogo inválido: {error}')
+
+        tipos_validos = {tipo for tipo, _ in Service.SERVICE_TYPES}
+        catalogo = {}
+        for entrada in datos.get('services', []):
+            if entrada.get('service_type') not in tipos_validos:
+                raise CommandError(f'Tipo de servicio inválido en {entrada.get("name")!r}')
+            if entrada['name'] in catalogo:
+                raise CommandError(f'Servicio repetido en el catálogo: {entrada["name"]!r}')
+            catalogo[entrada['name']] = {
+                **entrada,
+                'price': Decimal(str(entrada['price'])),
+                'is_active': entrada.get('is_active', True),
             }
+        if not catalogo:
+            raise CommandError('El catálogo no define servicios')
+        return catalogo
+
+    def calcular_diferencias(self, catalogo):
+        """Comparar el catálogo con la base (una consulta de servicios, una de citas por servicio)"""
+        existentes = {}
+        obsoletos = {}   # servicio a eliminar -> nombre del servicio del catálogo que lo reemplaza
+        fuera_de_catalogo = []
+        reemplazos = [
+            (patron.lower(), nombre)
+            for nombre, entrada in catalogo.items() for patron in entrada.get('replaces', [])
         ]
-        
-        # Crear o actualizar servicios requeridos
-        for service_data in required_services:
-            service, created = Service.objects.get_or_create(
-                name=service_data['name'],
-                defaults=service_data
-            )
-            
-            if created:
-                self.stdout.write(f'Creado servicio: {service.name}')
+
+        for servicio in Service.objects.order_by('pk'):
+            if servicio.name in catalogo:
+                # El de menor id es el canónico; los repetidos se fusionan en él
+                if servicio.name in existentes:
+                    obsoletos[servicio] = servicio.name
+                else:
+                    existentes[servicio.name] = servicio
+                continue
+            reemplazo = next((nombre for patron, nombre in reemplazos if patron in servicio.name.lower()), None)
+            if reemplazo:
+                obsoletos[servicio] = reemplazo
             else:
-                # Actualizar si ya existe
-                for key, value in service_data.items():
-                    if key != 'name':
-                        setattr(service, key, value)
-                service.save()
-                self.stdout.write(f'Actualizado servicio: {service.name}')
-        
-        self.stdout.write(self.style.SUCCESS('Limpieza de servicios completada exitosamente'))
-        
-        # Mostrar resumen final
-        total_services = Service.objects.count()
-        self.stdout.write(f'Total de servicios en la base de datos: {total_services}')
-        
-        for service_type in ['baño_normal', 'baño_medicado', 'peluqueria', 'desparasitacion', 'atencion_general']:
-            count = Service.objects.filter(service_type=service_type).count()
-            self.stdout.write(f'- {service_type}: {count} servicios')
+                fuera_de_catalogo.append(servicio)
+
+        crear = []
+        actualizar = []
+        campos_actualizados = set()
+        for nombre, entrada in catalogo.items():
+            servicio = existentes.get(nombre)
+            if servicio is None:
+                crear.append(Service(name=nombre, **{campo: entrada[campo] for campo in CAMPOS_CATALOGO}))
+                continue
+            cambios = [campo for campo in CAMPOS_CATALOGO if getattr(servicio, campo) != entrada[campo]]
+            if cambios:
+                for campo in cambios:
+                    setattr(servicio, campo, entrada[campo])
+                actualizar.append((servicio, cambios))
+                campos_actualizados.update(cambios)
+
+        citas_por_servicio = dict(
+            Appointment.objects.filter(service__in=list(obsoletos)).order_by()
+            .values('service_id').annotate(total=Count('id')).values_list('service_id', 'total')
+        ) if obsoletos else {}
+
+        return {
+            'crear': crear,
+            'actualizar': actualizar,
+            'campos_actualizados': sorted(campos_actualizados),
+            'existentes': existentes,
+            'obsoletos': obsoletos,
+            'citas_por_servicio': citas_por_servicio,
+            'fuera_de_catalogo': fuera_de_catalogo,
+        }
+
+    def mostrar_plan(self, plan):
+        self.stdout.write(f'Crear: {len(plan["crear"])}')
+        for servicio in plan['crear']:
+            self.stdout.write(f'  + {servicio.name}')
+        self.stdout.write(f'Actualizar: {len(plan["actualizar"])}')
+        for servicio, cambios in plan['actualizar']:
+            self.stdout.write(f'  ~ {servicio.name}: {", ".join(cambios)}')
+        self.stdout.write(f'Reemplazar y eliminar: {len(plan["obsoletos"])}')
+        for servicio, destino in plan['obsoletos'].items():
+            citas = plan['citas_por_servicio'].get(servicio.pk, 0)
+            self.stdout.write(f'  - {servicio.name} (id {servicio.pk}) -> {destino}: {citas} citas a reasignar')
+        if plan['fuera_de_catalogo']:
+            self.stdout.write(f'Fuera del catálogo (sin cambios): {len(plan["fuera_de_catalogo"])}')
+            for servicio in plan['fuera_de_catalogo']:
+                self.stdout.write(f'  ? {servicio.name} (id {servicio.pk})')
+
+    def aplicar(self, plan, tamano_lote):
+        Service.objects.bulk_create(plan['crear'])
+        if any(servicio.pk is None for servicio in plan['crear']):
+            # Backends que no devuelven ids en bulk_create: recuperarlos por nombre
+            plan['crear'] = list(
+                Service.objects.filter(name__in=[s.name for s in plan['crear']]).order_by('-pk')
+            )
+        for servicio in plan['crear']:
+            plan['existentes'][servicio.name] = servicio
+
+        if plan['actualizar']:
+            Service.objects.bulk_update(
+                [servicio for servicio, _ in plan['actualizar']], plan['campos_actualizados']
+            )
+            # Propagar tipo y duración al modelo de lectura (lo haría post_save)
+            for servicio, cambios in plan['actualizar']:
+                if {'service_type', 'duration_minutes'} & set(cambios):
+                    self.sincronizar_lectura(servicio, Q(service_id=servicio.pk))
+
+        for obsoleto, destino in plan['obsoletos'].items():
+            reemplazo = plan['existentes'][destino]
+            reasignadas = self.reasignar_citas(obsoleto, reemplazo, tamano_lote)
+            # Sin citas asociadas, el borrado ya no arrastra nada en cascada
+            obsoleto.delete()
+            self.stdout.write(f'Reasignadas {reasignadas} citas de {obsoleto.name} a {reemplazo.name}')
+
+    def reasignar_citas(self, obsoleto, reemplazo, tamano_lote):
+        """Mover citas vigentes y archivadas al servicio de reemplazo por lotes de ids, sin borrarlas.
+
+        El precio cobrado se conserva: refleja lo que se cobró al agendar.
+        """
+        total = 0
+        for modelo in (Appointment, AppointmentArchive):
+            while True:
+                ids = list(
+                    modelo.objects.filter(service_id=obsoleto.pk).order_by('pk')
+                    .values_list('pk', flat=True)[:tamano_lote]
+                )
+                if not ids:
+                    break
+                modelo.objects.filter(pk__in=ids).update(service_id=reemplazo.pk)
+                if modelo is Appointment:
+                    self.sincronizar_lectura(reemplazo, Q(appointment_id__in=ids), service_id=reemplazo.pk)
+                total += len(ids)
+        return total
+
+    def sincronizar_lectura(self, servicio, filtro, **extra):
+        AppointmentView.objects.filter(filtro).update(
+            service_name=servicio.name,
+            service_type=servicio.service_type,
+            service_duration=servicio.duration_minutes,
+            **extra,
+        )
+
+    def mostrar_resumen(self):
+        """Resumen por tipo con una sola consulta agrupada"""
+        filas = Service.objects.order_by('service_type').values('service_type').annotate(
+            total=Count('id'), activos=Count('id', filter=Q(is_active=True))
+        )
+        self.stdout.write(f'Total de servicios en la base de datos: {sum(fila["total"] for fila in filas)}')
+        for fila in filas:
+            self.stdout.write(f'- {fila["service_type"]}: {fila["total"]} servicios ({fila["activos"]} activos)')
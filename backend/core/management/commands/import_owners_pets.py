@@ -0,0 +1,52 @@
+import json
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importing import (
+    CODIFICACION, COLUMNAS_MASCOTA, COLUMNAS_PROPIETARIO, ImportadorPropietariosMascotas, verificar_codificacion,
+)
+
+
+class Command(BaseCommand):
+    help = 'Importa dueños y mascotas desde un CSV (una fila por mascota con los datos de su dueño)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help=f'CSV con columnas {", ".join(COLUMNAS_PROPIETARIO + COLUMNAS_MASCOTA)}')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Filas por bloque (una transacción cada uno)')
+        parser.add_argument('--dry-run', action='store_true', help='Solo validar, sin insertar')
+        parser.add_argument('--errors-output', help='Archivo JSON donde guardar los errores por fila')
+
+    def handle(self, *args, **options):
+        importador = ImportadorPropietariosMascotas(
+            tamano_bloque=options['chunk_size'], dry_run=options['dry_run']
+        )
+        inicio = time.perf_counter()
+        try:
+            with open(options['archivo'], 'rb') as binario:
+                verificar_codificacion(binario)
+            with open(options['archivo'], encoding=CODIFICACION, newline='') as archivo:
+                resultado = importador.importar(archivo)
+        except FileNotFoundError:
+            raise CommandError(f'No existe el archivo {options["archivo"]}')
+        except ValidationError as error:
+            raise CommandError(error.messages[0])
+        transcurrido = time.perf_counter() - inicio
+
+        resumen = resultado.resumen()
+        for error in resumen['errors'][:20]:
+            detalle = '; '.join(f'{campo}: {" ".join(mensajes)}' for campo, mensajes in error['errors'].items())
+            self.stdout.write(self.style.WARNING(f'Fila {error["row"]}: {detalle}'))
+        if resumen['error_count'] > 20:
+            self.stdout.write(f'... y {resumen["error_count"] - 20} filas con errores más')
+        if options['errors_output']:
+            with open(options['errors_output'], 'w', encoding='utf-8') as salida:
+                json.dump(resumen['errors'], salida, indent=2, ensure_ascii=False)
+
+        prefijo = 'Validación (dry-run)' if options['dry_run'] else 'Importación'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefijo}: {resumen["rows"]} filas en {transcurrido:.1f} s, '
+            f'{resumen["owners_created"]} dueños nuevos, {resumen["owners_existing"]} existentes, '
+            f'{resumen["pets_created"]} mascotas, {resumen["error_count"]} filas con errores'
+        ))
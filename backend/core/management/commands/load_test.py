@@ -0,0 +1,173 @@
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Mezcla de lecturas del frontend: (nombre, ruta, peso relativo).
+# El calendario se consulta en cada navegación; el modal de citas pide sus
+# mascotas, servicios y profesionales a form_bootstrap; los reportes se abren con menos frecuencia.
+MEZCLA_PETICIONES = [
+    ('calendar_week', '/appointments/calendar_week/?date={fecha}', 30),
+    ('dashboard_metrics', '/reports/dashboard_metrics/', 10),
+    ('form_bootstrap', '/appointments/form_bootstrap/', 30),
+    ('owners', '/owners/', 8),
+    ('appointments_summary', '/reports/appointments_summary/', 5),
+    ('services_report', '/reports/services_report/', 4),
+    ('clients_report', '/reports/clients_report/', 4),
+]
+
+
+def percentil(valores_ordenados, porcentaje):
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not valores_ordenados:
+        return 0.0
+    rango = math.ceil(porcentaje / 100 * len(valores_ordenados))
+    return valores_ordenados[max(rango, 1) - 1]
+
+
+class Command(BaseCommand):
+    help = 'Reproduce la mezcla de peticiones del frontend contra un servidor y reporta p50/p95/p99 por endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', default='http://localhost:8000/api', help='URL base de la API'
+        )
+        parser.add_argument('--username', required=True, help='Usuario para obtener el token')
+        parser.add_argument('--password', required=True, help='Contraseña del usuario')
+        parser.add_argument('--duration', type=float, default=30, help='Duración de la prueba en segundos')
+        parser.add_argument('--concurrency', type=int, default=8, help='Clientes concurrentes')
+        parser.add_argument(
+            '--days-range', type=int, default=60,
+            help='Las semanas del calendario se eligen dentro de ±N días de hoy'
+        )
+        parser.add_argument('--timeout', type=float, default=30, help='Timeout por petición en segundos')
+        parser.add_argument('--output', help='Archivo JSON donde guardar los resultados')
+
+    def handle(self, *args, **options):
+        self.base_url = options['base_url'].rstrip('/')
+        self.timeout = options['timeout']
+        self.credenciales = {'username': options['username'], 'password': options['password']}
+        self.token = self.iniciar_sesion()
+        self.token_lock = threading.Lock()
+
+        self.stdout.write(
+            f'Ejecutando {options["concurrency"]} clientes durante {options["duration"]:.0f} s '
+            f'contra {self.base_url}...'
+        )
+        muestras = {nombre: [] for nombre, _, _ in MEZCLA_PETICIONES}
+        errores = dict.fromkeys(muestras, 0)
+        limite = time.monotonic() + options['duration']
+
+        inicio = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as ejecutor:
+            futuros = [
+                ejecutor.submit(self.cliente, semilla, limite, options['days_range'])
+                for semilla in range(options['concurrency'])
+            ]
+            # Cada cliente acumula sus propias mediciones; se combinan al final
+            for futuro in futuros:
+                tiempos_cliente, errores_cliente = futuro.result()
+                for nombre in muestras:
+                    muestras[nombre].extend(tiempos_cliente[nombre])
+                    errores[nombre] += errores_cliente[nombre]
+        transcurrido = time.monotonic() - inicio
+
+        resultados = self.resumir(muestras, errores, transcurrido)
+        self.imprimir(resultados)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, indent=2)
+            self.stdout.write(f'Resultados guardados en {options["output"]}')
+
+    def iniciar_sesion(self):
+        try:
+            respuesta = self.peticion('/auth/login/', datos=self.credenciales)
+        except HTTPError as error:
+            raise CommandError(f'No se pudo iniciar sesión: HTTP {error.code}')
+        except URLError as error:
+            raise CommandError(f'Servidor no disponible en {self.base_url}: {error.reason}')
+        return json.loads(respuesta)['access']
+
+    def renovar_token(self, vencido):
+        """Volver a iniciar sesión una sola vez aunque varios clientes reciban 401"""
+        with self.token_lock:
+            if self.token == vencido:
+                self.token = self.iniciar_sesion()
+            return self.token
+
+    def peticion(self, ruta, datos=None, token=None):
+        encabezados = {'Content-Type': 'application/json'}
+        if token:
+            encabezados['Authorization'] = f'Bearer {token}'
+        cuerpo = json.dumps(datos).encode() if datos is not None else None
+        with urlopen(Request(self.base_url + ruta, data=cuerpo, headers=encabezados), timeout=self.timeout) as respuesta:
+            return respuesta.read()
+
+    def cliente(self, semilla, limite, rango_dias):
+        aleatorio = random.Random(semilla)
+        muestras = {nombre: [] for nombre, _, _ in MEZCLA_PETICIONES}
+        errores = dict.fromkeys(muestras, 0)
+        pesos = [peso for _, _, peso in MEZCLA_PETICIONES]
+        hoy = date.today()
+
+        while time.monotonic() < limite:
+            nombre, ruta, _ = aleatorio.choices(MEZCLA_PETICIONES, weights=pesos)[0]
+            fecha = hoy + timedelta(days=aleatorio.randint(-rango_dias, rango_dias))
+            ruta = ruta.format(fecha=fecha.isoformat())
+
+            token = self.token
+            inicio = time.perf_counter()
+            try:
+                try:
+                    self.peticion(ruta, token=token)
+                except HTTPError as error:
+                    if error.code != 401:
+                        raise
+                    self.peticion(ruta, token=self.renovar_token(token))
+            except (HTTPError, URLError, OSError):
+                errores[nombre] += 1
+                continue
+            muestras[nombre].append((time.perf_counter() - inicio) * 1000)
+        return muestras, errores
+
+    def resumir(self, muestras, errores, transcurrido):
+        endpoints = {}
+        for nombre, tiempos in muestras.items():
+            tiempos.sort()
+            endpoints[nombre] = {
+                'requests': len(tiempos),
+                'errors': errores[nombre],
+                'p50_ms': round(percentil(tiempos, 50), 1),
+                'p95_ms': round(percentil(tiempos, 95), 1),
+                'p99_ms': round(percentil(tiempos, 99), 1),
+                'max_ms': round(tiempos[-1], 1) if tiempos else 0.0,
+            }
+        total = sum(len(tiempos) for tiempos in muestras.values())
+        return {
+            'duration_s': round(transcurrido, 1),
+            'requests': total,
+            'errors': sum(errores.values()),
+            'requests_per_second': round(total / transcurrido, 1) if transcurrido else 0.0,
+            'endpoints': endpoints,
+        }
+
+    def imprimir(self, resultados):
+        self.stdout.write(
+            f'{"endpoint":<22}{"n":>7}{"err":>6}{"p50":>9}{"p95":>9}{"p99":>9}{"max":>9}'
+        )
+        for nombre, datos in resultados['endpoints'].items():
+            self.stdout.write(
+                f'{nombre:<22}{datos["requests"]:>7}{datos["errors"]:>6}'
+                f'{datos["p50_ms"]:>9.1f}{datos["p95_ms"]:>9.1f}{datos["p99_ms"]:>9.1f}{datos["max_ms"]:>9.1f}'
+            )
+        self.stdout.write(
+            f'Total: {resultados["requests"]} peticiones, {resultados["errors"]} errores, '
+            f'{resultados["requests_per_second"]} peticiones/s'
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from core.models import AppointmentView
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el modelo de lectura desnormalizado de citas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Cantidad de citas procesadas por lote'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reconstruyendo modelo de lectura de citas...')
+        total = AppointmentView.objects.reconstruir(tamano_lote=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Se sincronizaron {total} citas'))
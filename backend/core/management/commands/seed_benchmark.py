@@ -0,0 +1,232 @@
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Owner, Pet, Service, Appointment, AppointmentView, Professional
+from core.models.owner import obtener_nombre_corto
+
+NOMBRES = [
+    'Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Gabriela', 'José', 'Daniela', 'Andrés',
+    'Valeria', 'Diego', 'Fernanda', 'Jorge', 'Paola', 'Miguel', 'Carolina', 'David', 'Sofía',
+]
+APELLIDOS = [
+    'Pérez', 'García', 'Rodríguez', 'López', 'Martínez', 'Sánchez', 'Torres', 'Ramírez',
+    'Flores', 'Vera', 'Mendoza', 'Castro', 'Cedeño', 'Zambrano', 'Álvarez', 'Morales',
+]
+CIUDADES = ['Guayaquil', 'Quito', 'Cuenca', 'Manta', 'Machala', 'Ambato']
+NOMBRES_MASCOTA = [
+    'Max', 'Luna', 'Rocky', 'Lola', 'Toby', 'Kira', 'Bruno', 'Nala', 'Coco', 'Maya',
+    'Thor', 'Canela', 'Simba', 'Mía', 'Zeus', 'Princesa', 'Oso', 'Chispa',
+]
+# (raza, peso medio en kg, peso relativo en la población)
+RAZAS = [
+    ('Mestizo', 14, 30), ('Poodle', 6, 12), ('Shih Tzu', 6, 10), ('Labrador', 30, 9),
+    ('Golden Retriever', 30, 6), ('Pastor Alemán', 32, 6), ('Chihuahua', 2.5, 7),
+    ('Schnauzer', 8, 6), ('Pitbull', 25, 5), ('Beagle', 11, 4), ('Bulldog Francés', 11, 5),
+]
+COLORES = ['Negro', 'Blanco', 'Café', 'Dorado', 'Gris', 'Blanco y negro', 'Atigrado']
+ESPECIALIDADES = ['Medicina general', 'Estética canina', 'Dermatología', 'Peluquería']
+
+# Demanda relativa por tipo de servicio
+PESO_SERVICIO = {
+    'baño_normal': 35, 'peluqueria': 25, 'atencion_general': 20,
+    'desparasitacion': 12, 'baño_medicado': 8,
+}
+# Demanda relativa por día de la semana (lunes=0); el domingo no se atiende
+PESO_DIA = [1.0, 0.9, 0.9, 1.0, 1.2, 0.7, 0]
+# Estados de citas pasadas y futuras con su frecuencia
+ESTADOS_PASADOS = (['realizada', 'cancelada', 'confirmada', 'pendiente'], [80, 12, 5, 3])
+ESTADOS_FUTUROS = (['pendiente', 'confirmada', 'cancelada'], [60, 35, 5])
+# Horario de atención 8:00-16:00 en bloques de 15 minutos
+HORA_APERTURA = 8
+BLOQUES_DIA = 32
+MINUTOS_BLOQUE = 15
+# Intentos de ubicar una cita en un hueco libre antes de descartarla
+INTENTOS_HORARIO = 20
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos realistas (propietarios, mascotas, profesionales y citas) para pruebas de carga'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owners', type=int, default=2000, help='Propietarios a generar')
+        parser.add_argument('--professionals', type=int, default=6, help='Profesionales a generar')
+        parser.add_argument('--years', type=float, default=2, help='Años de historial de citas')
+        parser.add_argument(
+            '--future-days', type=int, default=30, help='Días de agenda futura a generar'
+        )
+        parser.add_argument(
+            '--per-day', type=float, default=30, help='Citas promedio por día laborable'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000, help='Tamaño de lote para bulk_create')
+        parser.add_argument('--random-seed', type=int, default=42, help='Semilla para resultados reproducibles')
+
+    def handle(self, *args, **options):
+        servicios = list(Service.objects.filter(is_active=True))
+        if not servicios:
+            raise CommandError('No hay servicios activos: ejecute primero cleanup_services')
+
+        self.aleatorio = random.Random(options['random_seed'])
+        self.tamano_lote = options['batch_size']
+        # Prefijo único por ejecución para no chocar con identificaciones existentes
+        self.prefijo = f'SB{timezone.now():%y%m%d%H%M%S}'
+
+        with transaction.atomic():
+            profesionales = self.crear_profesionales(options['professionals'])
+            mascotas = self.crear_propietarios_y_mascotas(options['owners'])
+            total = self.crear_citas(
+                mascotas, servicios, profesionales,
+                options['years'], options['future_days'], options['per_day']
+            )
+
+        self.stdout.write('Reconstruyendo el modelo de lectura de citas...')
+        AppointmentView.objects.reconstruir(tamano_lote=self.tamano_lote)
+        self.stdout.write(self.style.SUCCESS(
+            f'Generados {options["owners"]} propietarios, {len(mascotas)} mascotas, '
+            f'{len(profesionales)} profesionales y {total} citas'
+        ))
+
+    def nombre_persona(self):
+        return ' '.join([
+            self.aleatorio.choice(NOMBRES), self.aleatorio.choice(NOMBRES),
+            self.aleatorio.choice(APELLIDOS), self.aleatorio.choice(APELLIDOS),
+        ])
+
+    def crear_profesionales(self, cantidad):
+        return Professional.objects.bulk_create([
+            Professional(
+                full_name=self.nombre_persona(),
+                specialty=ESPECIALIDADES[i % len(ESPECIALIDADES)],
+                phone=f'09{self.aleatorio.randrange(10 ** 8):08d}',
+            )
+            for i in range(cantidad)
+        ])
+
+    def crear_propietarios_y_mascotas(self, cantidad):
+        self.stdout.write(f'Generando {cantidad} propietarios y sus mascotas...')
+        aleatorio = self.aleatorio
+        hoy = date.today()
+        mascotas = []
+
+        for inicio in range(0, cantidad, self.tamano_lote):
+            propietarios = []
+            for i in range(inicio, min(inicio + self.tamano_lote, cantidad)):
+                nombre = self.nombre_persona()
+                propietarios.append(Owner(
+                    full_name=nombre,
+                    short_name=obtener_nombre_corto(nombre),
+                    identification_number=f'{self.prefijo}-{i:06d}',
+                    address=f'{aleatorio.choice(CIUDADES)}, calle {aleatorio.randint(1, 120)}',
+                    phone=f'09{aleatorio.randrange(10 ** 8):08d}',
+                    email=f'cliente{i}@example.com' if aleatorio.random() < 0.6 else None,
+                ))
+            propietarios = Owner.objects.bulk_create(propietarios)
+
+            lote = []
+            for propietario in propietarios:
+                # La mayoría tiene una mascota; pocos tienen tres o más
+                cantidad_mascotas = aleatorio.choices([1, 2, 3, 4], weights=[58, 27, 11, 4])[0]
+                for _ in range(cantidad_mascotas):
+                    raza, peso_medio, _ = aleatorio.choices(RAZAS, weights=[r[2] for r in RAZAS])[0]
+                    # Edades sesgadas a perros jóvenes, hasta 15 años
+                    edad_dias = int(aleatorio.triangular(60, 15 * 365, 2 * 365))
+                    peso = max(peso_medio * aleatorio.uniform(0.7, 1.3), 0.5)
+                    lote.append(Pet(
+                        name=aleatorio.choice(NOMBRES_MASCOTA),
+                        breed=raza,
+                        birth_date=hoy - timedelta(days=edad_dias),
+                        gender=aleatorio.choice('MF'),
+                        color=aleatorio.choice(COLORES),
+                        weight=Decimal(f'{peso:.2f}'),
+                        allergies='Pulgas' if aleatorio.random() < 0.05 else '',
+                        owner=propietario,
+                    ))
+            mascotas.extend(Pet.objects.bulk_create(lote))
+        return mascotas
+
+    def crear_citas(self, mascotas, servicios, profesionales, anios, dias_futuros, por_dia):
+        aleatorio = self.aleatorio
+        hoy = timezone.localdate()
+        desde = hoy - timedelta(days=int(anios * 365))
+        hasta = hoy + timedelta(days=dias_futuros)
+        self.stdout.write(f'Generando citas entre {desde} y {hasta}...')
+
+        pesos_servicio = [PESO_SERVICIO.get(s.service_type, 10) for s in servicios]
+        # Clientes frecuentes: una minoría de mascotas concentra gran parte de las citas
+        pesos_mascota = [aleatorio.paretovariate(1.5) for _ in mascotas]
+        ahora = timezone.now()
+        total = 0
+        lote = []
+
+        dia = desde
+        while dia <= hasta:
+            esperado = por_dia * PESO_DIA[dia.weekday()]
+            cantidad = max(int(aleatorio.gauss(esperado, esperado ** 0.5)), 0) if esperado else 0
+            elegidas = aleatorio.choices(mascotas, weights=pesos_mascota, k=cantidad)
+            # Bloques ocupados de cada profesional en el día, para no agendarle dos citas a la vez
+            ocupados = {profesional.pk: set() for profesional in profesionales}
+            for mascota in elegidas:
+                servicio = aleatorio.choices(servicios, weights=pesos_servicio)[0]
+                horario = self.reservar_horario(ocupados, profesionales, servicio.duration_minutes)
+                if horario is None:
+                    # Agenda llena: se descarta la cita en lugar de superponerla
+                    continue
+                profesional, bloque = horario
+                inicio = timezone.make_aware(datetime.combine(
+                    dia, time(HORA_APERTURA + bloque // 4, (bloque % 4) * MINUTOS_BLOQUE)
+                ))
+                estados, pesos = ESTADOS_PASADOS if inicio < ahora else ESTADOS_FUTUROS
+                estado = aleatorio.choices(estados, weights=pesos)[0]
+
+                cita = Appointment(
+                    pet=mascota,
+                    service=servicio,
+                    price_charged=servicio.price,
+                    assigned_professional=profesional,
+                    appointment_date=inicio,
+                    status=estado,
+                    reason='Control de rutina' if aleatorio.random() < 0.3 else '',
+                )
+                if servicio.requires_medication:
+                    cita.medication_type = 'Antiparasitario' if servicio.service_type == 'desparasitacion' else 'Champú medicado'
+                    cita.medication_dosage = f'{aleatorio.choice([1, 2, 5, 10])} ml'
+                if estado == 'realizada':
+                    # Inicio real con algo de retraso y duración alrededor de la estimada
+                    cita.actual_start_time = inicio + timedelta(minutes=max(aleatorio.gauss(5, 5), 0))
+                    duracion = max(aleatorio.gauss(servicio.duration_minutes * 1.05, servicio.duration_minutes * 0.2), 10)
+                    cita.actual_end_time = cita.actual_start_time + timedelta(minutes=duracion)
+                lote.append(cita)
+
+                if len(lote) >= self.tamano_lote:
+                    Appointment.objects.bulk_create(lote)
+                    total += len(lote)
+                    lote = []
+            dia += timedelta(days=1)
+
+        if lote:
+            Appointment.objects.bulk_create(lote)
+            total += len(lote)
+        return total
+
+    def reservar_horario(self, ocupados, profesionales, duracion_minutos):
+        """Elige profesional y bloque de inicio libres para una cita y los marca como ocupados.
+
+        Devuelve ``(profesional, bloque)`` o ``None`` si tras varios intentos no hay hueco.
+        Sin profesionales no hay superposición posible y solo se sortea el bloque.
+        """
+        aleatorio = self.aleatorio
+        if not profesionales:
+            return None, aleatorio.randrange(BLOQUES_DIA)
+        necesarios = max(-(-duracion_minutos // MINUTOS_BLOQUE), 1)
+        for _ in range(INTENTOS_HORARIO):
+            profesional = aleatorio.choice(profesionales)
+            bloque = aleatorio.randrange(BLOQUES_DIA)
+            bloques = set(range(bloque, bloque + necesarios))
+            if not bloques & ocupados[profesional.pk]:
+                ocupados[profesional.pk] |= bloques
+                return profesional, bloque
+        return None
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import analytics
+from core.models import Service, Professional
+
+
+class Command(BaseCommand):
+    help = 'Compara la duración real de las citas con Service.duration_minutes y sugiere nuevas duraciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Días hacia atrás a analizar')
+        parser.add_argument(
+            '--apply', action='store_true',
+            help='Actualizar duration_minutes de los servicios con duración sugerida'
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days debe ser al menos 1')
+
+        fin = timezone.localdate()
+        inicio = fin - timedelta(days=options['days'] - 1)
+        try:
+            analytics.validar_rango(inicio, fin)
+        except ValueError as error:
+            raise CommandError(str(error))
+        servicios = {servicio.pk: servicio for servicio in Service.objects.all()}
+        datos = analytics.duraciones_reales(
+            inicio, fin,
+            {
+                servicio.pk: (servicio.name, servicio.service_type, servicio.duration_minutes)
+                for servicio in servicios.values()
+            },
+            dict(Professional.objects.values_list('id', 'full_name')),
+        )
+
+        cambios = []
+        self.stdout.write(f'Duración real del {inicio} al {fin}:')
+        for fila in datos['services']:
+            sugerida = fila['suggested_minutes']
+            self.stdout.write(
+                f'  {fila["name"]}: {fila["count"]} citas, agendado {fila["scheduled_minutes"]} min, '
+                f'p50 {fila["p50_minutes"]} / p90 {fila["p90_minutes"]} min, '
+                f'sugerido {sugerida if sugerida is not None else "-"} min'
+            )
+            if sugerida is not None and sugerida != fila['scheduled_minutes']:
+                cambios.append((servicios[fila['id']], sugerida))
+
+        if not cambios:
+            self.stdout.write('No hay duraciones para ajustar')
+            return
+        if not options['apply']:
+            self.stdout.write(self.style.WARNING(
+                f'{len(cambios)} servicios con duración sugerida distinta (use --apply para actualizarlos)'
+            ))
+            return
+
+        # save() por servicio: las señales actualizan el modelo de lectura y el formulario de citas
+        with transaction.atomic():
+            for servicio, sugerida in cambios:
+                servicio.duration_minutes = sugerida
+                servicio.save(update_fields=['duration_minutes'])
+        self.stdout.write(self.style.SUCCESS(f'Se actualizaron {len(cambios)} servicios'))
@@ -0,0 +1,267 @@
+# Métricas del proceso en formato de exposición de texto de Prometheus
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from authentication.signals import intento_login
+from .db.pool import estadisticas_pools
+from .profiling import nombre_vista, usuario_staff
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_consultas_peticion = contextvars.ContextVar('consultas_peticion', default=None)
+
+
+def escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def formatear_etiquetas(etiquetas):
+    if not etiquetas:
+        return ''
+    return '{' + ','.join(f'{clave}="{escapar(valor)}"' for clave, valor in etiquetas) + '}'
+
+
+def formatear_numero(valor):
+    if valor == float('inf'):
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metrica:
+    tipo = None
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+
+    def clave(self, valores):
+        return tuple((nombre, valores[nombre]) for nombre in self.etiquetas)
+
+    def encabezado(self):
+        return [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} {self.tipo}']
+
+    def exponer(self):
+        raise NotImplementedError
+
+
+class Contador(Metrica):
+    tipo = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores = {}
+
+    def inc(self, cantidad=1, **etiquetas):
+        clave = self.clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def exponer(self):
+        with self._lock:
+            valores = sorted(self._valores.items())
+        return self.encabezado() + [
+            f'{self.nombre}{formatear_etiquetas(clave)} {formatear_numero(valor)}'
+            for clave, valor in valores
+        ]
+
+
+class Histograma(Metrica):
+    tipo = 'histogram'
+
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observar(self, valor, **etiquetas):
+        clave = self.clave(etiquetas)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                # Conteos por bucket (no acumulados), suma y total
+                serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exponer(self):
+        with self._lock:
+            series = sorted((clave, [list(s[0]), s[1], s[2]]) for clave, s in self._series.items())
+        lineas = self.encabezado()
+        for clave, (conteos, suma, total) in series:
+            acumulado = 0
+            for limite, conteo in zip((*self.buckets, float('inf')), conteos):
+                acumulado += conteo
+                etiquetas = formatear_etiquetas((*clave, ('le', formatear_numero(limite))))
+                lineas.append(f'{self.nombre}_bucket{etiquetas} {acumulado}')
+            lineas.append(f'{self.nombre}_sum{formatear_etiquetas(clave)} {formatear_numero(suma)}')
+            lineas.append(f'{self.nombre}_count{formatear_etiquetas(clave)} {total}')
+        return lineas
+
+
+class ContadorCalculado(Metrica):
+    """Contador cuyo valor se lee al exponer, p. ej. de las estadísticas de una caché"""
+    tipo = 'counter'
+
+    def __init__(self, nombre, ayuda, etiquetas, funcion):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.funcion = funcion
+
+    def exponer(self):
+        return self.encabezado() + [
+            f'{self.nombre}{formatear_etiquetas(tuple(zip(self.etiquetas, clave)))} {formatear_numero(valor)}'
+            for clave, valor in sorted(self.funcion().items())
+        ]
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def exponer(self):
+        lineas = []
+        for metrica in self._metricas:
+            lineas.extend(metrica.exponer())
+        return '\n'.join(lineas) + '\n'
+
+
+registro_metricas = RegistroMetricas()
+
+DURACION_PETICIONES = registro_metricas.registrar(Histograma(
+    'http_request_duration_seconds', 'Latencia de las peticiones por vista y acción',
+    etiquetas=('view', 'method', 'status'),
+))
+CONSULTAS_POR_PETICION = registro_metricas.registrar(Histograma(
+    'db_queries_per_request', 'Consultas SQL por petición',
+    etiquetas=('view',), buckets=BUCKETS_CONSULTAS,
+))
+INTENTOS_LOGIN = registro_metricas.registrar(Contador(
+    'login_attempts_total', 'Intentos de login por resultado', etiquetas=('outcome',),
+))
+EXPORTACIONES = registro_metricas.registrar(Contador(
+    'export_jobs_total', 'Exportaciones generadas', etiquetas=('export',),
+))
+FILAS_EXPORTADAS = registro_metricas.registrar(Contador(
+    'export_rows_total', 'Filas escritas en exportaciones', etiquetas=('export',),
+))
+BYTES_EXPORTADOS = registro_metricas.registrar(Contador(
+    'export_bytes_total', 'Bytes generados por exportaciones', etiquetas=('export',),
+))
+DURACION_EXPORTACIONES = registro_metricas.registrar(Histograma(
+    'export_duration_seconds', 'Duración de las exportaciones', etiquetas=('export',),
+))
+
+
+def estadisticas_caches():
+    """{(cache, resultado): total} de las cachés en memoria del proceso"""
+    from authentication.jwt_auth import cache_usuarios
+    from .models.owner import obtener_nombre_corto
+
+    nombre_corto = obtener_nombre_corto.cache_info()
+    return {
+        ('jwt_usuarios', 'hit'): cache_usuarios.aciertos,
+        ('jwt_usuarios', 'miss'): cache_usuarios.fallos,
+        ('nombre_corto', 'hit'): nombre_corto.hits,
+        ('nombre_corto', 'miss'): nombre_corto.misses,
+    }
+
+
+registro_metricas.registrar(ContadorCalculado(
+    'cache_requests_total', 'Búsquedas en cachés en memoria por resultado',
+    ('cache', 'result'), estadisticas_caches,
+))
+
+
+registro_metricas.registrar(ContadorCalculado(
+    'db_pool_connections_total', 'Conexiones del pool por base de datos y evento',
+    ('database', 'event'), estadisticas_pools,
+))
+
+
+@receiver(intento_login)
+def contar_intento_login(sender, resultado, **kwargs):
+    INTENTOS_LOGIN.inc(outcome=resultado)
+
+
+class ContadorConsultas:
+    """Consultas de una petición, incluidas las de hilos del pool de reportes"""
+
+    def __init__(self):
+        self.valor = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.valor += 1
+        return execute(sql, params, many, context)
+
+
+def _gancho_sql(execute, sql, params, many, context):
+    contador = _consultas_peticion.get()
+    if contador is None:
+        return execute(sql, params, many, context)
+    return contador(execute, sql, params, many, context)
+
+
+def _agregar_gancho_sql(connection, **kwargs):
+    if _gancho_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_gancho_sql)
+
+
+def instalar_ganchos():
+    connection_created.connect(_agregar_gancho_sql, dispatch_uid='metricas_gancho_sql')
+    for conexion in connections.all(initialized_only=True):
+        _agregar_gancho_sql(conexion)
+
+
+class MetricasMiddleware:
+    """Registra latencia y consultas de cada petición por vista (nombre de ruta con su acción)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instalar_ganchos()
+
+    def __call__(self, request):
+        contador = ContadorConsultas()
+        marca = _consultas_peticion.set(contador)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _consultas_peticion.reset(marca)
+        duracion = time.perf_counter() - inicio
+
+        vista = nombre_vista(request)
+        DURACION_PETICIONES.observar(
+            duracion, view=vista, method=request.method, status=f'{response.status_code // 100}xx'
+        )
+        CONSULTAS_POR_PETICION.observar(contador.valor, view=vista)
+        return response
+
+
+def token_autorizado(request):
+    """Acceso a /api/metrics/: Authorization: Bearer <METRICS['TOKEN']> o un usuario staff.
+
+    Sin token configurado, solo con DEBUG queda abierto.
+    """
+    token = getattr(settings, 'METRICS', {}).get('TOKEN')
+    if token and request.META.get('HTTP_AUTHORIZATION') == f'Bearer {token}':
+        return True
+    if usuario_staff(request):
+        return True
+    return settings.DEBUG and not token
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pet',
+            name='birth_date',
+            field=models.DateField(db_index=True, help_text='Aproximada si es desconocida', verbose_name='Fecha de nacimiento'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+def nombre_corto(nombre_completo):
+    """Copia congelada de core.models.owner.obtener_nombre_corto al crear la migración"""
+    partes_nombre = (nombre_completo or '').split()
+    if len(partes_nombre) >= 3:
+        return f"{partes_nombre[0]} {partes_nombre[2]}"  # Primer_Nombre Primer_Apellido
+    return ' '.join(partes_nombre)
+
+
+def rellenar_nombres_cortos(apps, schema_editor):
+    Owner = apps.get_model('core', 'Owner')
+    lote = []
+    for propietario in Owner.objects.only('id', 'full_name').iterator(chunk_size=1000):
+        propietario.short_name = nombre_corto(propietario.full_name)
+        lote.append(propietario)
+        if len(lote) >= 1000:
+            Owner.objects.bulk_update(lote, ['short_name'])
+            lote = []
+    if lote:
+        Owner.objects.bulk_update(lote, ['short_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_pet_birth_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='owner',
+            name='short_name',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='Nombre corto'),
+        ),
+        migrations.RunPython(rellenar_nombres_cortos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_owner_short_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentView',
+            fields=[
+                ('appointment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vista_lectura', serialize=False, to='core.appointment')),
+                ('owner_id', models.BigIntegerField(db_index=True)),
+                ('appointment_date', models.DateTimeField(db_index=True)),
+                ('status', models.CharField(choices=[('pendiente', 'Pendiente'), ('confirmada', 'Confirmada'), ('realizada', 'Realizada'), ('cancelada', 'Cancelada')], max_length=15)),
+                ('reason', models.TextField(blank=True)),
+                ('medication_type', models.CharField(blank=True, max_length=200)),
+                ('medication_dosage', models.CharField(blank=True, max_length=100)),
+                ('instructions', models.TextField(blank=True)),
+                ('observations', models.TextField(blank=True)),
+                ('actual_start_time', models.DateTimeField(blank=True, null=True)),
+                ('actual_end_time', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('pet_name', models.CharField(max_length=100)),
+                ('pet_breed', models.CharField(max_length=100)),
+                ('owner_name', models.CharField(max_length=200)),
+                ('owner_short_name', models.CharField(blank=True, max_length=200)),
+                ('owner_phone', models.CharField(max_length=15)),
+                ('service_name', models.CharField(max_length=100)),
+                ('service_type', models.CharField(max_length=20)),
+                ('service_duration', models.PositiveIntegerField()),
+                ('professional_name', models.CharField(blank=True, max_length=200, null=True)),
+                ('assigned_professional', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.professional')),
+                ('pet', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.pet')),
+                ('service', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.service')),
+            ],
+            options={
+                'verbose_name': 'Cita (lectura)',
+                'verbose_name_plural': 'Citas (lectura)',
+                'db_table': 'core_appointment_view',
+                'ordering': ['-appointment_date'],
+            },
+        ),
+    ]
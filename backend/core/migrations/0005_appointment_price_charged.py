@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:16
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def rellenar_precios(apps, schema_editor):
+    """Copiar el precio vigente del servicio a las citas existentes, por rangos de id"""
+    Appointment = apps.get_model('core', 'Appointment')
+    Service = apps.get_model('core', 'Service')
+    precio = Subquery(Service.objects.filter(pk=OuterRef('service_id')).values('price')[:1])
+    ultimo_id = Appointment.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    for desde in range(0, ultimo_id, 5000):
+        Appointment.objects.filter(
+            pk__gt=desde, pk__lte=desde + 5000, price_charged__isnull=True
+        ).update(price_charged=precio)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_appointment_view'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='price_charged',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=8, null=True, verbose_name='Precio cobrado'),
+        ),
+        migrations.RunPython(rellenar_precios, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_appointment_price_charged'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('appointment_date', models.DateTimeField(db_index=True, verbose_name='Fecha y hora')),
+                ('price_charged', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='Precio cobrado')),
+                ('reason', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('pendiente', 'Pendiente'), ('confirmada', 'Confirmada'), ('realizada', 'Realizada'), ('cancelada', 'Cancelada')], max_length=15)),
+                ('medication_type', models.CharField(blank=True, max_length=200)),
+                ('medication_dosage', models.CharField(blank=True, max_length=100)),
+                ('instructions', models.TextField(blank=True)),
+                ('observations', models.TextField(blank=True)),
+                ('actual_start_time', models.DateTimeField(blank=True, null=True)),
+                ('actual_end_time', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archivada el')),
+                ('assigned_professional', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.professional', verbose_name='Profesional asignado')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_appointments', to='core.pet', verbose_name='Mascota')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_appointments', to='core.service', verbose_name='Servicio')),
+            ],
+            options={
+                'verbose_name': 'Cita archivada',
+                'verbose_name_plural': 'Citas archivadas',
+                'db_table': 'core_appointment_archive',
+                'ordering': ['-appointment_date'],
+            },
+        ),
+    ]
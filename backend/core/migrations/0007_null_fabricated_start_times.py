@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:40
+
+from django.db import migrations
+from django.db.models import F
+
+
+def anular_inicios_fabricados(apps, schema_editor):
+    """Anular los inicios reales que update_status copiaba de la hora agendada sin medirlos"""
+    for modelo in ('Appointment', 'AppointmentArchive', 'AppointmentView'):
+        apps.get_model('core', modelo).objects.filter(
+            actual_start_time=F('appointment_date')
+        ).update(actual_start_time=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_appointment_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(anular_inicios_fabricados, migrations.RunPython.noop),
+    ]
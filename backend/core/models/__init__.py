@@ -4,6 +4,8 @@ from .owner import Owner
 from .pet import Pet
 from .service import Service
 from .appointment import Appointment
+from .appointment_view import AppointmentView
+from .appointment_archive import AppointmentArchive
 from .base import BaseModel, TimeStampedModel, ActiveModel
 
 __all__ = [
@@ -12,6 +14,8 @@ __all__ = [
     'Pet',
     'Service',
     'Appointment',
+    'AppointmentView',
+    'AppointmentArchive',
     'BaseModel',
     'TimeStampedModel',
     'ActiveModel'
@@ -8,6 +8,17 @@ from .service import Service
 from .professional import Professional
 
 
+def formatear_duracion(minutos):
+    """Formato legible de una duración en minutos"""
+    if minutos < 60:
+        return f"{minutos} min"
+    horas = minutos // 60
+    minutos_restantes = minutos % 60
+    if minutos_restantes == 0:
+        return f"{horas}h"
+    return f"{horas}h {minutos_restantes}min"
+
+
 class Appointment(TimeStampedModel):
     """Modelo para gestión de citas veterinarias"""
     pet = models.ForeignKey(
@@ -32,6 +43,16 @@ class Appointment(TimeStampedModel):
     )
     
     appointment_date = models.DateTimeField(verbose_name="Fecha y hora")
+
+    # Precio del servicio al momento de agendar; los reportes de ingresos suman este campo
+    price_charged = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Precio cobrado"
+    )
     
     # Motivo de la consulta
     reason = models.TextField(
@@ -112,21 +133,35 @@ class Appointment(TimeStampedModel):
                     'appointment_date': 'Las citas deben ser entre 8:00 AM y 4:00 PM'
                 })
 
+        if self.actual_start_time and self.actual_end_time and self.actual_end_time < self.actual_start_time:
+            raise ValidationError({
+                'actual_end_time': 'El fin real no puede ser anterior al inicio real'
+            })
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._service_id_original = instancia.__dict__.get('service_id')
+        # Día previo de la cita, para invalidar los acumulados de reportes al reprogramar
+        instancia._appointment_date_original = instancia.__dict__.get('appointment_date')
+        return instancia
+
     def save(self, *args, **kwargs):
         self.full_clean()
+        # Capturar el precio al agendar o al cambiar de servicio
+        servicio_cambiado = self.service_id != getattr(self, '_service_id_original', self.service_id)
+        if self.service_id and (self.price_charged is None or servicio_cambiado):
+            self.price_charged = self.service.price
+            self._service_id_original = self.service_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'price_charged'}
         super().save(*args, **kwargs)
 
     @property
     def duracion_mostrar(self):
         """Formato legible de duración"""
-        minutos = self.service.duration_minutes
-        if minutos < 60:
-            return f"{minutos} min"
-        horas = minutos // 60
-        minutos_restantes = minutos % 60
-        if minutos_restantes == 0:
-            return f"{horas}h"
-        return f"{horas}h {minutos_restantes}min"
+        return formatear_duracion(self.service.duration_minutes)
 
     @property
     def duration_display(self):
@@ -0,0 +1,77 @@
+from django.db import models
+from .appointment import Appointment, formatear_duracion
+from .pet import Pet
+from .service import Service
+from .professional import Professional
+
+
+class AppointmentArchive(models.Model):
+    """Citas antiguas movidas fuera de core_appointment por el comando archive_appointments.
+
+    Conserva el id original de la cita y los mismos campos, para que reportes
+    e historial médico puedan combinar ambas tablas.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    pet = models.ForeignKey(
+        Pet,
+        on_delete=models.CASCADE,
+        related_name='archived_appointments',
+        verbose_name="Mascota"
+    )
+    service = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        related_name='archived_appointments',
+        verbose_name="Servicio"
+    )
+    assigned_professional = models.ForeignKey(
+        Professional,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Profesional asignado"
+    )
+    appointment_date = models.DateTimeField(db_index=True, verbose_name="Fecha y hora")
+    price_charged = models.DecimalField(
+        max_digits=8, decimal_places=2, null=True, blank=True, verbose_name="Precio cobrado"
+    )
+    reason = models.TextField(blank=True)
+    status = models.CharField(max_length=15, choices=Appointment.STATUS_CHOICES)
+    medication_type = models.CharField(max_length=200, blank=True)
+    medication_dosage = models.CharField(max_length=100, blank=True)
+    instructions = models.TextField(blank=True)
+    observations = models.TextField(blank=True)
+    actual_start_time = models.DateTimeField(null=True, blank=True)
+    actual_end_time = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(
+        'authentication.CustomUser',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Archivada el")
+
+    # Campos copiados tal cual desde Appointment al archivar
+    CAMPOS_COPIADOS = (
+        'id', 'pet_id', 'service_id', 'assigned_professional_id', 'appointment_date',
+        'price_charged', 'reason', 'status', 'medication_type', 'medication_dosage',
+        'instructions', 'observations', 'actual_start_time', 'actual_end_time',
+        'created_by_id', 'created_at', 'updated_at',
+    )
+
+    class Meta:
+        db_table = 'core_appointment_archive'
+        ordering = ['-appointment_date']
+        verbose_name = "Cita archivada"
+        verbose_name_plural = "Citas archivadas"
+
+    @property
+    def duracion_mostrar(self):
+        """Formato legible de duración"""
+        return formatear_duracion(self.service.duration_minutes)
+
+    def __str__(self):
+        return f"{self.pet.name} - {self.service.name} ({self.appointment_date.strftime('%d/%m/%Y %H:%M')})"
@@ -0,0 +1,139 @@
+from django.db import models, transaction
+from .appointment import Appointment, formatear_duracion
+from .owner import obtener_nombre_corto
+from .pet import Pet
+from .service import Service
+from .professional import Professional
+
+
+class AppointmentViewManager(models.Manager):
+    """Operaciones de sincronización del modelo de lectura"""
+
+    def construir_fila(self, cita):
+        """Aplanar una cita (con sus relaciones cargadas) en una fila de lectura"""
+        propietario = cita.pet.owner
+        profesional = cita.assigned_professional
+        return self.model(
+            appointment_id=cita.pk,
+            pet_id=cita.pet_id,
+            service_id=cita.service_id,
+            assigned_professional_id=cita.assigned_professional_id,
+            owner_id=propietario.pk,
+            appointment_date=cita.appointment_date,
+            status=cita.status,
+            reason=cita.reason,
+            medication_type=cita.medication_type,
+            medication_dosage=cita.medication_dosage,
+            instructions=cita.instructions,
+            observations=cita.observations,
+            actual_start_time=cita.actual_start_time,
+            actual_end_time=cita.actual_end_time,
+            created_at=cita.created_at,
+            updated_at=cita.updated_at,
+            pet_name=cita.pet.name,
+            pet_breed=cita.pet.breed,
+            owner_name=propietario.full_name,
+            owner_short_name=propietario.short_name or obtener_nombre_corto(propietario.full_name),
+            owner_phone=propietario.phone,
+            service_name=cita.service.name,
+            service_type=cita.service.service_type,
+            service_duration=cita.service.duration_minutes,
+            professional_name=profesional.full_name if profesional else None,
+        )
+
+    def sincronizar(self, citas):
+        """Reemplazar las filas de lectura de las citas indicadas (queryset o lista de ids)"""
+        if not isinstance(citas, models.QuerySet):
+            citas = Appointment.objects.filter(pk__in=list(citas))
+        citas = citas.select_related('pet__owner', 'service', 'assigned_professional')
+        filas = [self.construir_fila(cita) for cita in citas]
+        with transaction.atomic():
+            self.filter(appointment_id__in=[fila.appointment_id for fila in filas]).delete()
+            self.bulk_create(filas)
+        return len(filas)
+
+    def reconstruir(self, tamano_lote=1000):
+        """Regenerar todo el modelo de lectura por lotes de ids"""
+        total = 0
+        ultimo_id = 0
+        while True:
+            ids = list(
+                Appointment.objects.filter(pk__gt=ultimo_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:tamano_lote]
+            )
+            if not ids:
+                break
+            total += self.sincronizar(Appointment.objects.filter(pk__in=ids))
+            ultimo_id = ids[-1]
+        # Eliminar filas huérfanas de citas que ya no existen
+        self.exclude(appointment_id__in=Appointment.objects.values('pk')).delete()
+        return total
+
+
+class AppointmentView(models.Model):
+    """Modelo de lectura desnormalizado de citas para calendario y listados"""
+    appointment = models.OneToOneField(
+        Appointment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='vista_lectura'
+    )
+
+    # Referencias sin restricción: solo se usan para filtrar
+    pet = models.ForeignKey(
+        Pet, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+'
+    )
+    service = models.ForeignKey(
+        Service, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+'
+    )
+    assigned_professional = models.ForeignKey(
+        Professional, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+'
+    )
+    owner_id = models.BigIntegerField(db_index=True)
+
+    # Campos propios de la cita
+    appointment_date = models.DateTimeField(db_index=True)
+    status = models.CharField(max_length=15, choices=Appointment.STATUS_CHOICES)
+    reason = models.TextField(blank=True)
+    medication_type = models.CharField(max_length=200, blank=True)
+    medication_dosage = models.CharField(max_length=100, blank=True)
+    instructions = models.TextField(blank=True)
+    observations = models.TextField(blank=True)
+    actual_start_time = models.DateTimeField(null=True, blank=True)
+    actual_end_time = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    # Textos aplanados de las relaciones
+    pet_name = models.CharField(max_length=100)
+    pet_breed = models.CharField(max_length=100)
+    owner_name = models.CharField(max_length=200)
+    owner_short_name = models.CharField(max_length=200, blank=True)
+    owner_phone = models.CharField(max_length=15)
+    service_name = models.CharField(max_length=100)
+    service_type = models.CharField(max_length=20)
+    service_duration = models.PositiveIntegerField()
+    professional_name = models.CharField(max_length=200, null=True, blank=True)
+
+    objects = AppointmentViewManager()
+
+    class Meta:
+        db_table = 'core_appointment_view'
+        ordering = ['-appointment_date']
+        verbose_name = "Cita (lectura)"
+        verbose_name_plural = "Citas (lectura)"
+
+    @property
+    def duracion_mostrar(self):
+        """Formato legible de duración"""
+        return formatear_duracion(self.service_duration)
+
+    @property
+    def duration_display(self):
+        """Alias para compatibilidad"""
+        return self.duracion_mostrar
+
+    def __str__(self):
+        return f"{self.pet_name} - {self.service_name} ({self.appointment_date.strftime('%d/%m/%Y %H:%M')})"
@@ -1,11 +1,38 @@
+from functools import lru_cache
 from django.db import models
 from django.core.validators import RegexValidator
 from .base import BaseModel
 
 
+@lru_cache(maxsize=2048)
+def obtener_nombre_corto(nombre_completo):
+    """Extrae nombre y apellido principal del nombre completo (memorizado)"""
+    if not nombre_completo:
+        return ""
+
+    partes_nombre = nombre_completo.split()
+
+    if len(partes_nombre) == 1:
+        return partes_nombre[0]  # Solo un nombre
+    elif len(partes_nombre) == 2:
+        return f"{partes_nombre[0]} {partes_nombre[1]}"  # Nombre Apellido
+    elif len(partes_nombre) >= 3:
+        return f"{partes_nombre[0]} {partes_nombre[2]}"  # Primer_Nombre Primer_Apellido
+
+    return nombre_completo
+
+
 class Owner(BaseModel):
     """Modelo para propietarios de mascotas"""
     full_name = models.CharField(max_length=200, verbose_name="Nombre completo")
+
+    # Primer nombre + primer apellido, mantenido al guardar
+    short_name = models.CharField(
+        max_length=200,
+        blank=True,
+        editable=False,
+        verbose_name="Nombre corto"
+    )
     
     # Documento de identidad
     IDENTIFICATION_TYPES = [
@@ -44,5 +71,12 @@ class Owner(BaseModel):
         verbose_name = "Dueño"
         verbose_name_plural = "Dueños"
 
+    def save(self, *args, **kwargs):
+        self.short_name = obtener_nombre_corto(self.full_name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'full_name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'short_name'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.full_name} ({self.identification_number})"
\ No newline at end of file
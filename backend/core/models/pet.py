@@ -6,6 +6,16 @@ from .base import BaseModel
 from .owner import Owner
 
 
+# Promedio de días por mes usado en todos los cálculos de edad
+DIAS_POR_MES = 30.44
+
+
+def calcular_edad_meses(fecha_nacimiento, hoy=None):
+    """Edad en meses completos a partir de la fecha de nacimiento"""
+    hoy = hoy or date.today()
+    return int((hoy - fecha_nacimiento).days / DIAS_POR_MES)
+
+
 class Pet(BaseModel):
     """Modelo para mascotas"""
     name = models.CharField(max_length=100, verbose_name="Nombre de la mascota")
@@ -13,6 +23,7 @@ class Pet(BaseModel):
     breed = models.CharField(max_length=100, verbose_name="Raza")
     
     birth_date = models.DateField(
+        db_index=True,
         verbose_name="Fecha de nacimiento",
         help_text="Aproximada si es desconocida"
     )
@@ -75,9 +86,7 @@ class Pet(BaseModel):
     @property
     def edad_en_meses(self):
         """Calcular edad en meses"""
-        hoy = date.today()
-        diferencia_edad = hoy - self.birth_date
-        return int(diferencia_edad.days / 30.44)
+        return calcular_edad_meses(self.birth_date)
 
     @property
     def age_in_months(self):
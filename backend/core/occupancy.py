@@ -0,0 +1,152 @@
+# Ocupación por franja horaria: barrido sobre un eje de minutos de atención
+from array import array
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.utils import timezone
+
+from .archive import requiere_archivo
+from .models import AppointmentArchive, AppointmentView, Professional, Service
+
+# Horario de atención (validado en Appointment.clean): 8:00 a 16:00
+INICIO_JORNADA = 8 * 60
+FIN_JORNADA = 16 * 60
+MINUTOS_JORNADA = FIN_JORNADA - INICIO_JORNADA
+
+# Tamaños de franja que dividen la jornada en partes iguales
+FRANJAS_PERMITIDAS = (15, 30, 60)
+
+
+class EjeMinutos:
+    """Minutos de atención de un rango de días, concatenados en un solo eje.
+
+    El minuto i del eje corresponde al día i // MINUTOS_JORNADA, a las
+    INICIO_JORNADA + i % MINUTOS_JORNADA. Los intervalos se acumulan en un
+    arreglo de diferencias y la ocupación se obtiene con dos sumas prefijas,
+    sin recorrer los minutos de cada cita en Python.
+    """
+
+    def __init__(self, inicio, dias, minutos_franja):
+        self.inicio = inicio
+        self.dias = dias
+        self.minutos_franja = minutos_franja
+        self.longitud = dias * MINUTOS_JORNADA
+
+    def intervalo(self, fecha, duracion):
+        """(desde, hasta) en el eje, recortado a la jornada del día; None si queda fuera"""
+        local = timezone.localtime(fecha)
+        dia = (local.date() - self.inicio).days
+        if not 0 <= dia < self.dias:
+            return None
+        minuto = local.hour * 60 + local.minute
+        desde = max(minuto, INICIO_JORNADA)
+        hasta = min(minuto + duracion, FIN_JORNADA)
+        if hasta <= desde:
+            return None
+        base = dia * MINUTOS_JORNADA - INICIO_JORNADA
+        return base + desde, base + hasta
+
+    def ocupacion(self, intervalos):
+        """Minutos-cita por franja: lista de días, cada uno con una lista de franjas"""
+        diferencias = array('l', [0]) * (self.longitud + 1)
+        for desde, hasta in intervalos:
+            diferencias[desde] += 1
+            diferencias[hasta] -= 1
+        # Citas simultáneas por minuto y, sobre eso, minutos-cita acumulados
+        acumulado = array('l', [0])
+        acumulado.extend(accumulate(accumulate(diferencias[:self.longitud])))
+        cortes = acumulado[::self.minutos_franja]
+        por_franja = [b - a for a, b in zip(cortes, cortes[1:])]
+
+        franjas_dia = MINUTOS_JORNADA // self.minutos_franja
+        return [
+            por_franja[dia * franjas_dia:(dia + 1) * franjas_dia]
+            for dia in range(self.dias)
+        ]
+
+
+def etiquetas_franjas(minutos_franja):
+    return [
+        f'{minuto // 60:02d}:{minuto % 60:02d}'
+        for minuto in range(INICIO_JORNADA, FIN_JORNADA, minutos_franja)
+    ]
+
+
+def utilizacion(minutos_por_franja, minutos_franja, capacidad):
+    """Proporción de la capacidad ocupada por franja (puede superar 1 con citas superpuestas)"""
+    total = minutos_franja * capacidad
+    return [[round(minutos / total, 3) for minutos in dia] for dia in minutos_por_franja]
+
+
+def calcular_ocupacion(inicio, fin, minutos_franja=30):
+    """Matrices de utilización por profesional y por tipo de servicio entre dos fechas.
+
+    Una consulta sobre el modelo de lectura (citas no canceladas del rango),
+    otra sobre el archivo si el rango empieza antes del horizonte, y una de
+    profesionales activos, que definen la capacidad de cada tipo.
+    """
+    eje = EjeMinutos(inicio, (fin - inicio).days + 1, minutos_franja)
+    desde = timezone.make_aware(datetime.combine(inicio, time.min))
+    rango = {
+        'appointment_date__gte': desde,
+        'appointment_date__lt': timezone.make_aware(datetime.combine(fin + timedelta(days=1), time.min)),
+    }
+    consultas = [
+        AppointmentView.objects.filter(**rango).exclude(status='cancelada').values_list(
+            'appointment_date', 'service_duration', 'assigned_professional_id',
+            'professional_name', 'service_type',
+        ),
+    ]
+    if requiere_archivo(desde):
+        # Las citas archivadas salen del modelo de lectura: mismas columnas con JOIN
+        consultas.append(AppointmentArchive.objects.filter(**rango).exclude(status='cancelada').values_list(
+            'appointment_date', 'service__duration_minutes', 'assigned_professional_id',
+            'assigned_professional__full_name', 'service__service_type',
+        ))
+
+    por_profesional = {}
+    por_tipo = {}
+    nombres = {}
+    for consulta in consultas:
+        for fecha, duracion, profesional_id, profesional_nombre, tipo in consulta.iterator(chunk_size=2000):
+            intervalo = eje.intervalo(fecha, duracion)
+            if intervalo is None:
+                continue
+            por_profesional.setdefault(profesional_id, []).append(intervalo)
+            por_tipo.setdefault(tipo, []).append(intervalo)
+            nombres[profesional_id] = profesional_nombre
+
+    activos = dict(Professional.objects.filter(is_active=True).values_list('id', 'full_name'))
+    nombres.update(activos)
+    # Los activos aparecen aunque no tengan citas; "sin asignar" solo si hay citas
+    profesionales = sorted(
+        {*activos, *por_profesional}, key=lambda id_: (id_ is None, nombres.get(id_) or '')
+    )
+    capacidad = max(len(activos), 1)
+
+    return {
+        'start': inicio,
+        'end': fin,
+        'slot_minutes': minutos_franja,
+        'slots': etiquetas_franjas(minutos_franja),
+        'days': [inicio + timedelta(days=dia) for dia in range(eje.dias)],
+        'professionals': [
+            {
+                'id': id_,
+                'name': nombres.get(id_) or 'Sin asignar',
+                'booked_minutes': sum(hasta - desde for desde, hasta in por_profesional.get(id_, ())),
+                'matrix': utilizacion(eje.ocupacion(por_profesional.get(id_, ())), minutos_franja, 1),
+            }
+            for id_ in profesionales
+        ],
+        'service_types': [
+            {
+                'type': tipo,
+                'label': etiqueta,
+                'capacity': capacidad,
+                'booked_minutes': sum(hasta - desde for desde, hasta in por_tipo.get(tipo, ())),
+                'matrix': utilizacion(eje.ocupacion(por_tipo.get(tipo, ())), minutos_franja, capacidad),
+            }
+            for tipo, etiqueta in Service.SERVICE_TYPES
+        ],
+    }
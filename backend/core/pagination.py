@@ -0,0 +1,9 @@
+# Paginación de listados grandes
+from rest_framework.pagination import PageNumberPagination
+
+
+class PaginacionCitas(PageNumberPagination):
+    """?page=N y ?page_size=M (máximo 200); respuesta {count, next, previous, results}"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,311 @@
+# Perfilado opcional por petición: consultas SQL, duplicados, serialización y render
+import cProfile
+import contextvars
+import io
+import itertools
+import pstats
+import random
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+CONFIGURACION_POR_DEFECTO = {
+    'SAMPLE_RATE': 0.0,       # fracción de peticiones perfiladas sin encabezado
+    'HEADER': 'X-Profile',    # '1' activa el perfil, 'cprofile' agrega cProfile
+    'TOKEN': '',              # X-Profile-Token con este valor autoriza X-Profile sin ser staff
+    'BUFFER_SIZE': 200,       # perfiles retenidos en memoria por proceso
+    'EXCLUDE_PATHS': ('/api/profiling/', '/api/metrics/', '/api/health/'),
+}
+
+_perfil_actual = contextvars.ContextVar('perfil_actual', default=None)
+_cprofile_lock = threading.Lock()
+_ganchos_lock = threading.Lock()
+_raiz_proyecto = str(Path(settings.BASE_DIR).resolve())
+
+
+def obtener_configuracion():
+    return {**CONFIGURACION_POR_DEFECTO, **getattr(settings, 'PROFILING', {})}
+
+
+def nombre_vista(request):
+    """Nombre de la ruta resuelta (p. ej. appointment-calendar-week) o el path si no resolvió"""
+    coincidencia = getattr(request, 'resolver_match', None)
+    if coincidencia is None:
+        return 'sin_ruta'
+    return coincidencia.view_name or coincidencia.route
+
+
+def origen_consulta():
+    """Primera línea de código del proyecto (fuera de Django y dependencias) que lanzó la consulta"""
+    for marco in reversed(traceback.extract_stack()[:-2]):
+        archivo = marco.filename
+        if archivo.startswith(_raiz_proyecto) and 'site-packages' not in archivo and not archivo.endswith('profiling.py'):
+            return f'{Path(archivo).relative_to(_raiz_proyecto)}:{marco.lineno} en {marco.name}'
+    return 'desconocido'
+
+
+class PerfilPeticion:
+    """Mediciones de una petición perfilada"""
+
+    def __init__(self, request):
+        self.id = None
+        self.metodo = request.method
+        self.path = request.get_full_path()
+        self.vista = None
+        self.estado = None
+        self.inicio = time.time()
+        self.duracion_ms = 0.0
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.tiempo_serializacion = 0.0
+        self.tiempo_render = 0.0
+        self.sql = {}
+        self.cprofile = None
+        # Las secciones de reportes pueden registrar desde hilos del pool
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def registrar_consulta(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            origen = origen_consulta()
+            if getattr(self._local, 'midiendo', False):
+                self._local.tiempo_db += duracion
+            with self._lock:
+                self.consultas += 1
+                self.tiempo_db += duracion
+                entrada = self.sql.setdefault(
+                    sql, {'count': 0, 'ms': 0.0, 'params': set(), 'origenes': set()}
+                )
+                entrada['count'] += 1
+                entrada['ms'] += duracion * 1000
+                entrada['params'].add(repr(params))
+                if len(entrada['origenes']) < 5:
+                    entrada['origenes'].add(origen)
+
+    def medir(self, atributo, funcion, *args, **kwargs):
+        """Sumar la duración de una llamada sin contar sus consultas ni llamadas anidadas"""
+        if getattr(self._local, 'midiendo', False):
+            return funcion(*args, **kwargs)
+        self._local.midiendo = True
+        self._local.tiempo_db = 0.0
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            self._local.midiendo = False
+            neto = time.perf_counter() - inicio - self._local.tiempo_db
+            with self._lock:
+                setattr(self, atributo, getattr(self, atributo) + neto)
+
+    def duplicados(self):
+        """Consultas repetidas: N+1 (mismo SQL, distintos parámetros) o idénticas"""
+        return sorted(
+            (
+                {
+                    'sql': sql,
+                    'count': datos['count'],
+                    'identicas': datos['count'] - len(datos['params']),
+                    'ms': round(datos['ms'], 2),
+                    'origenes': sorted(datos['origenes']),
+                }
+                for sql, datos in self.sql.items() if datos['count'] > 1
+            ),
+            key=lambda duplicado: -duplicado['count'],
+        )
+
+    def encabezado_server_timing(self):
+        return ', '.join([
+            f'db;dur={self.tiempo_db * 1000:.1f};desc="{self.consultas} consultas"',
+            f'ser;dur={self.tiempo_serializacion * 1000:.1f}',
+            f'render;dur={self.tiempo_render * 1000:.1f}',
+            f'total;dur={self.duracion_ms:.1f}',
+        ])
+
+    def resumen(self):
+        return {
+            'id': self.id,
+            'method': self.metodo,
+            'path': self.path,
+            'view': self.vista,
+            'status': self.estado,
+            'timestamp': self.inicio,
+            'total_ms': round(self.duracion_ms, 2),
+            'queries': self.consultas,
+            'db_ms': round(self.tiempo_db * 1000, 2),
+            'serialization_ms': round(self.tiempo_serializacion * 1000, 2),
+            'render_ms': round(self.tiempo_render * 1000, 2),
+            'duplicate_queries': sum(d['count'] - 1 for d in self.sql.values() if d['count'] > 1),
+        }
+
+    def detalle(self):
+        return {**self.resumen(), 'duplicates': self.duplicados(), 'cprofile': self.cprofile}
+
+
+class RegistroPerfiles:
+    """Búfer circular de perfiles recientes, local al proceso"""
+
+    def __init__(self, tamano):
+        self._perfiles = deque(maxlen=tamano)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def agregar(self, perfil):
+        with self._lock:
+            perfil.id = next(self._ids)
+            self._perfiles.append(perfil)
+
+    def listar(self, limite=None):
+        with self._lock:
+            perfiles = list(reversed(self._perfiles))
+        return perfiles[:limite] if limite else perfiles
+
+    def obtener(self, perfil_id):
+        with self._lock:
+            return next((p for p in self._perfiles if p.id == perfil_id), None)
+
+    def limpiar(self):
+        with self._lock:
+            self._perfiles.clear()
+
+
+registro_perfiles = RegistroPerfiles(obtener_configuracion()['BUFFER_SIZE'])
+
+
+def _medido(atributo, funcion):
+    """Envolver una función de DRF para medirla solo cuando hay un perfil activo"""
+    def envoltura(*args, **kwargs):
+        perfil = _perfil_actual.get()
+        if perfil is None:
+            return funcion(*args, **kwargs)
+        return perfil.medir(atributo, funcion, *args, **kwargs)
+    envoltura.__wrapped__ = funcion
+    return envoltura
+
+
+def _gancho_sql(execute, sql, params, many, context):
+    perfil = _perfil_actual.get()
+    if perfil is None:
+        return execute(sql, params, many, context)
+    return perfil.registrar_consulta(execute, sql, params, many, context)
+
+
+def _agregar_gancho_sql(connection, **kwargs):
+    if _gancho_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_gancho_sql)
+
+
+def instalar_ganchos():
+    """Medir SQL, Serializer.data y JSONRenderer.render.
+
+    Se instalan con la primera petición perfilada del proceso: sin perfiles
+    (SAMPLE_RATE en 0 y sin X-Profile autorizados) DRF queda intacto. Una vez
+    instalados, fuera de un perfil su costo es leer una ContextVar. Al estar
+    en cada conexión también cubren los hilos del pool de reportes, que
+    heredan el contexto de la petición.
+    """
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.serializers import BaseSerializer
+
+    with _ganchos_lock:
+        if not hasattr(JSONRenderer.render, '__wrapped__'):
+            BaseSerializer.data = property(_medido('tiempo_serializacion', BaseSerializer.data.fget))
+            JSONRenderer.render = _medido('tiempo_render', JSONRenderer.render)
+            connection_created.connect(_agregar_gancho_sql, dispatch_uid='profiling_gancho_sql')
+    # Conexiones ya abiertas de este hilo (persistentes, de antes de instalar los ganchos)
+    for conexion in connections.all(initialized_only=True):
+        _agregar_gancho_sql(conexion)
+
+
+def usuario_staff(request):
+    """Usuario staff por sesión (admin de Django) o por JWT, como IsAdminUser"""
+    from rest_framework.exceptions import APIException
+    from authentication.jwt_auth import JWTAutenticacionCacheada
+
+    usuario = getattr(request, 'user', None)
+    if usuario is not None and usuario.is_authenticated:
+        return usuario.is_staff
+    try:
+        resultado = JWTAutenticacionCacheada().authenticate(request)
+    except APIException:
+        return False
+    return resultado is not None and resultado[0].is_staff
+
+
+class PerfiladoMiddleware:
+    """Perfila peticiones marcadas con el encabezado X-Profile o elegidas por muestreo"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.configuracion = obtener_configuracion()
+        self.meta_encabezado = 'HTTP_' + self.configuracion['HEADER'].upper().replace('-', '_')
+
+    def modo(self, request):
+        """None (sin perfil), 'basico' o 'cprofile'"""
+        if request.path.startswith(tuple(self.configuracion['EXCLUDE_PATHS'])):
+            return None
+        pedido = request.META.get(self.meta_encabezado, '').lower()
+        if pedido and self.encabezado_autorizado(request):
+            return 'cprofile' if pedido == 'cprofile' else 'basico'
+        tasa = self.configuracion['SAMPLE_RATE']
+        if tasa and random.random() < tasa:
+            return 'basico'
+        return None
+
+    def encabezado_autorizado(self, request):
+        """X-Profile solo de un usuario staff o con X-Profile-Token, también con DEBUG"""
+        token = self.configuracion['TOKEN']
+        if token and request.META.get(self.meta_encabezado + '_TOKEN') == token:
+            return True
+        return usuario_staff(request)
+
+    def __call__(self, request):
+        modo = self.modo(request)
+        if modo is None:
+            return self.get_response(request)
+
+        instalar_ganchos()
+        perfil = PerfilPeticion(request)
+        marca = _perfil_actual.set(perfil)
+        inicio = time.perf_counter()
+        try:
+            if modo == 'cprofile':
+                response = self.ejecutar_con_cprofile(request, perfil)
+            else:
+                response = self.get_response(request)
+        finally:
+            _perfil_actual.reset(marca)
+
+        perfil.duracion_ms = (time.perf_counter() - inicio) * 1000
+        perfil.vista = nombre_vista(request)
+        perfil.estado = response.status_code
+        registro_perfiles.agregar(perfil)
+
+        existente = response.get('Server-Timing')
+        timing = perfil.encabezado_server_timing()
+        response['Server-Timing'] = f'{existente}, {timing}' if existente else timing
+        response['X-Profile-Id'] = str(perfil.id)
+        return response
+
+    def ejecutar_con_cprofile(self, request, perfil):
+        # Un solo cProfile a la vez por proceso; si hay otro activo se perfila sin él
+        if not _cprofile_lock.acquire(blocking=False):
+            return self.get_response(request)
+        perfilador = cProfile.Profile()
+        try:
+            response = perfilador.runcall(self.get_response, request)
+        finally:
+            _cprofile_lock.release()
+        salida = io.StringIO()
+        pstats.Stats(perfilador, stream=salida).sort_stats('cumulative').print_stats(40)
+        perfil.cprofile = salida.getvalue()
+        return response
@@ -0,0 +1,98 @@
+# Ejecución concurrente de secciones independientes de un reporte
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+def obtener_max_hilos():
+    return getattr(settings, 'REPORT_EXECUTOR', {}).get('MAX_WORKERS', 4)
+
+
+@lru_cache(maxsize=1)
+def obtener_pool(max_hilos):
+    """Pool compartido y acotado para todas las peticiones del proceso"""
+    return ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='reporte')
+
+
+class SeccionReporte:
+    def __init__(self, nombre, funcion, depende_de=()):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.depende_de = tuple(depende_de)
+
+
+class EjecutorReporte:
+    """Ejecuta secciones de reporte en paralelo respetando sus dependencias.
+
+    Cada sección recibe como argumentos nombrados los resultados de las
+    secciones de las que depende. La latencia total es la del camino más
+    lento y no la suma de todas las secciones.
+    """
+
+    def __init__(self, max_hilos=None):
+        self.max_hilos = obtener_max_hilos() if max_hilos is None else max_hilos
+        self.secciones = {}
+        self.tiempos = {}
+
+    def seccion(self, nombre, depende_de=()):
+        """Decorador para declarar una sección"""
+        def registrar(funcion):
+            self.agregar(nombre, funcion, depende_de)
+            return funcion
+        return registrar
+
+    def agregar(self, nombre, funcion, depende_de=()):
+        faltantes = [d for d in depende_de if d not in self.secciones]
+        if faltantes:
+            raise ValueError(f'La sección {nombre} depende de secciones no declaradas: {faltantes}')
+        self.secciones[nombre] = SeccionReporte(nombre, funcion, depende_de)
+
+    def _ejecutar_seccion(self, seccion, argumentos):
+        inicio = time.perf_counter()
+        try:
+            return seccion.funcion(**argumentos)
+        finally:
+            self.tiempos[seccion.nombre] = (time.perf_counter() - inicio) * 1000
+            # Los hilos del pool no pasan por el ciclo request/response
+            close_old_connections()
+
+    def ejecutar(self):
+        """Ejecutar todas las secciones y devolver {nombre: resultado}"""
+        resultados = {}
+        pendientes = dict(self.secciones)
+
+        if self.max_hilos <= 1:
+            # Orden de declaración: las dependencias siempre se declaran antes
+            for seccion in pendientes.values():
+                argumentos = {d: resultados[d] for d in seccion.depende_de}
+                inicio = time.perf_counter()
+                resultados[seccion.nombre] = seccion.funcion(**argumentos)
+                self.tiempos[seccion.nombre] = (time.perf_counter() - inicio) * 1000
+            return resultados
+
+        pool = obtener_pool(self.max_hilos)
+        en_curso = {}
+        while pendientes or en_curso:
+            for nombre, seccion in list(pendientes.items()):
+                if all(d in resultados for d in seccion.depende_de):
+                    argumentos = {d: resultados[d] for d in seccion.depende_de}
+                    # Copiar el contexto para que el perfilado y las métricas sigan a la sección
+                    contexto = contextvars.copy_context()
+                    en_curso[pool.submit(contexto.run, self._ejecutar_seccion, seccion, argumentos)] = nombre
+                    del pendientes[nombre]
+
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                resultados[en_curso.pop(futuro)] = futuro.result()
+
+        return resultados
+
+    def encabezado_tiempos(self):
+        """Valor para el encabezado Server-Timing"""
+        return ', '.join(
+            f'{nombre};dur={duracion:.1f}' for nombre, duracion in self.tiempos.items()
+        )
@@ -0,0 +1,115 @@
+# Sugerencia de horarios libres: barrido de intervalos ocupados fusionados
+import heapq
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import AppointmentView
+from .occupancy import INICIO_JORNADA, FIN_JORNADA
+
+MINUTOS_DIA = 24 * 60
+
+
+def fusionar(intervalos):
+    """Ordenar y unir intervalos (desde, hasta) que se superponen o se tocan"""
+    fusionados = []
+    for desde, hasta in sorted(intervalos):
+        if fusionados and desde <= fusionados[-1][1]:
+            if hasta > fusionados[-1][1]:
+                fusionados[-1][1] = hasta
+        else:
+            fusionados.append([desde, hasta])
+    return fusionados
+
+
+def inicios_libres(ocupados, dias, duracion, paso, desde_minimo=0):
+    """Generar, en orden, los minutos de inicio donde cabe una cita de `duracion`.
+
+    Los minutos se cuentan desde la medianoche del primer día. Los inicios se
+    alinean a `paso` minutos desde el comienzo de la jornada y la cita debe
+    terminar dentro de ella. `ocupados` es una lista fusionada y ordenada.
+    """
+    indice = 0
+    for dia in range(dias):
+        apertura = dia * MINUTOS_DIA + INICIO_JORNADA
+        cierre = dia * MINUTOS_DIA + FIN_JORNADA
+        candidato = apertura
+        if candidato < desde_minimo:
+            candidato = apertura + -(-(desde_minimo - apertura) // paso) * paso
+        # Saltar los intervalos que terminan antes del candidato
+        while indice < len(ocupados) and ocupados[indice][1] <= candidato:
+            indice += 1
+        while candidato + duracion <= cierre:
+            if indice < len(ocupados) and ocupados[indice][0] < candidato + duracion:
+                # Choca con una cita: continuar en el primer inicio alineado tras ella
+                fin_ocupado = ocupados[indice][1]
+                candidato += -(-(fin_ocupado - candidato) // paso) * paso
+                indice += 1
+                while indice < len(ocupados) and ocupados[indice][1] <= candidato:
+                    indice += 1
+                continue
+            yield candidato
+            candidato += paso
+
+
+def _etiquetar(inicios, id_):
+    return ((minuto, id_) for minuto in inicios)
+
+
+def sugerir_horarios(servicio, profesionales, inicio, fin, cantidad=5, paso=15):
+    """Los primeros `cantidad` inicios factibles para el servicio entre dos fechas.
+
+    `profesionales` es un dict {id: nombre}; cada inicio indica qué
+    profesionales están libres durante toda la duración del servicio. Se hace
+    una sola consulta de rango sobre el modelo de lectura. Si no hay
+    profesionales activos, la clínica se trata como un único recurso y
+    cualquier cita la ocupa; en otro caso las citas sin profesional asignado
+    no bloquean horarios.
+    """
+    medianoche = datetime.combine(inicio, time.min)
+    dias = (fin - inicio).days + 1
+    citas = AppointmentView.objects.filter(
+        appointment_date__gte=timezone.make_aware(medianoche),
+        appointment_date__lt=timezone.make_aware(medianoche + timedelta(days=dias)),
+    ).exclude(status='cancelada')
+    if profesionales:
+        citas = citas.filter(assigned_professional_id__in=list(profesionales))
+
+    ocupados = {id_: [] for id_ in profesionales} if profesionales else {None: []}
+    for fecha, duracion, profesional_id in citas.values_list(
+        'appointment_date', 'service_duration', 'assigned_professional_id'
+    ):
+        local = timezone.localtime(fecha)
+        minuto = (local.date() - inicio).days * MINUTOS_DIA + local.hour * 60 + local.minute
+        ocupados[profesional_id if profesionales else None].append((minuto, minuto + duracion))
+
+    # No sugerir horarios ya pasados
+    ahora = timezone.localtime()
+    desde_minimo = (ahora.date() - inicio).days * MINUTOS_DIA + ahora.hour * 60 + ahora.minute + 1
+
+    # Mezclar los inicios de cada recurso en orden y agrupar los que coinciden
+    generadores = [
+        _etiquetar(
+            inicios_libres(fusionar(intervalos), dias, servicio.duration_minutes, paso, desde_minimo), id_
+        )
+        for id_, intervalos in ocupados.items()
+    ]
+    sugerencias = []
+    for minuto, id_ in heapq.merge(*generadores, key=lambda par: par[0]):
+        if sugerencias and sugerencias[-1][0] == minuto:
+            sugerencias[-1][1].append(id_)
+            continue
+        if len(sugerencias) == cantidad:
+            break
+        sugerencias.append((minuto, [id_]))
+
+    return [
+        {
+            'start': timezone.make_aware(medianoche + timedelta(minutes=minuto)),
+            'end': timezone.make_aware(medianoche + timedelta(minutes=minuto + servicio.duration_minutes)),
+            'professionals': [
+                {'id': id_, 'name': profesionales[id_]} for id_ in ids if id_ is not None
+            ],
+        }
+        for minuto, ids in sugerencias
+    ]
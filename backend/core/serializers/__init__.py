@@ -1,9 +1,14 @@
 # Importar todos los serializers para mantener compatibilidad con el código existente
 from .professional import SerializadorProfesional
 from .owner import SerializadorPropietario
-from .pet import SerializadorMascota
-from .service import SerializadorServicio
-from .appointment import SerializadorCita, SerializadorCitaCalendario
+from .pet import SerializadorMascota, ContextoEdad
+from .service import SerializadorServicio, SerializadorServicioEstadisticas
+from .appointment import (
+    SerializadorCita,
+    SerializadorCitaCalendario,
+    SerializadorCitaLectura,
+    SerializadorCitaCalendarioLectura,
+)
 from .mixins import MixinNombreCorto, MixinValidacion
 
 # Aliases para compatibilidad con código existente
@@ -11,8 +16,11 @@ ProfessionalSerializer = SerializadorProfesional
 OwnerSerializer = SerializadorPropietario
 PetSerializer = SerializadorMascota
 ServiceSerializer = SerializadorServicio
+ServiceStatsSerializer = SerializadorServicioEstadisticas
 AppointmentSerializer = SerializadorCita
 AppointmentCalendarSerializer = SerializadorCitaCalendario
+AppointmentReadSerializer = SerializadorCitaLectura
+AppointmentCalendarReadSerializer = SerializadorCitaCalendarioLectura
 ShortNameMixin = MixinNombreCorto
 ValidationMixin = MixinValidacion
 
@@ -22,17 +30,24 @@ __all__ = [
     'SerializadorPropietario',
     'SerializadorMascota', 
     'SerializadorServicio',
+    'SerializadorServicioEstadisticas',
     'SerializadorCita',
     'SerializadorCitaCalendario',
+    'SerializadorCitaLectura',
+    'SerializadorCitaCalendarioLectura',
     'MixinNombreCorto',
     'MixinValidacion',
+    'ContextoEdad',
     # Aliases para compatibilidad
     'ProfessionalSerializer',
     'OwnerSerializer',
     'PetSerializer', 
     'ServiceSerializer',
+    'ServiceStatsSerializer',
     'AppointmentSerializer',
     'AppointmentCalendarSerializer',
+    'AppointmentReadSerializer',
+    'AppointmentCalendarReadSerializer',
     'ShortNameMixin',
     'ValidationMixin'
 ]
\ No newline at end of file
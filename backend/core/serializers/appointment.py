@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from datetime import timedelta
 from django.utils import timezone
-from ..models import Appointment
+from ..models import Appointment, AppointmentView
 from .mixins import MixinNombreCorto
 
 
@@ -84,7 +84,7 @@ class SerializadorCitaCalendario(MixinNombreCorto, serializers.ModelSerializer):
             'pet_name', 'service_name', 'professional_name', 'owner_name',
             'appointment_date', 'status', 'duration_display', 'reason', 'instructions', 
             'observations', 'medication_type', 'medication_dosage', 'pet', 'service', 
-            'assigned_professional'
+            'assigned_professional', 'actual_start_time', 'actual_end_time'
         ]
 
     def get_titulo(self, obj):
@@ -92,8 +92,61 @@ class SerializadorCitaCalendario(MixinNombreCorto, serializers.ModelSerializer):
     
     def get_nombre_propietario(self, obj):
         """Extraer primer nombre + primer apellido del dueño"""
-        return self.obtener_nombre_corto_desde_completo(obj.pet.owner.full_name)
+        return self.nombre_corto_de(obj.pet.owner)
     
     def get_owner_name(self, obj):
         """Alias para compatibilidad con frontend"""
-        return self.get_nombre_propietario(obj)
\ No newline at end of file
+        return self.get_nombre_propietario(obj)
+
+class SerializadorCitaLectura(serializers.ModelSerializer):
+    """Misma representación que SerializadorCita, leída del modelo desnormalizado"""
+    id = serializers.IntegerField(source='appointment_id', read_only=True)
+    nombre_mascota = serializers.CharField(source='pet_name', read_only=True)
+    raza_mascota = serializers.CharField(source='pet_breed', read_only=True)
+    nombre_propietario = serializers.CharField(source='owner_name', read_only=True)
+    telefono_propietario = serializers.CharField(source='owner_phone', read_only=True)
+    nombre_servicio = serializers.CharField(source='service_name', read_only=True)
+    duracion_servicio = serializers.IntegerField(source='service_duration', read_only=True)
+    nombre_profesional = serializers.CharField(source='professional_name', read_only=True)
+    estado_mostrar = serializers.CharField(source='get_status_display', read_only=True)
+    duracion_mostrar = serializers.CharField(read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = AppointmentView
+        fields = [
+            'id', 'pet', 'nombre_mascota', 'raza_mascota', 'nombre_propietario', 'telefono_propietario',
+            'service', 'nombre_servicio', 'duracion_servicio', 'assigned_professional', 'nombre_profesional',
+            'pet_name', 'pet_breed', 'owner_name', 'owner_phone', 'service_name', 'service_duration', 'professional_name', 'status_display',
+            'appointment_date', 'reason', 'status', 'estado_mostrar',
+            'medication_type', 'medication_dosage', 'instructions', 'observations',
+            'actual_start_time', 'actual_end_time', 'duracion_mostrar',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class SerializadorCitaCalendarioLectura(serializers.ModelSerializer):
+    """Misma representación que SerializadorCitaCalendario, leída del modelo desnormalizado"""
+    id = serializers.IntegerField(source='appointment_id', read_only=True)
+    titulo = serializers.SerializerMethodField()
+    nombre_mascota = serializers.CharField(source='pet_name', read_only=True)
+    nombre_servicio = serializers.CharField(source='service_name', read_only=True)
+    nombre_profesional = serializers.CharField(source='professional_name', read_only=True)
+    nombre_propietario = serializers.CharField(source='owner_short_name', read_only=True)
+    owner_name = serializers.CharField(source='owner_short_name', read_only=True)
+    duration_display = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = AppointmentView
+        fields = [
+            'id', 'titulo', 'nombre_mascota', 'nombre_servicio', 'nombre_profesional', 'nombre_propietario',
+            'pet_name', 'service_name', 'professional_name', 'owner_name',
+            'appointment_date', 'status', 'duration_display', 'reason', 'instructions',
+            'observations', 'medication_type', 'medication_dosage', 'pet', 'service',
+            'assigned_professional', 'actual_start_time', 'actual_end_time'
+        ]
+        read_only_fields = fields
+
+    def get_titulo(self, obj):
+        return f"{obj.pet_name} - {obj.service_name}"
@@ -1,27 +1,18 @@
 from rest_framework import serializers
+from ..models.owner import obtener_nombre_corto
 
 
 class MixinNombreCorto:
     """Mixin para generar nombres cortos (primer nombre + primer apellido)"""
-    
+
     @staticmethod
     def obtener_nombre_corto_desde_completo(nombre_completo):
         """Extrae nombre y apellido principal del nombre completo"""
-        if not nombre_completo:
-            return ""
-            
-        partes_nombre = nombre_completo.split()
-        
-        if len(partes_nombre) == 1:
-            return partes_nombre[0]  # Solo un nombre
-        elif len(partes_nombre) == 2:
-            return f"{partes_nombre[0]} {partes_nombre[1]}"  # Nombre Apellido
-        elif len(partes_nombre) == 3:
-            return f"{partes_nombre[0]} {partes_nombre[2]}"  # Primer_Nombre Primer_Apellido
-        elif len(partes_nombre) >= 4:
-            return f"{partes_nombre[0]} {partes_nombre[2]}"  # Primer_Nombre Primer_Apellido
-        
-        return nombre_completo
+        return obtener_nombre_corto(nombre_completo)
+
+    def nombre_corto_de(self, propietario):
+        """Usa la columna persistida y recurre al cálculo memorizado si está vacía"""
+        return propietario.short_name or self.obtener_nombre_corto_desde_completo(propietario.full_name)
 
 
 class MixinValidacion:
@@ -17,11 +17,15 @@ class SerializadorPropietario(MixinNombreCorto, MixinValidacion, serializers.Mod
         read_only_fields = ['id', 'created_at', 'updated_at', 'cantidad_mascotas', 'nombre_corto']
 
     def get_cantidad_mascotas(self, obj):
+        # Reutilizar el conteo anotado por los reportes cuando está disponible
+        anotado = getattr(obj, 'pets_count', None)
+        if anotado is not None:
+            return anotado
         return obj.pets.filter(is_active=True).count()
     
     def get_nombre_corto(self, obj):
         """Extraer primer nombre + primer apellido del dueño"""
-        return self.obtener_nombre_corto_desde_completo(obj.full_name)
+        return self.nombre_corto_de(obj)
 
     def validate_identification_number(self, valor):
         """Validación específica para número de identificación"""
@@ -1,9 +1,60 @@
 from rest_framework import serializers
-from datetime import date
+from datetime import date, timedelta
+from math import ceil
 from ..models import Pet
+from ..models.pet import DIAS_POR_MES, calcular_edad_meses
 from .mixins import MixinNombreCorto
 
 
+class ContextoEdad:
+    """Contexto de edad por petición: fija la fecha de hoy una sola vez y memoriza resultados"""
+
+    def __init__(self, hoy=None):
+        self.hoy = hoy or date.today()
+        self._meses_por_fecha = {}
+        self._textos_por_meses = {}
+
+    def edad_meses(self, fecha_nacimiento):
+        """Edad en meses, memorizada por fecha de nacimiento"""
+        meses = self._meses_por_fecha.get(fecha_nacimiento)
+        if meses is None:
+            meses = calcular_edad_meses(fecha_nacimiento, self.hoy)
+            self._meses_por_fecha[fecha_nacimiento] = meses
+        return meses
+
+    def edad_mostrar(self, fecha_nacimiento):
+        """Edad en formato amigable, memorizada por cantidad de meses"""
+        meses = self.edad_meses(fecha_nacimiento)
+        texto = self._textos_por_meses.get(meses)
+        if texto is None:
+            texto = self.formatear_edad(meses)
+            self._textos_por_meses[meses] = texto
+        return texto
+
+    @staticmethod
+    def formatear_edad(meses):
+        if meses < 12:
+            return f"{meses} meses"
+        años = meses // 12
+        meses_restantes = meses % 12
+        if meses_restantes == 0:
+            return f"{años} año{'s' if años > 1 else ''}"
+        return f"{años} año{'s' if años > 1 else ''} y {meses_restantes} meses"
+
+    def filtros_nacimiento(self, edad_minima=None, edad_maxima=None):
+        """Traducir un rango de edad en meses a filtros sobre birth_date (usa el índice)"""
+        filtros = {}
+        if edad_minima is not None:
+            # edad >= minima  <=>  días >= ceil(minima * DIAS_POR_MES)
+            dias = ceil(edad_minima * DIAS_POR_MES)
+            filtros['birth_date__lte'] = self.hoy - timedelta(days=dias)
+        if edad_maxima is not None:
+            # edad <= maxima  <=>  días < (maxima + 1) * DIAS_POR_MES
+            dias = ceil((edad_maxima + 1) * DIAS_POR_MES) - 1
+            filtros['birth_date__gte'] = self.hoy - timedelta(days=dias)
+        return filtros
+
+
 class SerializadorMascota(MixinNombreCorto, serializers.ModelSerializer):
     nombre_propietario = serializers.CharField(source='owner.full_name', read_only=True)
     telefono_propietario = serializers.CharField(source='owner.phone', read_only=True)
@@ -31,32 +82,29 @@ class SerializadorMascota(MixinNombreCorto, serializers.ModelSerializer):
             'edad_meses', 'edad_mostrar', 'created_at', 'updated_at'
         ]
 
+    @property
+    def contexto_edad(self):
+        """Contexto de edad compartido por todas las filas de la petición"""
+        contexto = self.context.get('contexto_edad')
+        if contexto is None:
+            contexto = self.context['contexto_edad'] = ContextoEdad()
+        return contexto
+
     def get_edad_meses(self, obj):
         """Calcular edad en meses"""
-        hoy = date.today()
-        diferencia_edad = hoy - obj.birth_date
-        return int(diferencia_edad.days / 30.44)
+        return self.contexto_edad.edad_meses(obj.birth_date)
 
     def get_edad_mostrar(self, obj):
         """Mostrar edad en formato amigable"""
-        meses = self.get_edad_meses(obj)
-        if meses < 12:
-            return f"{meses} meses"
-        else:
-            años = meses // 12
-            meses_restantes = meses % 12
-            if meses_restantes == 0:
-                return f"{años} año{'s' if años > 1 else ''}"
-            else:
-                return f"{años} año{'s' if años > 1 else ''} y {meses_restantes} meses"
-                
+        return self.contexto_edad.edad_mostrar(obj.birth_date)
+
     def get_nombre_corto_propietario(self, obj):
         """Extraer primer nombre + primer apellido del dueño"""
-        return self.obtener_nombre_corto_desde_completo(obj.owner.full_name)
-    
+        return self.nombre_corto_de(obj.owner)
+
     def get_owner_short_name(self, obj):
-        """Alias para compatibilidad con frontend - extraer primer nombre + primer apellido del dueño"""
-        return self.obtener_nombre_corto_desde_completo(obj.owner.full_name)
+        """Alias para compatibilidad con frontend"""
+        return self.get_nombre_corto_propietario(obj)
 
     def validate_birth_date(self, valor):
         """Validar fecha de nacimiento"""
@@ -12,4 +12,19 @@ class SerializadorServicio(serializers.ModelSerializer):
             'duration_minutes', 'price', 'requires_medication', 'default_instructions',
             'is_active', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at', 'tipo_servicio_mostrar']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'tipo_servicio_mostrar']
+
+
+class SerializadorServicioEstadisticas(SerializadorServicio):
+    """Servicio con las métricas calculadas por el reporte de servicios"""
+    appointments_count = serializers.IntegerField(read_only=True)
+    cancelled_count = serializers.IntegerField(read_only=True)
+    total_revenue = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    avg_appointments_per_month = serializers.FloatField(read_only=True)
+    cancellation_rate = serializers.FloatField(read_only=True)
+
+    class Meta(SerializadorServicio.Meta):
+        fields = SerializadorServicio.Meta.fields + [
+            'appointments_count', 'cancelled_count', 'total_revenue',
+            'avg_appointments_per_month', 'cancellation_rate'
+        ]
@@ -0,0 +1,90 @@
+# Sincronización del modelo de lectura de citas y de cachés derivadas
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Appointment, AppointmentView, Owner, Pet, Service, Professional
+from .models.owner import obtener_nombre_corto
+from . import analytics, form_bootstrap
+
+
+@receiver(post_save, sender=Appointment)
+def sincronizar_cita(sender, instance, raw=False, **kwargs):
+    """Regenerar la fila de lectura de la cita guardada"""
+    if raw:
+        return
+    AppointmentView.objects.sincronizar([instance.pk])
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def invalidar_acumulados_cita(sender, instance, **kwargs):
+    """Acumulados diarios de reportes (core/analytics.py) del día de la cita"""
+    analytics.invalidar_cita(instance)
+
+
+@receiver(post_save, sender=Pet)
+def sincronizar_mascota(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    propietario = instance.owner
+    AppointmentView.objects.filter(pet_id=instance.pk).update(
+        pet_name=instance.name,
+        pet_breed=instance.breed,
+        owner_id=propietario.pk,
+        owner_name=propietario.full_name,
+        owner_short_name=propietario.short_name or obtener_nombre_corto(propietario.full_name),
+        owner_phone=propietario.phone,
+    )
+
+
+@receiver(post_save, sender=Owner)
+def sincronizar_propietario(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    AppointmentView.objects.filter(owner_id=instance.pk).update(
+        owner_name=instance.full_name,
+        owner_short_name=instance.short_name,
+        owner_phone=instance.phone,
+    )
+
+
+@receiver(post_save, sender=Service)
+def sincronizar_servicio(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    AppointmentView.objects.filter(service_id=instance.pk).update(
+        service_name=instance.name,
+        service_type=instance.service_type,
+        service_duration=instance.duration_minutes,
+    )
+
+
+@receiver(post_save, sender=Professional)
+def sincronizar_profesional(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    AppointmentView.objects.filter(assigned_professional_id=instance.pk).update(
+        professional_name=instance.full_name,
+    )
+
+
+@receiver(post_delete, sender=Professional)
+def desasignar_profesional(sender, instance, **kwargs):
+    """Las citas quedan sin profesional (SET_NULL) sin pasar por save()"""
+    AppointmentView.objects.filter(assigned_professional_id=instance.pk).update(
+        assigned_professional=None,
+        professional_name=None,
+    )
+
+
+@receiver(post_save, sender=Pet)
+@receiver(post_delete, sender=Pet)
+@receiver(post_save, sender=Owner)
+@receiver(post_delete, sender=Owner)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Professional)
+@receiver(post_delete, sender=Professional)
+def invalidar_formulario_cita(sender, **kwargs):
+    """Nueva versión (y ETag) de los datos del formulario de citas"""
+    form_bootstrap.invalidar()
@@ -0,0 +1,281 @@
+import io
+import shutil
+import tempfile
+import time
+from datetime import datetime, date
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections, transaction
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import CustomUser
+from core import analytics
+from core.db import pool as modulo_pool
+from core.db.backends.sqlite_pool.base import DatabaseWrapper as DatabaseWrapperPool
+from core.importing import ImportadorPropietariosMascotas
+from core.models import Owner, Pet, Service, Appointment, AppointmentArchive, Professional
+
+
+def fecha_local(anio, mes, dia, hora=10):
+    return timezone.make_aware(datetime(anio, mes, dia, hora))
+
+
+class ReporteServiciosTests(TestCase):
+    """services_report: conteos, ingresos, cancelaciones, promedio mensual y resumen por tipo"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = CustomUser.objects.create_user('admin', password='clave-segura-123', role='admin', is_staff=True)
+        propietario = Owner.objects.create(
+            full_name='Juan Carlos Perez Lopez', identification_number='0912345678',
+            address='Guayaquil', phone='0987654321'
+        )
+        mascota = Pet.objects.create(
+            name='Firulais', breed='Labrador', birth_date=date(2020, 1, 1), gender='M',
+            color='Negro', weight=20, owner=propietario
+        )
+        cls.bano = Service.objects.create(
+            name='Baño Normal', service_type='baño_normal', price=10, duration_minutes=45
+        )
+        cls.bano_grande = Service.objects.create(
+            name='Baño Raza Grande', service_type='baño_normal', price=20, duration_minutes=60
+        )
+        cls.desparasitacion = Service.objects.create(
+            name='Desparasitación', service_type='desparasitacion', price=30, duration_minutes=30,
+            requires_medication=True
+        )
+
+        # Citas pasadas: bulk_create evita la validación de antigüedad de Appointment.clean
+        citas = [
+            (cls.bano, fecha_local(2026, 1, 15), 'realizada', '10'),
+            (cls.bano, fecha_local(2026, 2, 10), 'realizada', '10'),
+            (cls.bano, fecha_local(2026, 3, 5), 'cancelada', '10'),
+            # El ingreso usa el precio cobrado, no el precio vigente del servicio
+            (cls.bano_grande, fecha_local(2026, 3, 20), 'realizada', '25'),
+            (cls.bano_grande, fecha_local(2026, 3, 21), 'cancelada', '20'),
+        ]
+        Appointment.objects.bulk_create([
+            Appointment(
+                pet=mascota, service=servicio, appointment_date=fecha, status=estado,
+                price_charged=Decimal(precio), created_by=cls.usuario
+            )
+            for servicio, fecha, estado, precio in citas
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+        caches[analytics.obtener_configuracion()['CACHE']].clear()
+
+    def reporte(self, **parametros):
+        respuesta = self.client.get('/api/reports/services_report/', parametros)
+        self.assertEqual(respuesta.status_code, 200)
+        return {servicio['id']: servicio for servicio in respuesta.data['services_performance']}, {
+            tipo['service_type']: tipo for tipo in respuesta.data['by_type']
+        }
+
+    def test_conteo_por_servicio(self):
+        servicios, _ = self.reporte()
+        self.assertEqual(servicios[self.bano.id]['appointments_count'], 3)
+        self.assertEqual(servicios[self.bano.id]['cancelled_count'], 1)
+        self.assertEqual(servicios[self.bano_grande.id]['appointments_count'], 2)
+        self.assertEqual(servicios[self.desparasitacion.id]['appointments_count'], 0)
+
+    def test_ingresos_excluyen_canceladas(self):
+        servicios, _ = self.reporte()
+        self.assertEqual(Decimal(servicios[self.bano.id]['total_revenue']), Decimal('20'))
+        self.assertEqual(Decimal(servicios[self.bano_grande.id]['total_revenue']), Decimal('25'))
+        self.assertEqual(Decimal(servicios[self.desparasitacion.id]['total_revenue']), Decimal('0'))
+
+    def test_tasa_de_cancelacion(self):
+        servicios, _ = self.reporte()
+        self.assertAlmostEqual(servicios[self.bano.id]['cancellation_rate'], 0.3333)
+        self.assertAlmostEqual(servicios[self.bano_grande.id]['cancellation_rate'], 0.5)
+        self.assertEqual(servicios[self.desparasitacion.id]['cancellation_rate'], 0)
+
+    def test_promedio_mensual(self):
+        servicios, _ = self.reporte()
+        # Enero a marzo: 3 citas en 3 meses; las de marzo caen en un solo mes
+        self.assertEqual(servicios[self.bano.id]['avg_appointments_per_month'], 1.0)
+        self.assertEqual(servicios[self.bano_grande.id]['avg_appointments_per_month'], 2.0)
+        self.assertEqual(servicios[self.desparasitacion.id]['avg_appointments_per_month'], 0)
+
+    def test_resumen_por_tipo(self):
+        _, por_tipo = self.reporte()
+        bano = por_tipo['baño_normal']
+        self.assertEqual(bano['count'], 5)
+        self.assertEqual(bano['revenue'], Decimal('45'))
+        self.assertAlmostEqual(bano['cancellation_rate'], 0.4)
+        self.assertAlmostEqual(bano['avg_appointments_per_month'], 1.67)
+        self.assertEqual(por_tipo['desparasitacion']['count'], 0)
+        self.assertEqual(por_tipo['desparasitacion']['cancellation_rate'], 0)
+
+    def test_motor_en_memoria_coincide_con_sql(self):
+        rango = {'start_date': '2026-01-01', 'end_date': '2026-03-31'}
+        self.assertEqual(self.reporte(engine='sql', **rango), self.reporte(engine='memory', **rango))
+
+    def test_resumen_de_citas_excluye_canceladas_de_ingresos(self):
+        rango = {'start_date': '2026-01-01', 'end_date': '2026-03-31'}
+        servicios, _ = self.reporte(**rango)
+        for motor in ('sql', 'memory'):
+            respuesta = self.client.get('/api/reports/appointments_summary/', {'engine': motor, **rango})
+            self.assertEqual(respuesta.status_code, 200)
+            ingresos = {fila['service__name']: fila['total_revenue'] for fila in respuesta.data['by_service']}
+            self.assertEqual(Decimal(ingresos['Baño Normal']), Decimal(servicios[self.bano.id]['total_revenue']), motor)
+            self.assertEqual(Decimal(ingresos['Baño Raza Grande']), Decimal(servicios[self.bano_grande.id]['total_revenue']), motor)
+
+
+class ImportacionCsvTests(TestCase):
+    """import_csv: nada queda guardado ante un error de codificación; un CSV ilegible no es un 500"""
+
+    ENCABEZADO = 'identification_number,full_name,address,phone,pet_name,breed,birth_date,gender,color,weight\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = CustomUser.objects.create_user('admin', password='clave-segura-123', role='admin', is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+
+    def filas(self, cantidad, desde=0):
+        return ''.join(
+            f'09{indice:08d},Dueño {indice} Perez,Guayaquil,0987654321,Mascota {indice},Mestizo,2020-01-01,M,Negro,10\n'
+            for indice in range(desde, desde + cantidad)
+        ).encode('utf-8')
+
+    def importar(self, contenido):
+        return self.client.post(
+            '/api/owners/import_csv/',
+            {'file': SimpleUploadedFile('datos.csv', contenido, content_type='text/csv')},
+            format='multipart',
+        )
+
+    def test_byte_invalido_al_final_no_importa_nada(self):
+        contenido = self.ENCABEZADO.encode('utf-8') + self.filas(1500) + b'0900000000,Mal \xff,x,0987654321\n'
+        respuesta = self.importar(contenido)
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('línea 1502', respuesta.data['error'])
+        self.assertFalse(Owner.objects.exists())
+
+    def test_csv_mal_formado_informa_la_fila(self):
+        contenido = (
+            self.ENCABEZADO.encode('utf-8') + self.filas(3)
+            + f'0911111111,"{"x" * 200000}",x,0987654321\n'.encode('utf-8') + self.filas(2, desde=3)
+        )
+        respuesta = self.importar(contenido)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data['owners_created'], 3)
+        self.assertEqual(respuesta.data['errors'][0]['row'], 5)
+
+    def test_bloques_pequenos_importan_todas_las_filas(self):
+        archivo = io.StringIO(self.ENCABEZADO + self.filas(7).decode('utf-8'))
+        resultado = ImportadorPropietariosMascotas(tamano_bloque=3).importar(archivo)
+        self.assertEqual((resultado.filas, resultado.propietarios_creados, resultado.mascotas_creadas), (7, 7, 7))
+
+
+class OcupacionArchivoTests(TestCase):
+    """occupancy combina las citas archivadas cuando el rango empieza antes del horizonte"""
+
+    def test_rango_archivado_cuenta_las_citas(self):
+        usuario = CustomUser.objects.create_user('admin', password='clave-segura-123', role='admin', is_staff=True)
+        propietario = Owner.objects.create(
+            full_name='Ana Perez', identification_number='0912345678', address='Guayaquil', phone='0987654321'
+        )
+        mascota = Pet.objects.create(
+            name='Luna', breed='Pug', birth_date=date(2018, 1, 1), gender='F', color='Café', weight=8, owner=propietario
+        )
+        servicio = Service.objects.create(name='Peluquería', service_type='peluqueria', price=20, duration_minutes=60)
+        profesional = Professional.objects.create(full_name='Dra Ana', specialty='Estética')
+        fecha = fecha_local(2022, 3, 10)
+        AppointmentArchive.objects.create(
+            id=1, pet=mascota, service=servicio, assigned_professional=profesional, appointment_date=fecha,
+            status='realizada', created_at=fecha, updated_at=fecha,
+        )
+
+        cliente = APIClient()
+        cliente.force_authenticate(usuario)
+        respuesta = cliente.get('/api/reports/occupancy/', {'start': '2022-03-10', 'end': '2022-03-10'})
+        self.assertEqual(respuesta.status_code, 200)
+        por_id = {fila['id']: fila for fila in respuesta.data['professionals']}
+        self.assertEqual(por_id[profesional.id]['booked_minutes'], 60)
+        peluqueria = next(tipo for tipo in respuesta.data['service_types'] if tipo['type'] == 'peluqueria')
+        self.assertEqual(peluqueria['booked_minutes'], 60)
+
+
+class PoolConexionesTests(SimpleTestCase):
+    """Pool de core.db.pool con el backend sqlite_pool sobre una base en archivo"""
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.alias = f'pool-{self._testMethodName}'
+
+    def tearDown(self):
+        pool = modulo_pool._pools.pop(self.alias, None)
+        if pool is not None:
+            pool.cerrar_libres()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def wrapper(self, **pool):
+        # configure_settings completa las claves por defecto (y exige un alias 'default')
+        configuracion = connections.configure_settings({'default': {}, self.alias: {
+            'ENGINE': 'core.db.backends.sqlite_pool',
+            'NAME': f'{self.directorio}/db.sqlite3',
+            'POOL': {'MAX_SIZE': 1, 'TIMEOUT': 0.1, 'MAX_IDLE': 60, **pool},
+        }})[self.alias]
+        return DatabaseWrapperPool(configuracion, self.alias)
+
+    def test_reutiliza_la_conexion_tras_close(self):
+        primero = self.wrapper()
+        primero.ensure_connection()
+        conexion = primero.connection
+        primero.close()
+
+        segundo = self.wrapper()
+        segundo.ensure_connection()
+        self.assertIs(segundo.connection, conexion)
+        self.assertEqual(segundo.pool.resumen(), {'created': 1, 'reused': 1, 'discarded': 0, 'timeout': 0})
+        segundo.close()
+
+    def test_espera_agotada_lanza_operational_error(self):
+        ocupado = self.wrapper()
+        ocupado.ensure_connection()
+
+        with self.assertRaises(OperationalError):
+            self.wrapper().ensure_connection()
+        self.assertEqual(ocupado.pool.resumen()['timeout'], 1)
+        ocupado.close()
+
+    def test_descarta_la_conexion_cerrada_dentro_de_atomic(self):
+        wrapper = self.wrapper()
+        connections[self.alias] = wrapper
+        try:
+            with transaction.atomic(using=self.alias):
+                wrapper.ensure_connection()
+                wrapper.close()
+        finally:
+            del connections[self.alias]
+
+        self.assertEqual(wrapper.pool.resumen()['discarded'], 1)
+        otro = self.wrapper()
+        otro.ensure_connection()
+        self.assertEqual(otro.pool.resumen()['created'], 2)
+        otro.close()
+
+    def test_descarta_conexiones_libres_tras_max_idle(self):
+        primero = self.wrapper(MAX_IDLE=0.05)
+        primero.ensure_connection()
+        conexion = primero.connection
+        primero.close()
+        time.sleep(0.1)
+
+        segundo = self.wrapper()
+        segundo.ensure_connection()
+        self.assertIsNot(segundo.connection, conexion)
+        self.assertEqual(segundo.pool.resumen(), {'created': 2, 'reused': 0, 'discarded': 1, 'timeout': 0})
+        segundo.close()
@@ -8,7 +8,10 @@ from .views import (
     ProfessionalViewSet,
     ReportsViewSet,
     StatusView,
+    PerfilesView,
+    PerfilDetalleView,
 )
+from .views import async_views, health
 
 router = DefaultRouter()
 router.register(r'owners', OwnerViewSet)
@@ -21,4 +24,17 @@ router.register(r'reports', ReportsViewSet, basename='reports')
 urlpatterns = [
     path('', include(router.urls)),
     path('status/', StatusView.as_view(), name='api_status'),
+    path('profiling/', PerfilesView.as_view(), name='profiling'),
+    path('profiling/<int:perfil_id>/', PerfilDetalleView.as_view(), name='profiling_detalle'),
+
+    # Monitoreo: métricas Prometheus y sondas baratas de liveness/readiness
+    path('metrics/', health.metrics, name='metrics'),
+    path('health/live/', health.liveness, name='health_live'),
+    path('health/ready/', health.readiness, name='health_ready'),
+
+    # Variantes async de lecturas pesadas (servir con un servidor ASGI)
+    path('async/appointments/calendar_week/', async_views.calendar_week, name='async_calendar_week'),
+    path('async/reports/dashboard_metrics/', async_views.dashboard_metrics, name='async_dashboard_metrics'),
+    path('async/reports/appointments_summary/', async_views.appointments_summary, name='async_appointments_summary'),
+    path('async/reports/clients_report/', async_views.clients_report, name='async_clients_report'),
 ]
\ No newline at end of file
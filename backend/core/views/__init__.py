@@ -5,6 +5,7 @@ from .appointments import AppointmentViewSet
 from .professionals import ProfessionalViewSet
 from .reports import ReportsViewSet
 from .status import StatusView
+from .profiling import PerfilesView, PerfilDetalleView
 
 __all__ = [
     'OwnerViewSet',
@@ -14,4 +15,6 @@ __all__ = [
     'ProfessionalViewSet',
     'ReportsViewSet',
     'StatusView',
+    'PerfilesView',
+    'PerfilDetalleView',
 ]
\ No newline at end of file
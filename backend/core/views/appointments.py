@@ -1,13 +1,57 @@
 # ViewSet para gestión de citas
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from datetime import datetime, time, timedelta
 
-from ..models import Appointment
-from ..serializers import AppointmentSerializer, AppointmentCalendarSerializer
+from ..models import Appointment, AppointmentView, Service, Professional
+from .. import form_bootstrap as datos_formulario
+from ..pagination import PaginacionCitas
+from ..scheduling import sugerir_horarios
+from ..serializers import (
+    AppointmentSerializer,
+    AppointmentReadSerializer,
+    AppointmentCalendarReadSerializer,
+)
+
+# Franjas horarias del calendario (generateTimeSlots en el frontend: 8:00 a 16:00)
+HORAS_CALENDARIO = range(8, 17)
+FRANJAS_CALENDARIO = [f'{hora:02d}:00' for hora in HORAS_CALENDARIO]
+
+# Formato compacto de cada cita en calendar_range
+COLUMNAS_CALENDARIO = [
+    'id', 'hora', 'pet_name', 'owner_name', 'service_name', 'professional_name',
+    'status', 'duration', 'pet', 'service', 'assigned_professional',
+]
+
+
+def agrupar_calendario(filas, inicio, fin):
+    """Agrupar filas (appointment_id, appointment_date, ...) por día local y franja horaria.
+
+    Las citas fuera del horario de atención van a 'fuera_de_horario' del día.
+    Se incluyen todos los días del rango, aunque no tengan citas.
+    """
+    dias = {}
+    dia = inicio
+    while dia <= fin:
+        dias[dia] = {'date': dia, 'count': 0, 'slots': {}, 'fuera_de_horario': []}
+        dia += timedelta(days=1)
+
+    for id_cita, fecha, *resto in filas:
+        local = timezone.localtime(fecha)
+        fila = [id_cita, local.strftime('%H:%M'), *resto]
+        bucket = dias[local.date()]
+        bucket['count'] += 1
+        if local.hour in HORAS_CALENDARIO:
+            bucket['slots'].setdefault(FRANJAS_CALENDARIO[local.hour - HORAS_CALENDARIO.start], []).append(fila)
+        else:
+            bucket['fuera_de_horario'].append(fila)
+    return list(dias.values())
 
 
 class AppointmentViewSet(viewsets.ModelViewSet):
@@ -17,9 +61,31 @@ class AppointmentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'service', 'pet']
-    search_fields = ['pet__name', 'pet__owner__full_name', 'service__name', 'reason']
     ordering_fields = ['appointment_date', 'created_at']
     ordering = ['-appointment_date']
+    # Solo list pagina; las acciones por fecha, mascota o rango devuelven listas acotadas
+    pagination_class = PaginacionCitas
+
+    # Acciones de solo lectura servidas desde el modelo desnormalizado (sin joins)
+    acciones_lectura = ('list', 'by_date', 'by_pet', 'calendar_week', 'calendar_range')
+
+    @property
+    def search_fields(self):
+        if self.action in self.acciones_lectura:
+            return ['pet_name', 'owner_name', 'service_name', 'reason']
+        return ['pet__name', 'pet__owner__full_name', 'service__name', 'reason']
+
+    def get_queryset(self):
+        if self.action in self.acciones_lectura:
+            return AppointmentView.objects.all()
+        return Appointment.objects.select_related(
+            'pet__owner', 'service', 'assigned_professional'
+        )
+
+    def get_serializer_class(self):
+        if self.action in self.acciones_lectura:
+            return AppointmentReadSerializer
+        return AppointmentSerializer
 
     def perform_create(self, serializer):
         """Guarda la cita y asigna el usuario que la creó"""
@@ -43,7 +109,7 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         try:
             from datetime import datetime
             fecha_obj = datetime.strptime(fecha_str, '%Y-%m-%d').date()
-            citas = self.queryset.filter(appointment_date__date=fecha_obj)
+            citas = self.get_queryset().filter(appointment_date__date=fecha_obj)
             serializer = self.get_serializer(citas, many=True)
             return Response(serializer.data)
         except ValueError:
@@ -63,7 +129,7 @@ class AppointmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        citas = self.queryset.filter(pet_id=id_mascota)
+        citas = self.get_queryset().filter(pet_id=id_mascota)
         serializer = self.get_serializer(citas, many=True)
         return Response(serializer.data)
 
@@ -93,19 +159,148 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         fin_semana = inicio_semana + timedelta(days=6)
 
         # Filtrar citas de la semana
-        citas = self.queryset.filter(
+        citas = self.get_queryset().filter(
             appointment_date__date__gte=inicio_semana,
             appointment_date__date__lte=fin_semana
         )
 
         # Serializar datos del calendario
-        serializer = AppointmentCalendarSerializer(citas, many=True)
+        serializer = AppointmentCalendarReadSerializer(citas, many=True)
         return Response({
             'inicio_semana': inicio_semana,
             'fin_semana': fin_semana,
             'citas': serializer.data
         })
 
+    @action(detail=False, methods=['get'])
+    def calendar_range(self, request):
+        """Citas de un rango de días (p. ej. varias semanas o un mes) agrupadas por día y franja"""
+        max_dias = getattr(settings, 'CALENDAR_RANGE', {}).get('MAX_DAYS', 42)
+        try:
+            inicio = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            fin_str = request.query_params.get('end')
+            fin = datetime.strptime(fin_str, '%Y-%m-%d').date() if fin_str else inicio + timedelta(days=6)
+        except ValueError:
+            return Response(
+                {'error': 'Parámetros start (requerido) y end deben tener formato YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if fin < inicio:
+            return Response(
+                {'error': 'end no puede ser anterior a start'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (fin - inicio).days + 1 > max_dias:
+            return Response(
+                {'error': f'El rango no puede superar {max_dias} días'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Rango sobre la columna indexada, sin funciones de fecha en el WHERE
+        filas = self.get_queryset().filter(
+            appointment_date__gte=timezone.make_aware(datetime.combine(inicio, time.min)),
+            appointment_date__lt=timezone.make_aware(datetime.combine(fin + timedelta(days=1), time.min)),
+        ).order_by('appointment_date').values_list(
+            'appointment_id', 'appointment_date', 'pet_name', 'owner_short_name', 'service_name',
+            'professional_name', 'status', 'service_duration', 'pet_id', 'service_id',
+            'assigned_professional_id',
+        )
+
+        return Response({
+            'start': inicio,
+            'end': fin,
+            'slots': FRANJAS_CALENDARIO,
+            'columns': COLUMNAS_CALENDARIO,
+            'days': agrupar_calendario(filas, inicio, fin),
+        })
+
+    @action(detail=False, methods=['get'])
+    def suggest_slots(self, request):
+        """Primeros horarios libres para un servicio, opcionalmente con un profesional dado"""
+        max_dias = getattr(settings, 'CALENDAR_RANGE', {}).get('MAX_DAYS', 42)
+        parametros = request.query_params
+        try:
+            servicio_id = int(parametros['service'])
+            profesional_id = int(parametros['professional']) if parametros.get('professional') else None
+            inicio_str = parametros.get('start')
+            inicio = datetime.strptime(inicio_str, '%Y-%m-%d').date() if inicio_str else timezone.localdate()
+            fin_str = parametros.get('end')
+            fin = datetime.strptime(fin_str, '%Y-%m-%d').date() if fin_str else inicio + timedelta(days=6)
+            cantidad = int(parametros.get('count', 5))
+            paso = int(parametros.get('step', 15))
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'Parámetro service requerido; start y end en formato YYYY-MM-DD; count y step enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if fin < inicio or (fin - inicio).days + 1 > max_dias:
+            return Response(
+                {'error': f'end debe estar entre start y {max_dias} días después'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= cantidad <= 50 or paso not in (5, 10, 15, 30, 60):
+            return Response(
+                {'error': 'count debe estar entre 1 y 50 y step ser 5, 10, 15, 30 o 60'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        servicio = Service.objects.filter(pk=servicio_id, is_active=True).only('duration_minutes').first()
+        if servicio is None:
+            return Response({'error': 'Servicio no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+        profesionales = Professional.objects.filter(is_active=True)
+        if profesional_id is not None:
+            profesionales = profesionales.filter(pk=profesional_id)
+        profesionales = dict(profesionales.values_list('id', 'full_name'))
+        if profesional_id is not None and not profesionales:
+            return Response({'error': 'Profesional no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'service': servicio_id,
+            'duration_minutes': servicio.duration_minutes,
+            'suggestions': sugerir_horarios(servicio, profesionales, inicio, fin, cantidad, paso),
+        })
+
+    @action(detail=False, methods=['get'])
+    def form_bootstrap(self, request):
+        """Mascotas, servicios y profesionales activos para el formulario de citas"""
+        version = datos_formulario.obtener_version()
+        etag = f'"{version}"'
+        encabezados = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        # El navegador revalida con If-None-Match: sin cambios no se consulta la BD
+        if etag in request.headers.get('If-None-Match', '').split(', '):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=encabezados)
+
+        datos = datos_formulario.obtener_datos(version)
+        return Response({'version': version, **datos}, headers=encabezados)
+
+    @action(detail=True, methods=['post'])
+    def start(self, request, pk=None):
+        """Registrar el inicio real de la atención"""
+        cita = self.get_object()
+        if cita.status in ('realizada', 'cancelada'):
+            return Response(
+                {'error': f'No se puede iniciar una cita {cita.status}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if cita.actual_start_time:
+            return Response(
+                {'error': 'La atención de esta cita ya se inició'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cita.actual_start_time = timezone.now()
+        try:
+            cita.save()
+        except ValidationError as e:
+            return Response(
+                {'error': e.message_dict if hasattr(e, 'message_dict') else str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(cita)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         """Actualizar estado de una cita"""
@@ -118,14 +313,19 @@ class AppointmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Tiempos reales opcionales (ISO 8601); los reportes de duración usan ambos
+        try:
+            for campo in ('actual_start_time', 'actual_end_time'):
+                if request.data.get(campo):
+                    setattr(cita, campo, serializers.DateTimeField().to_internal_value(request.data[campo]))
+        except serializers.ValidationError as e:
+            return Response({'error': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
         cita.status = nuevo_estado
 
-        # Registrar tiempos automáticamente
+        # El fin se registra al marcarla realizada; el inicio, con la acción start
         if nuevo_estado == 'realizada' and not cita.actual_end_time:
-            from django.utils import timezone
             cita.actual_end_time = timezone.now()
-            if not cita.actual_start_time:
-                cita.actual_start_time = cita.appointment_date
 
         try:
             cita.save()
@@ -0,0 +1,218 @@
+# Variantes asíncronas (ASGI) de los endpoints de lectura más pesados
+from datetime import datetime, timedelta
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from rest_framework.utils.encoders import JSONEncoder
+
+from authentication.jwt_auth import JWTAutenticacionCacheada
+from ..models import Owner, Pet, Service, Appointment, AppointmentView
+from ..serializers import (
+    OwnerSerializer, PetSerializer,
+    AppointmentReadSerializer, AppointmentCalendarReadSerializer,
+)
+from ..archive import conteo_por_fila, sumar_agrupados, total_citas
+from .reports import citas_del_periodo
+
+
+def respuesta_json(datos, status=200):
+    """JsonResponse con el mismo encoder que usa DRF, para respuestas idénticas"""
+    return JsonResponse(
+        datos, status=status, encoder=JSONEncoder, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def autenticado(vista):
+    """Autenticación JWT para vistas async (sin consulta si el usuario está en caché)"""
+    autenticacion = JWTAutenticacionCacheada()
+
+    @wraps(vista)
+    async def envoltura(request, *args, **kwargs):
+        try:
+            resultado = await sync_to_async(autenticacion.authenticate)(request)
+        except APIException as error:
+            return respuesta_json({'detail': error.detail}, status=error.status_code)
+        if resultado is None:
+            return respuesta_json(
+                {'detail': 'Las credenciales de autenticación no se proveyeron.'}, status=401
+            )
+        request.user, request.auth = resultado
+        return await vista(request, *args, **kwargs)
+
+    return envoltura
+
+
+async def listar(queryset):
+    return [obj async for obj in queryset]
+
+
+async def serializar(serializer_class, instancias):
+    """Serializar en un hilo: los serializers pueden acceder a relaciones"""
+    return await sync_to_async(lambda: serializer_class(instancias, many=True).data)()
+
+
+@require_GET
+@autenticado
+async def calendar_week(request):
+    """Vista de calendario semanal (async)"""
+    fecha_str = request.GET.get('date', '')
+    if fecha_str:
+        try:
+            fecha_base = datetime.strptime(fecha_str, '%Y-%m-%d').date()
+        except ValueError:
+            return respuesta_json({'error': 'Formato de fecha inválido'}, status=400)
+    else:
+        fecha_base = timezone.now().date()
+
+    inicio_semana = fecha_base - timedelta(days=fecha_base.weekday())
+    fin_semana = inicio_semana + timedelta(days=6)
+
+    citas = await listar(AppointmentView.objects.filter(
+        appointment_date__date__gte=inicio_semana,
+        appointment_date__date__lte=fin_semana
+    ))
+    return respuesta_json({
+        'inicio_semana': inicio_semana,
+        'fin_semana': fin_semana,
+        'citas': AppointmentCalendarReadSerializer(citas, many=True).data
+    })
+
+
+@require_GET
+@autenticado
+async def dashboard_metrics(request):
+    """Métricas principales para dashboard (async)"""
+    ahora = timezone.now()
+    today = ahora.date()
+    this_month = ahora.replace(day=1).date()
+
+    hoy = await Appointment.objects.filter(appointment_date__date=today).aaggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pendiente')),
+        confirmed=Count('id', filter=Q(status='confirmada')),
+        completed=Count('id', filter=Q(status='realizada')),
+    )
+    mes = await Appointment.objects.filter(appointment_date__date__gte=this_month).aaggregate(
+        total=Count('id'), revenue=Sum('price_charged', filter=~Q(status='cancelada'))
+    )
+    owners = await Owner.objects.filter(is_active=True).acount()
+    pets = await Pet.objects.filter(is_active=True).acount()
+    services = await Service.objects.filter(is_active=True).acount()
+    upcoming = await listar(AppointmentView.objects.filter(
+        appointment_date__gte=ahora,
+        status__in=['pendiente', 'confirmada']
+    ).order_by('appointment_date')[:5])
+
+    return respuesta_json({
+        'today': {
+            'total_appointments': hoy['total'],
+            'pending': hoy['pending'],
+            'confirmed': hoy['confirmed'],
+            'completed': hoy['completed'],
+        },
+        'month': {
+            'total_appointments': mes['total'],
+            'revenue': float(mes['revenue'] or 0),
+            'avg_per_day': mes['total'] / ahora.day
+        },
+        'totals': {
+            'owners': owners,
+            'pets': pets,
+            'services': services,
+        },
+        'upcoming_appointments': AppointmentReadSerializer(upcoming, many=True).data
+    })
+
+
+@require_GET
+@autenticado
+async def appointments_summary(request):
+    """Reporte de citas por estado y período (async)"""
+    start_date = request.GET.get('start_date')
+    end_date = request.GET.get('end_date')
+    consultas = citas_del_periodo(start_date, end_date)
+    appointments = consultas[0]
+
+    # Tendencia de 30 días en una sola consulta agrupada por día local (nunca archivada)
+    hoy = timezone.now().date()
+    dias = [hoy - timedelta(days=i) for i in range(29, -1, -1)]
+    tendencia = appointments.filter(
+        appointment_date__date__gte=dias[0],
+        appointment_date__date__lte=hoy
+    ).annotate(dia=TruncDate('appointment_date')).values('dia').annotate(count=Count('id'))
+
+    por_dia = await listar(tendencia.order_by())
+    por_estado = [
+        await listar(consulta.order_by().values('status').annotate(count=Count('id')))
+        for consulta in consultas
+    ]
+    por_servicio = [
+        await listar(consulta.order_by().values('service__name', 'service__service_type').annotate(
+            count=Count('id'),
+            total_revenue=Sum('price_charged', filter=~Q(status='cancelada'))
+        ))
+        for consulta in consultas
+    ]
+    by_status = sorted(
+        sumar_agrupados(por_estado, ('status',), ('count',)),
+        key=lambda fila: fila['status']
+    )
+    by_service = sorted(
+        sumar_agrupados(por_servicio, ('service__name', 'service__service_type'), ('count', 'total_revenue')),
+        key=lambda fila: -fila['count']
+    )
+
+    conteos = {fila['dia']: fila['count'] for fila in por_dia}
+    return respuesta_json({
+        'total_appointments': sum(fila['count'] for fila in by_status),
+        'by_status': by_status,
+        'by_service': by_service,
+        'last_30_days': [
+            {'date': dia.strftime('%Y-%m-%d'), 'count': conteos.get(dia, 0)} for dia in dias
+        ],
+        'period': {
+            'start': start_date,
+            'end': end_date
+        },
+        # Siempre SQL: los acumulados en caché son de la versión síncrona
+        'engine': 'sql'
+    })
+
+
+@require_GET
+@autenticado
+async def clients_report(request):
+    """Reporte de datos de clientes y mascotas (async)"""
+    last_month = timezone.now() - timedelta(days=30)
+
+    top_clients = await listar(Owner.objects.annotate(
+        pets_count=conteo_por_fila(Pet.objects.filter(is_active=True), 'owner'),
+        appointments_count=total_citas('pet__owner')
+    ).order_by('-appointments_count')[:10])
+    top_pets = await listar(Pet.objects.select_related('owner').annotate(
+        appointments_count=total_citas('pet')
+    ).filter(appointments_count__gt=0).order_by('-appointments_count')[:10])
+    new_owners = await Owner.objects.filter(created_at__gte=last_month).acount()
+    new_pets = await Pet.objects.filter(created_at__gte=last_month).acount()
+    breeds = await listar(Pet.objects.values('breed').annotate(count=Count('id')).order_by('-count')[:10])
+    total_owners = await Owner.objects.filter(is_active=True).acount()
+    total_pets = await Pet.objects.filter(is_active=True).acount()
+
+    top_clients_data = await serializar(OwnerSerializer, top_clients)
+    top_pets_data = await serializar(PetSerializer, top_pets)
+
+    return respuesta_json({
+        'total_owners': total_owners,
+        'total_pets': total_pets,
+        'new_owners_last_month': new_owners,
+        'new_pets_last_month': new_pets,
+        'top_clients': top_clients_data,
+        'most_attended_pets': top_pets_data,
+        'breed_distribution': breeds
+    })
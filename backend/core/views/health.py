@@ -0,0 +1,37 @@
+# Endpoints para monitoreo: no requieren JWT ni recorren tablas
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from ..metrics import registro_metricas, token_autorizado
+
+
+@require_GET
+def liveness(request):
+    """El proceso responde; no toca la base de datos"""
+    return JsonResponse({'status': 'ok'})
+
+
+@require_GET
+def readiness(request):
+    """Listo para atender: cada base de datos responde a un SELECT 1"""
+    errores = {}
+    for conexion in connections.all():
+        try:
+            with conexion.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Exception as error:
+            errores[conexion.alias] = str(error)
+    if errores:
+        return JsonResponse({'status': 'unavailable', 'databases': errores}, status=503)
+    return JsonResponse({'status': 'ok'})
+
+
+@require_GET
+def metrics(request):
+    """Métricas del proceso en formato de exposición de texto de Prometheus"""
+    if not token_autorizado(request):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        registro_metricas.exponer(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -1,10 +1,15 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
+import io
 
 from ..models import Owner
+from ..importing import CODIFICACION, ImportadorPropietariosMascotas, verificar_codificacion
 from ..serializers import OwnerSerializer, PetSerializer
 
 
@@ -19,6 +24,12 @@ class OwnerViewSet(viewsets.ModelViewSet):
     ordering_fields = ['full_name', 'created_at']
     ordering = ['full_name']
 
+    def get_queryset(self):
+        # Conteo de mascotas activas en la misma consulta, no una por propietario
+        return super().get_queryset().annotate(
+            pets_count=Count('pets', filter=Q(pets__is_active=True))
+        )
+
     @action(detail=True, methods=['get'])
     def pets(self, request, pk=None):
         """Obtener mascotas de un propietario"""
@@ -48,4 +59,26 @@ class OwnerViewSet(viewsets.ModelViewSet):
             return Response(
                 {'error': 'Propietario no encontrado'},
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def import_csv(self, request):
+        """Importar dueños y mascotas desde un CSV (campo file); dry_run=1 solo valida"""
+        archivo = request.FILES.get('file')
+        if archivo is None:
+            return Response(
+                {'error': 'Archivo CSV requerido en el campo file'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        importador = ImportadorPropietariosMascotas(
+            dry_run=request.data.get('dry_run') in ('1', 'true', 'True')
+        )
+        try:
+            # Antes del primer bloque: un error de codificación no deja filas importadas
+            verificar_codificacion(archivo.file)
+            resultado = importador.importar(io.TextIOWrapper(archivo.file, encoding=CODIFICACION, newline=''))
+        except ValidationError as error:
+            return Response({'error': error.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'dry_run': importador.dry_run, **resultado.resumen()})
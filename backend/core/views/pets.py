@@ -5,12 +5,12 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 
 from ..models import Pet
-from ..serializers import PetSerializer
+from ..serializers import PetSerializer, ContextoEdad
 
 
 class PetViewSet(viewsets.ModelViewSet):
     """ViewSet para gestión completa de mascotas"""
-    queryset = Pet.objects.filter(is_active=True)
+    queryset = Pet.objects.filter(is_active=True).select_related('owner')
     serializer_class = PetSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -53,43 +53,57 @@ class PetViewSet(viewsets.ModelViewSet):
     def medical_history(self, request, pk=None):
         """Obtener historial médico básico de una mascota"""
         mascota = self.get_object()
+        campos = ('appointment_date', 'service__name', 'observations')
+        citas_recientes = list(mascota.appointments.filter(
+            status__in=['realizada', 'confirmada']
+        ).order_by('-appointment_date')[:5].values(*campos))
+        # Completar con citas archivadas solo si las vigentes no alcanzan
+        if len(citas_recientes) < 5:
+            citas_recientes += mascota.archived_appointments.filter(
+                status__in=['realizada', 'confirmada']
+            ).order_by('-appointment_date')[:5 - len(citas_recientes)].values(*campos)
         datos = {
-            'mascota': PetSerializer(mascota).data,
+            'mascota': self.get_serializer(mascota).data,
             'alergias': mascota.allergies,
             'condiciones_medicas': mascota.medical_conditions,
             'notas_adicionales': mascota.additional_notes,
-            'citas_recientes': mascota.appointments.filter(
-                status__in=['realizada', 'confirmada']
-            ).order_by('-appointment_date')[:5].values(
-                'appointment_date', 'service__name', 'observations'
-            )
+            'citas_recientes': citas_recientes
         }
         return Response(datos)
 
+    @property
+    def contexto_edad(self):
+        """Fecha de referencia única para filtros y serialización de la petición"""
+        if not hasattr(self, '_contexto_edad'):
+            self._contexto_edad = ContextoEdad()
+        return self._contexto_edad
+
+    def get_serializer_context(self):
+        contexto = super().get_serializer_context()
+        contexto['contexto_edad'] = self.contexto_edad
+        return contexto
+
     def get_queryset(self):
         """Permitir filtros adicionales en parámetros de consulta"""
         queryset = super().get_queryset()
 
-        # Filtro por edad (en meses)
-        edad_minima = self.request.query_params.get('min_age_months')
-        edad_maxima = self.request.query_params.get('max_age_months')
+        # Filtro por edad (en meses), resuelto como rango sobre birth_date
+        edad_minima = self._parametro_entero('min_age_months')
+        edad_maxima = self._parametro_entero('max_age_months')
 
-        if edad_minima:
-            try:
-                edad_minima = int(edad_minima)
-                # Calcular fecha límite
-                from datetime import date, timedelta
-                fecha_nacimiento_maxima = date.today() - timedelta(days=edad_minima * 30.44)
-                queryset = queryset.filter(birth_date__lte=fecha_nacimiento_maxima)
-            except ValueError:
-                pass
+        if edad_minima is not None or edad_maxima is not None:
+            queryset = queryset.filter(
+                **self.contexto_edad.filtros_nacimiento(edad_minima, edad_maxima)
+            )
 
-        if edad_maxima:
-            try:
-                edad_maxima = int(edad_maxima)
-                fecha_nacimiento_minima = date.today() - timedelta(days=edad_maxima * 30.44)
-                queryset = queryset.filter(birth_date__gte=fecha_nacimiento_minima)
-            except ValueError:
-                pass
+        return queryset
 
-        return queryset
\ No newline at end of file
+    def _parametro_entero(self, nombre):
+        """Leer un parámetro entero opcional; se ignora si no es válido"""
+        valor = self.request.query_params.get(nombre)
+        if not valor:
+            return None
+        try:
+            return int(valor)
+        except ValueError:
+            return None
@@ -0,0 +1,39 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..profiling import registro_perfiles
+
+
+class PerfilesView(APIView):
+    """Perfiles recientes de peticiones (búfer en memoria del proceso)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            limite = int(request.query_params.get('limit', 50))
+        except ValueError:
+            return Response(
+                {'error': 'El parámetro limit debe ser un entero'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response([perfil.resumen() for perfil in registro_perfiles.listar(limite)])
+
+    def delete(self, request):
+        registro_perfiles.limpiar()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PerfilDetalleView(APIView):
+    """Detalle de un perfil: consultas duplicadas con su origen y salida de cProfile"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, perfil_id):
+        perfil = registro_perfiles.obtener(perfil_id)
+        if perfil is None:
+            return Response(
+                {'error': 'Perfil no encontrado (puede haber salido del búfer)'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(perfil.detalle())
@@ -1,19 +1,165 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count, Sum, Avg
+from django.db.models import Count, Sum, Min, Max
+from django.db.models.functions import TruncDate
 from datetime import datetime, timedelta
+from decimal import Decimal
 from django.http import HttpResponse
 import csv
+import itertools
+import time
 
-from ..models import Owner, Pet, Service, Appointment
+from ..models import Owner, Pet, Service, Appointment, AppointmentView, Professional
 from ..serializers import (
-    OwnerSerializer, PetSerializer, ServiceSerializer,
-    AppointmentSerializer
+    OwnerSerializer, PetSerializer, ServiceStatsSerializer,
+    AppointmentReadSerializer
 )
 from django.db.models import Q
+from ..archive import consultas_citas, combinar_agrupados, conteo_por_fila, total_citas
+from ..report_executor import EjecutorReporte
+from ..occupancy import calcular_ocupacion, FRANJAS_PERMITIDAS
+from .. import analytics
+from ..metrics import (
+    EXPORTACIONES, FILAS_EXPORTADAS, BYTES_EXPORTADOS, DURACION_EXPORTACIONES
+)
+
+
+def filtrar_por_periodo(appointments, start_date, end_date):
+    """Filtrar citas entre dos fechas YYYY-MM-DD (inclusive); fechas inválidas se ignoran"""
+    if start_date:
+        try:
+            start = timezone.make_aware(datetime.strptime(start_date, '%Y-%m-%d'))
+            appointments = appointments.filter(appointment_date__gte=start)
+        except ValueError:
+            pass
+
+    if end_date:
+        try:
+            end = timezone.make_aware(datetime.strptime(end_date, '%Y-%m-%d'))
+            end = end.replace(hour=23, minute=59, second=59)
+            appointments = appointments.filter(appointment_date__lte=end)
+        except ValueError:
+            pass
+
+    return appointments
+
+
+def citas_del_periodo(start_date, end_date):
+    """Citas vigentes del período y, si puede haberlas, también las archivadas (una consulta base por tabla)"""
+    try:
+        desde = timezone.make_aware(datetime.strptime(start_date, '%Y-%m-%d')) if start_date else None
+    except ValueError:
+        desde = None
+    return [filtrar_por_periodo(consulta, start_date, end_date) for consulta in consultas_citas(desde)]
+
+
+def rango_del_periodo(start_date, end_date):
+    """(inicio, fin) como fechas, o None para un extremo ausente o inválido"""
+    fechas = []
+    for valor in (start_date, end_date):
+        try:
+            fechas.append(datetime.strptime(valor, '%Y-%m-%d').date() if valor else None)
+        except ValueError:
+            fechas.append(None)
+    return tuple(fechas)
+
+
+def elegir_motor(request):
+    """Motor de agregación del reporte: parámetro engine (auto, sql, memory) o REPORT_ANALYTICS['ENGINE']"""
+    inicio, fin = rango_del_periodo(
+        request.query_params.get('start_date'), request.query_params.get('end_date')
+    )
+    return analytics.elegir_motor(request.query_params.get('engine'), inicio, fin), inicio, fin
+
+
+def meses_abarcados(desde, hasta):
+    """Cantidad de meses calendario (hora local) entre dos fechas, mínimo 1"""
+    if not desde or not hasta:
+        return 1
+    desde, hasta = timezone.localtime(desde), timezone.localtime(hasta)
+    return max((hasta.year - desde.year) * 12 + hasta.month - desde.month + 1, 1)
+
+
+def estadisticas_servicios(*consultas):
+    """Estadísticas por servicio y por tipo con una consulta agrupada por tabla de citas.
+
+    Los ingresos excluyen citas canceladas; la tasa de cancelación es una
+    proporción entre 0 y 1. Devuelve los servicios (con los campos anotados
+    como atributos), ordenados por cantidad de citas, y la lista por tipo.
+    """
+    return armar_estadisticas_servicios(filas_por_servicio_sql(*consultas))
+
+
+def filas_por_servicio_sql(*consultas):
+    """{service_id: fila agregada} sumando las filas de cada tabla de citas"""
+    cancelada = Q(status='cancelada')
+    por_servicio = {}
+    for consulta in consultas:
+        filas = consulta.order_by().values('service_id').annotate(
+            appointments_count=Count('id'),
+            cancelled_count=Count('id', filter=cancelada),
+            total_revenue=Sum('price_charged', filter=~cancelada),
+            primera=Min('appointment_date'),
+            ultima=Max('appointment_date'),
+        )
+        for fila in filas:
+            existente = por_servicio.setdefault(fila['service_id'], fila)
+            if existente is fila:
+                continue
+            existente['appointments_count'] += fila['appointments_count']
+            existente['cancelled_count'] += fila['cancelled_count']
+            existente['total_revenue'] = (existente['total_revenue'] or 0) + (fila['total_revenue'] or 0)
+            existente['primera'] = min(existente['primera'], fila['primera'])
+            existente['ultima'] = max(existente['ultima'], fila['ultima'])
+    return por_servicio
+
+
+def armar_estadisticas_servicios(por_servicio):
+    """Servicios con sus estadísticas y la lista por tipo a partir de las filas por servicio"""
+    servicios = list(Service.objects.all())
+    por_tipo = {}
+    for servicio in servicios:
+        fila = por_servicio.get(servicio.id, {})
+        servicio.appointments_count = fila.get('appointments_count', 0)
+        servicio.cancelled_count = fila.get('cancelled_count', 0)
+        servicio.total_revenue = fila.get('total_revenue') or Decimal('0')
+        servicio.avg_appointments_per_month = round(
+            servicio.appointments_count / meses_abarcados(fila.get('primera'), fila.get('ultima')), 2
+        )
+        servicio.cancellation_rate = round(
+            servicio.cancelled_count / servicio.appointments_count, 4
+        ) if servicio.appointments_count else 0
+
+        tipo = por_tipo.setdefault(servicio.service_type, {
+            'service_type': servicio.service_type,
+            'count': 0, 'cancelled': 0, 'revenue': Decimal('0'), 'primera': None, 'ultima': None,
+        })
+        tipo['count'] += servicio.appointments_count
+        tipo['cancelled'] += servicio.cancelled_count
+        tipo['revenue'] += servicio.total_revenue
+        if fila:
+            tipo['primera'] = min(filter(None, [tipo['primera'], fila['primera']]))
+            tipo['ultima'] = max(filter(None, [tipo['ultima'], fila['ultima']]))
+
+    by_type = []
+    for tipo in por_tipo.values():
+        by_type.append({
+            'service_type': tipo['service_type'],
+            'count': tipo['count'],
+            'revenue': tipo['revenue'],
+            'avg_appointments_per_month': round(
+                tipo['count'] / meses_abarcados(tipo['primera'], tipo['ultima']), 2
+            ),
+            'cancellation_rate': round(tipo['cancelled'] / tipo['count'], 4) if tipo['count'] else 0,
+        })
+
+    servicios.sort(key=lambda servicio: -servicio.appointments_count)
+    by_type.sort(key=lambda tipo: -tipo['count'])
+    return servicios, by_type
 
 
 class ReportsViewSet(viewsets.ViewSet):
@@ -26,154 +172,255 @@ class ReportsViewSet(viewsets.ViewSet):
         # Parámetros de fecha
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
+        try:
+            motor, inicio, fin = elegir_motor(request)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if motor == 'memory':
+            # Acumulados diarios en caché: solo se consultan los días que faltan
+            datos = analytics.resumen_citas(inicio, fin, {
+                id_: (nombre, tipo)
+                for id_, nombre, tipo in Service.objects.values_list('id', 'name', 'service_type')
+            })
+            return Response({
+                'total_appointments': sum(fila['count'] for fila in datos['by_status']),
+                **datos,
+                'period': {
+                    'start': start_date,
+                    'end': end_date
+                },
+                'engine': motor
+            })
 
-        appointments = Appointment.objects.all()
-
-        if start_date:
-            try:
-                start = timezone.make_aware(datetime.strptime(start_date, '%Y-%m-%d'))
-                appointments = appointments.filter(appointment_date__gte=start)
-            except ValueError:
-                pass
-
-        if end_date:
-            try:
-                end = timezone.make_aware(datetime.strptime(end_date, '%Y-%m-%d'))
-                end = end.replace(hour=23, minute=59, second=59)
-                appointments = appointments.filter(appointment_date__lte=end)
-            except ValueError:
-                pass
+        consultas = citas_del_periodo(start_date, end_date)
+        appointments = consultas[0]
 
-        # Estadísticas por estado
-        stats_by_status = appointments.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
+        # Estadísticas por estado (vigentes y archivadas sumadas)
+        stats_by_status = sorted(
+            combinar_agrupados(consultas, ('status',), count=Count('id')),
+            key=lambda fila: fila['status']
+        )
 
         # Estadísticas por servicio
-        stats_by_service = appointments.values(
-            'service__name', 'service__service_type'
-        ).annotate(
-            count=Count('id'),
-            total_revenue=Sum('service__price')
-        ).order_by('-count')
+        stats_by_service = sorted(
+            combinar_agrupados(
+                consultas, ('service__name', 'service__service_type'),
+                count=Count('id'),
+                total_revenue=Sum('price_charged', filter=~Q(status='cancelada'))
+            ),
+            key=lambda fila: -fila['count']
+        )
 
         # Estadísticas por profesional (removido)
 
-        # Tendencia por días
-        ultimos_30_dias = []
-        for i in range(29, -1, -1):
-            dia = timezone.now().date() - timedelta(days=i)
-            cantidad = appointments.filter(appointment_date__date=dia).count()
-            ultimos_30_dias.append({
-                'date': dia.strftime('%Y-%m-%d'),
-                'count': cantidad
-            })
+        # Tendencia de 30 días en una sola consulta agrupada por día local (nunca archivada)
+        hoy = timezone.now().date()
+        dias = [hoy - timedelta(days=i) for i in range(29, -1, -1)]
+        conteos = dict(
+            appointments.filter(appointment_date__date__gte=dias[0], appointment_date__date__lte=hoy)
+            .order_by().annotate(dia=TruncDate('appointment_date'))
+            .values('dia').annotate(count=Count('id')).values_list('dia', 'count')
+        )
+        ultimos_30_dias = [
+            {'date': dia.strftime('%Y-%m-%d'), 'count': conteos.get(dia, 0)} for dia in dias
+        ]
 
         return Response({
-            'total_appointments': appointments.count(),
-            'by_status': list(stats_by_status),
-            'by_service': list(stats_by_service),
+            'total_appointments': sum(fila['count'] for fila in stats_by_status),
+            'by_status': stats_by_status,
+            'by_service': stats_by_service,
             'last_30_days': ultimos_30_dias,
             'period': {
                 'start': start_date,
                 'end': end_date
-            }
+            },
+            'engine': motor
         })
 
     @action(detail=False, methods=['get'])
     def services_report(self, request):
         """Reporte de servicios más solicitados y rentabilidad"""
-        services_stats = Service.objects.annotate(
-            appointments_count=Count('appointment'),
-            total_revenue=Sum('appointment__service__price'),
-            avg_appointments_per_month=Avg('appointment__id')
-        ).order_by('-appointments_count')
-
-        # Servicios por tipo
-        by_type = Service.objects.values('service_type').annotate(
-            count=Count('appointment'),
-            revenue=Sum('appointment__service__price')
-        ).order_by('-count')
+        try:
+            motor, inicio, fin = elegir_motor(request)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if motor == 'memory':
+            servicios, by_type = armar_estadisticas_servicios(analytics.filas_por_servicio(inicio, fin))
+        else:
+            servicios, by_type = estadisticas_servicios(*citas_del_periodo(
+                request.query_params.get('start_date'),
+                request.query_params.get('end_date')
+            ))
 
         return Response({
-            'services_performance': ServiceSerializer(services_stats, many=True).data,
-            'by_type': list(by_type),
-            'total_services': Service.objects.filter(is_active=True).count()
+            'services_performance': ServiceStatsSerializer(servicios, many=True).data,
+            'by_type': by_type,
+            'total_services': sum(1 for servicio in servicios if servicio.is_active),
+            'engine': motor
         })
 
+    @action(detail=False, methods=['get'])
+    def occupancy(self, request):
+        """Mapa de calor de utilización por profesional y tipo de servicio en franjas de la jornada"""
+        max_dias = getattr(settings, 'CALENDAR_RANGE', {}).get('MAX_DAYS', 42)
+        try:
+            inicio = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            fin_str = request.query_params.get('end')
+            fin = datetime.strptime(fin_str, '%Y-%m-%d').date() if fin_str else inicio + timedelta(days=6)
+            minutos_franja = int(request.query_params.get('slot_minutes', 30))
+        except ValueError:
+            return Response(
+                {'error': 'Parámetros start (requerido) y end deben tener formato YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if minutos_franja not in FRANJAS_PERMITIDAS:
+            return Response(
+                {'error': f'slot_minutes debe ser uno de {list(FRANJAS_PERMITIDAS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if fin < inicio or (fin - inicio).days + 1 > max_dias:
+            return Response(
+                {'error': f'end debe estar entre start y {max_dias} días después'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(calcular_ocupacion(inicio, fin, minutos_franja))
+
+    @action(detail=False, methods=['get'])
+    def durations(self, request):
+        """Duración real frente a la agendada por servicio y profesional, con duraciones sugeridas"""
+        try:
+            fin_str = request.query_params.get('end_date')
+            fin = datetime.strptime(fin_str, '%Y-%m-%d').date() if fin_str else timezone.localdate()
+            inicio_str = request.query_params.get('start_date')
+            inicio = datetime.strptime(inicio_str, '%Y-%m-%d').date() if inicio_str else fin - timedelta(days=89)
+        except ValueError:
+            return Response(
+                {'error': 'Parámetros start_date y end_date deben tener formato YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            analytics.validar_rango(inicio, fin)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Acumulados diarios (core/analytics.py): solo los días sin caché se leen de la base
+        return Response(analytics.duraciones_reales(
+            inicio, fin,
+            {
+                id_: (nombre, tipo, minutos)
+                for id_, nombre, tipo, minutos in Service.objects.values_list(
+                    'id', 'name', 'service_type', 'duration_minutes'
+                )
+            },
+            dict(Professional.objects.values_list('id', 'full_name')),
+        ))
+
     @action(detail=False, methods=['get'])
     def clients_report(self, request):
         """Reporte de datos de clientes y mascotas"""
-        # Estadísticas de dueños
-        owners_stats = Owner.objects.annotate(
-            pets_count=Count('pets', filter=Q(pets__is_active=True)),
-            appointments_count=Count('pets__appointments')
-        ).order_by('-appointments_count')
+        last_month = timezone.now() - timedelta(days=30)
+        reporte = EjecutorReporte()
+
+        # Conteos de dueños y mascotas: totales activos y registros del último mes
+        @reporte.seccion('owner_counts')
+        def owner_counts():
+            return Owner.objects.aggregate(
+                total=Count('id', filter=Q(is_active=True)),
+                nuevos=Count('id', filter=Q(created_at__gte=last_month)),
+            )
+
+        @reporte.seccion('pet_counts')
+        def pet_counts():
+            return Pet.objects.aggregate(
+                total=Count('id', filter=Q(is_active=True)),
+                nuevos=Count('id', filter=Q(created_at__gte=last_month)),
+            )
+
+        # Estadísticas de dueños (pets_count anotado evita un COUNT por dueño).
+        # Subconsultas en lugar de joins agrupados: suman citas vigentes y archivadas
+        @reporte.seccion('top_clients')
+        def top_clients():
+            owners_stats = Owner.objects.annotate(
+                pets_count=conteo_por_fila(Pet.objects.filter(is_active=True), 'owner'),
+                appointments_count=total_citas('pet__owner')
+            ).order_by('-appointments_count')[:10]
+            return OwnerSerializer(owners_stats, many=True).data
 
         # Mascotas más atendidas
-        pets_stats = Pet.objects.annotate(
-            appointments_count=Count('appointments')
-        ).filter(appointments_count__gt=0).order_by('-appointments_count')[:10]
-
-        # Registros nuevos último mes
-        last_month = timezone.now() - timedelta(days=30)
-        new_owners = Owner.objects.filter(created_at__gte=last_month).count()
-        new_pets = Pet.objects.filter(created_at__gte=last_month).count()
+        @reporte.seccion('most_attended_pets')
+        def most_attended_pets():
+            pets_stats = Pet.objects.select_related('owner').annotate(
+                appointments_count=total_citas('pet')
+            ).filter(appointments_count__gt=0).order_by('-appointments_count')[:10]
+            return PetSerializer(pets_stats, many=True).data
 
         # Razas más comunes
-        breed_stats = Pet.objects.values('breed').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
-
-        return Response({
-            'total_owners': Owner.objects.filter(is_active=True).count(),
-            'total_pets': Pet.objects.filter(is_active=True).count(),
-            'new_owners_last_month': new_owners,
-            'new_pets_last_month': new_pets,
-            'top_clients': OwnerSerializer(owners_stats[:10], many=True).data,
-            'most_attended_pets': PetSerializer(pets_stats, many=True).data,
-            'breed_distribution': list(breed_stats)
+        @reporte.seccion('breed_distribution')
+        def breed_distribution():
+            return list(Pet.objects.values('breed').annotate(
+                count=Count('id')
+            ).order_by('-count')[:10])
+
+        resultados = reporte.ejecutar()
+
+        response = Response({
+            'total_owners': resultados['owner_counts']['total'],
+            'total_pets': resultados['pet_counts']['total'],
+            'new_owners_last_month': resultados['owner_counts']['nuevos'],
+            'new_pets_last_month': resultados['pet_counts']['nuevos'],
+            'top_clients': resultados['top_clients'],
+            'most_attended_pets': resultados['most_attended_pets'],
+            'breed_distribution': resultados['breed_distribution']
         })
+        if settings.DEBUG:
+            response['Server-Timing'] = reporte.encabezado_tiempos()
+        return response
 
     @action(detail=False, methods=['get'])
     def dashboard_metrics(self, request):
         """Métricas principales para dashboard"""
-        today = timezone.now().date()
-        this_month = timezone.now().replace(day=1).date()
-
-        # Métricas de hoy
-        today_appointments = Appointment.objects.filter(appointment_date__date=today)
-
-        # Métricas del mes
-        month_appointments = Appointment.objects.filter(appointment_date__date__gte=this_month)
-        month_revenue = month_appointments.aggregate(
-            revenue=Sum('service__price')
-        )['revenue'] or 0
-
-        # Próximas citas
-        upcoming = Appointment.objects.filter(
-            appointment_date__gte=timezone.now(),
+        ahora = timezone.now()
+        today = ahora.date()
+        this_month = ahora.replace(day=1).date()
+
+        # Métricas de hoy y del mes: un agregado condicional cada una
+        hoy = Appointment.objects.filter(appointment_date__date=today).aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='pendiente')),
+            confirmed=Count('id', filter=Q(status='confirmada')),
+            completed=Count('id', filter=Q(status='realizada')),
+        )
+        mes = Appointment.objects.filter(appointment_date__date__gte=this_month).aggregate(
+            total=Count('id'), revenue=Sum('price_charged', filter=~Q(status='cancelada'))
+        )
+
+        # Próximas citas desde el modelo de lectura (sin joins ni consultas por cita)
+        upcoming = AppointmentView.objects.filter(
+            appointment_date__gte=ahora,
             status__in=['pendiente', 'confirmada']
         ).order_by('appointment_date')[:5]
 
         return Response({
             'today': {
-                'total_appointments': today_appointments.count(),
-                'pending': today_appointments.filter(status='pendiente').count(),
-                'confirmed': today_appointments.filter(status='confirmada').count(),
-                'completed': today_appointments.filter(status='realizada').count(),
+                'total_appointments': hoy['total'],
+                'pending': hoy['pending'],
+                'confirmed': hoy['confirmed'],
+                'completed': hoy['completed'],
             },
             'month': {
-                'total_appointments': month_appointments.count(),
-                'revenue': float(month_revenue),
-                'avg_per_day': month_appointments.count() / timezone.now().day
+                'total_appointments': mes['total'],
+                'revenue': float(mes['revenue'] or 0),
+                'avg_per_day': mes['total'] / ahora.day
             },
             'totals': {
                 'owners': Owner.objects.filter(is_active=True).count(),
                 'pets': Pet.objects.filter(is_active=True).count(),
                 'services': Service.objects.filter(is_active=True).count(),
             },
-            'upcoming_appointments': AppointmentSerializer(upcoming, many=True).data
+            'upcoming_appointments': AppointmentReadSerializer(upcoming, many=True).data
         })
 
     @action(detail=False, methods=['get'])
@@ -182,24 +429,26 @@ class ReportsViewSet(viewsets.ViewSet):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
 
-        appointments = Appointment.objects.select_related(
-            'pet', 'pet__owner', 'service'
-        ).all()
-
+        filtros = {}
         if start_date:
             try:
-                start = timezone.make_aware(datetime.strptime(start_date, '%Y-%m-%d'))
-                appointments = appointments.filter(appointment_date__gte=start)
+                filtros['appointment_date__gte'] = timezone.make_aware(datetime.strptime(start_date, '%Y-%m-%d'))
             except ValueError:
                 pass
 
         if end_date:
             try:
-                end = timezone.make_aware(datetime.strptime(end_date, '%Y-%m-%d'))
-                appointments = appointments.filter(appointment_date__lte=end)
+                filtros['appointment_date__lte'] = timezone.make_aware(datetime.strptime(end_date, '%Y-%m-%d'))
             except ValueError:
                 pass
 
+        # Vigentes primero y luego archivadas (más antiguas), ambas por fecha descendente
+        appointments = itertools.chain.from_iterable(
+            consulta.select_related('pet', 'pet__owner', 'service').filter(**filtros)
+            for consulta in consultas_citas(filtros.get('appointment_date__gte'))
+        )
+
+        inicio = time.perf_counter()
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="citas_export.csv"'
 
@@ -209,7 +458,9 @@ class ReportsViewSet(viewsets.ViewSet):
             'Estado', 'Precio', 'Observaciones'
         ])
 
+        filas = 0
         for apt in appointments:
+            filas += 1
             writer.writerow([
                 apt.appointment_date.strftime('%Y-%m-%d'),
                 apt.appointment_date.strftime('%H:%M'),
@@ -217,8 +468,12 @@ class ReportsViewSet(viewsets.ViewSet):
                 apt.pet.owner.full_name,
                 apt.service.name,
                 apt.get_status_display(),
-                f'${apt.service.price}',
+                f'${apt.price_charged if apt.price_charged is not None else apt.service.price}',
                 apt.observations or ''
             ])
 
+        EXPORTACIONES.inc(export='appointments_csv')
+        FILAS_EXPORTADAS.inc(filas, export='appointments_csv')
+        BYTES_EXPORTADOS.inc(len(response.content), export='appointments_csv')
+        DURACION_EXPORTACIONES.observar(time.perf_counter() - inicio, export='appointments_csv')
         return response
\ No newline at end of file
@@ -1,6 +1,8 @@
 from pathlib import Path
 from datetime import timedelta
 
+from authentication.hashers import construir_password_hashers
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-clave-temporal-desarrollo'
@@ -27,12 +29,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricasMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Después de AuthenticationMiddleware: X-Profile se autoriza con request.user (sesión) o JWT
+    'core.profiling.PerfiladoMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -77,16 +82,46 @@ DATABASES = {
             'driver': 'ODBC Driver 18 for SQL Server',
             'extra_params': 'Trusted_Connection=yes;TrustServerCertificate=yes'
         },
+        # Conexión persistente por hilo: evita el connect ODBC y el handshake TLS en
+        # cada petición; CONN_HEALTH_CHECKS la verifica antes de reutilizarla
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        # Pool por proceso (core/db/pool.py): usar ENGINE 'core.db.backends.mssql_pool'
+        # con CONN_MAX_AGE 0, así cada petición devuelve su conexión al terminar.
+        # Comparar los modos en el host con: python manage.py benchmark_connections
+        'POOL': {
+            'MAX_SIZE': 10,    # conexiones abiertas por proceso
+            'TIMEOUT': 30,     # segundos esperando una conexión libre
+            'MAX_IDLE': 300,   # segundos sin uso antes de cerrarla
+        },
     }
 }
 
 # User model personalizado
 AUTH_USER_MODEL = 'authentication.CustomUser'
 
+# Política de hashing de contraseñas (authentication/hashers.py).
+# Cambiar el algoritmo o el costo regenera cada hash en el siguiente login exitoso.
+# Medir el costo en el host con: python manage.py benchmark_hashers
+PASSWORD_HASHING = {
+    'ALGORITHM': 'pbkdf2_sha256',   # pbkdf2_sha256, scrypt o argon2 (requiere argon2-cffi)
+    'PBKDF2_ITERATIONS': 600_000,   # mínimo recomendado por OWASP para PBKDF2-SHA256
+}
+PASSWORD_HASHERS = construir_password_hashers(PASSWORD_HASHING['ALGORITHM'])
+
+# Límite de intentos de login con ventana deslizante (authentication/rate_limit.py).
+# Con varios workers usar LimitadorCache sobre un cache compartido:
+#   'BACKEND': 'authentication.rate_limit.LimitadorCache', 'OPTIONS': {'cache': 'default'}
+LOGIN_RATE_LIMIT = {
+    'BACKEND': 'authentication.rate_limit.LimitadorMemoria',
+    'IP': (30, 60),        # intentos por minuto desde una IP
+    'USERNAME': (10, 60),  # intentos por minuto contra un mismo usuario
+}
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.jwt_auth.JWTAutenticacionCacheada',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -98,6 +133,85 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.jwt_auth.SerializadorRefrescoToken',
+}
+
+# Caché en memoria de usuarios autenticados por JWT (por proceso)
+JWT_USER_CACHE = {
+    'TTL': 60,            # segundos
+    'MAX_ENTRIES': 1024,
+}
+
+# Secciones de reportes ejecutadas en paralelo (core/report_executor.py)
+REPORT_EXECUTOR = {
+    'MAX_WORKERS': 4,   # 1 = ejecución secuencial en el hilo de la petición
+}
+
+# Archivo de citas antiguas (manage.py archive_appointments). Reportes e historial
+# médico consultan core_appointment_archive solo si el rango empieza antes del horizonte
+APPOINTMENT_ARCHIVE = {
+    'HORIZON_DAYS': 730,
+    'BATCH_SIZE': 1000,
+}
+
+# Máximo de días por consulta de /api/appointments/calendar_range/ (6 semanas = vista mensual)
+CALENDAR_RANGE = {
+    'MAX_DAYS': 42,
+}
+
+# Cachés. 'analytics' guarda un acumulado por día (~730 claves para dos años), más
+# que las 300 entradas por defecto de LocMemCache; en producción conviene un caché
+# compartido (Redis, Memcached) para que todos los workers reutilicen los acumulados
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analytics': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'analytics',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Reportes con acumulados diarios en caché (core/analytics.py). ENGINE auto usa el
+# motor en memoria para rangos de al menos MIN_DAYS días solo si CACHE es compartido
+# entre procesos; con LocMemCache cada worker invalida solo su copia, así que auto
+# usa SQL y ?engine=memory guarda los acumulados LOCAL_TTL segundos como máximo
+REPORT_ANALYTICS = {
+    'ENGINE': 'auto',
+    'MIN_DAYS': 90,
+    'MAX_DAYS': 1830,   # rango máximo con acumulados diarios (uno por día en CACHE)
+    'CACHE': 'analytics',
+    'TTL': 86400,       # segundos, caché compartido
+    'LOCAL_TTL': 300,   # segundos, caché local de cada proceso
+    # /api/reports/durations/ y suggest_service_durations: percentil de la duración
+    # real, muestras mínimas por servicio y redondeo hacia arriba (minutos)
+    'SUGGESTION_PERCENTILE': 80,
+    'SUGGESTION_MIN_SAMPLES': 20,
+    'SUGGESTION_ROUND_MINUTES': 5,
+}
+
+# Datos del formulario de citas (core/form_bootstrap.py). Con un caché compartido
+# (Redis, Memcached) la invalidación es inmediata entre procesos; con LocMemCache
+# cada worker invalida solo su copia, así que la versión dura LOCAL_TTL segundos
+FORM_BOOTSTRAP_CACHE = {
+    'CACHE': 'default',
+    'TTL': 300,        # segundos, caché compartido
+    'LOCAL_TTL': 5,    # segundos, caché local de cada proceso
+}
+
+# Perfilado por petición (core/profiling.py): encabezado X-Profile: 1 | cprofile,
+# o muestreo. Resultados en Server-Timing y en /api/profiling/ (solo administradores)
+PROFILING = {
+    'SAMPLE_RATE': 0.0,   # p. ej. 0.01 perfila el 1% de las peticiones
+    'TOKEN': '',          # X-Profile requiere un usuario staff o X-Profile-Token con este valor
+    'BUFFER_SIZE': 200,
+}
+
+# Métricas en /api/metrics/ (core/metrics.py): Authorization: Bearer <TOKEN> o un usuario staff;
+# sin TOKEN solo quedan abiertas con DEBUG
+METRICS = {
+    'TOKEN': '',
 }
 
 # CORS
@@ -1,6 +1,6 @@
 // Modal para crear/editar citas - se abre al hacer clic en el calendario
 import { useState, useEffect } from 'react'
-import { formatDateTimeLocal, formatDateForBackend, formatDateFromBackend, toEcuadorTime } from '../../../utils/timezone'
+import { formatDateTimeLocal, formatDateForBackend, formatDateFromBackend, formatDisplayDate, toEcuadorTime } from '../../../utils/timezone'
 import './AppointmentModal.css'
 
 const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
@@ -60,31 +60,19 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
 
   const fetchData = async () => {
     try {
-      const [petsRes, servicesRes, professionalsRes] = await Promise.all([
-        fetch(`${API_BASE}/pets/`, { headers: getAuthHeaders() }),
-        fetch(`${API_BASE}/services/`, { headers: getAuthHeaders() }),
-        fetch(`${API_BASE}/professionals/`, { headers: getAuthHeaders() })
-      ])
-
-      if (petsRes.ok) {
-        const petsData = await petsRes.json()
-        setPets(petsData.results || petsData)
-      }
-
-      if (servicesRes.ok) {
-        const servicesData = await servicesRes.json()
-        setServices(servicesData.results || servicesData)
-      }
+      // Un solo endpoint con proyecciones compactas; el navegador revalida con ETag
+      const response = await fetch(`${API_BASE}/appointments/form_bootstrap/`, {
+        headers: getAuthHeaders()
+      })
 
-      if (professionalsRes.ok) {
-        const professionalsData = await professionalsRes.json()
-        setProfessionals(professionalsData.results || professionalsData)
+      if (response.ok) {
+        const data = await response.json()
+        setPets(data.pets)
+        setServices(data.services)
+        setProfessionals(data.professionals)
       } else {
-        console.error('Error al cargar profesionales:', professionalsRes.status, professionalsRes.statusText)
-        const errorText = await professionalsRes.text()
-        console.error('Error details:', errorText)
+        console.error('Error al cargar datos del formulario:', response.status, response.statusText)
       }
-
     } catch (error) {
       console.error('Error fetching data:', error)
     }
@@ -160,6 +148,38 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
     }
   }
 
+  // Registrar inicio y fin reales de la atención (los reportes de duración usan ambos)
+  const handleAttention = async (path, body) => {
+    if (!appointment) return
+
+    try {
+      setLoading(true)
+      setErrors({})
+      const response = await fetch(`${API_BASE}/appointments/${appointment.id}/${path}/`, {
+        method: body ? 'PATCH' : 'POST',
+        headers: getAuthHeaders(),
+        body: body ? JSON.stringify(body) : undefined
+      })
+
+      if (response.ok) {
+        onSave()
+      } else {
+        const errorData = await response.json()
+        setErrors({ general: typeof errorData.error === 'string' ? errorData.error : 'No se pudo registrar la atención' })
+      }
+    } catch (error) {
+      console.error('Error updating attention:', error)
+      setErrors({ general: 'Error de conexión con el servidor' })
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  const canStart = appointment && !appointment.actual_start_time &&
+    !['realizada', 'cancelada'].includes(appointment.status)
+  const canFinish = appointment && appointment.actual_start_time && appointment.status !== 'realizada' &&
+    appointment.status !== 'cancelada'
+
   const getFieldError = (field) => {
     return errors[field] ? errors[field][0] || errors[field] : null
   }
@@ -192,7 +212,7 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
                 <option value="">Seleccionar mascota</option>
                 {pets.map(pet => (
                   <option key={pet.id} value={pet.id}>
-                    {pet.name} - {pet.owner_short_name}
+                    {pet.label}
                   </option>
                 ))}
               </select>
@@ -212,7 +232,7 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
                 <option value="">Seleccionar servicio</option>
                 {services.map(service => (
                   <option key={service.id} value={service.id}>
-                    {service.name}
+                    {service.label}
                   </option>
                 ))}
               </select>
@@ -233,7 +253,7 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
               <option value="">Seleccionar profesional</option>
               {professionals.map(professional => (
                 <option key={professional.id} value={professional.id}>
-                  {professional.full_name} - {professional.specialty}
+                  {professional.label}
                 </option>
               ))}
             </select>
@@ -273,6 +293,12 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
                 <option value="realizada">Realizada</option>
                 <option value="cancelada">Cancelada</option>
               </select>
+              {appointment.actual_start_time && (
+                <span className="attention-times">
+                  Inicio real: {formatDisplayDate(appointment.actual_start_time)}
+                  {appointment.actual_end_time && ` · Fin real: ${formatDisplayDate(appointment.actual_end_time)}`}
+                </span>
+              )}
             </div>
           )}
 
@@ -353,6 +379,26 @@ const AppointmentModal = ({ slot, appointment, onClose, onSave }) => {
                   Cancelar Cita
                 </button>
               )}
+              {canStart && (
+                <button
+                  type="button"
+                  onClick={() => handleAttention('start')}
+                  className="btn btn-secondary"
+                  disabled={loading}
+                >
+                  Iniciar atención
+                </button>
+              )}
+              {canFinish && (
+                <button
+                  type="button"
+                  onClick={() => handleAttention('update_status', { status: 'realizada' })}
+                  className="btn btn-secondary"
+                  disabled={loading}
+                >
+                  Finalizar atención
+                </button>
+              )}
             </div>
             
             <div className="right-actions">